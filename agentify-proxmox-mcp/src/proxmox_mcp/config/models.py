@@ -5,6 +5,9 @@ This module defines Pydantic models for configuration validation:
 - Proxmox connection settings
 - Authentication credentials
 - Logging configuration
+- Response cache configuration
+- Tool output format
+- Background metrics collection
 - Tool-specific parameter models
 
 The models provide:
@@ -13,9 +16,29 @@ The models provide:
 - Field descriptions
 - Required vs optional field handling
 """
-from typing import Optional, Annotated
+from typing import Dict, List, Literal, Optional, Annotated
 from pydantic import BaseModel, Field
 
+# Default per-endpoint cache TTLs in seconds ('*' matches one path segment).
+# Endpoints not listed here, such as VM status/current, task status and
+# guest agent calls, are never cached.
+DEFAULT_CACHE_TTLS: Dict[str, float] = {
+    "/version": 300,
+    "/cluster/status": 10,
+    "/cluster/resources": 5,
+    "/nodes": 10,
+    "/nodes/*/status": 5,
+    "/nodes/*/qemu": 5,
+    "/nodes/*/qemu/*/config": 30,
+    "/nodes/*/rrddata": 60,
+    "/nodes/*/qemu/*/rrddata": 60,
+    "/nodes/*/lxc/*/rrddata": 60,
+    "/nodes/*/lxc": 5,
+    "/nodes/*/storage": 30,
+    "/nodes/*/storage/*/status": 15,
+    "/storage": 60,
+}
+
 class NodeStatus(BaseModel):
     """Model for node status query parameters.
     
@@ -39,12 +62,35 @@ class ProxmoxConfig(BaseModel):
     
     Defines the required and optional parameters for
     establishing a connection to the Proxmox API server.
-    Provides sensible defaults for optional parameters.
+    Provides sensible defaults for optional parameters,
+    including HTTP connection pooling and retry behavior.
     """
     host: str  # Required: Proxmox host address
     port: int = 8006  # Optional: API port (default: 8006)
     verify_ssl: bool = True  # Optional: SSL verification (default: True)
     service: str = "PVE"  # Optional: Service type (default: PVE)
+    timeout: float = 5  # Optional: Request timeout in seconds (default: 5)
+    pool_connections: int = 4  # Optional: Number of host connection pools to keep (default: 4)
+    # Optional: Keep-alive connections per host, should cover tool concurrency (default: 16)
+    pool_maxsize: int = 16
+    # Optional: Retries on connection errors and retry_statuses, 0 disables (default: 3)
+    retries: int = 3
+    # Optional: Exponential backoff factor between retries in seconds (default: 0.3)
+    retry_backoff: float = 0.3
+    # Optional: HTTP statuses retried for GETs
+    retry_statuses: List[int] = Field(default_factory=lambda: [502, 503, 504])
+    # Optional: Other cluster nodes to spread requests over and fail over to ("host" or "host:port")
+    hosts: List[str] = Field(default_factory=list)
+    # Optional: Seconds before a failed endpoint is checked again (default: 30)
+    health_check_interval: float = 30
+
+    def request_budget(self) -> float:
+        """Get the longest time one API request can take, retries and backoff included.
+
+        Each attempt may use the full timeout. Backoff doubles after each
+        failed attempt (an upper bound of urllib3's schedule).
+        """
+        return self.timeout * (self.retries + 1) + self.retry_backoff * ((1 << self.retries) - 1)
 
 class AuthConfig(BaseModel):
     """Model for Proxmox authentication configuration.
@@ -68,6 +114,41 @@ class LoggingConfig(BaseModel):
     format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"  # Optional: Log format
     file: Optional[str] = None  # Optional: Log file path (default: None for console logging)
 
+class CacheConfig(BaseModel):
+    """Model for API response cache configuration.
+
+    Controls caching of read-only API responses. TTLs are set per
+    endpoint pattern; mutating calls invalidate affected entries.
+    """
+    enabled: bool = True  # Optional: Enable response caching (default: True)
+    max_entries: int = 256  # Optional: LRU size bound (default: 256)
+    # Optional: Path pattern -> TTL
+    ttls: Dict[str, float] = Field(default_factory=lambda: dict(DEFAULT_CACHE_TTLS))
+    # Optional: Seconds the storage content index is reused (default: 300)
+    content_ttl: float = Field(default=300, gt=0)
+
+class OutputConfig(BaseModel):
+    """Model for tool output configuration.
+
+    Selects how read tools render results: formatted text for humans
+    or compact JSON for programmatic callers (e.g. behind the OpenAPI
+    proxy). Tools accept a per-call override.
+    """
+    format: Literal["text", "json"] = "text"  # Optional: Default output format (default: text)
+
+class MetricsConfig(BaseModel):
+    """Model for background metrics collection configuration.
+
+    The collector polls /cluster/resources once per interval and keeps
+    retention seconds of samples per node and guest in memory. Listing
+    tools answer from its latest sample while it is fresh. Collection is
+    opt-in, as it adds a steady background load on the API.
+    """
+    enabled: bool = False  # Optional: Run the background collector (default: False)
+    interval: float = Field(default=15, gt=0)  # Optional: Seconds between polls (default: 15)
+    # Optional: Seconds of history kept per series (default: 3600)
+    retention: float = Field(default=3600, gt=0)
+
 class Config(BaseModel):
     """Root configuration model.
     
@@ -78,3 +159,6 @@ class Config(BaseModel):
     proxmox: ProxmoxConfig  # Required: Proxmox connection settings
     auth: AuthConfig  # Required: Authentication credentials
     logging: LoggingConfig  # Required: Logging configuration
+    cache: CacheConfig = CacheConfig()  # Optional: Response cache settings
+    output: OutputConfig = OutputConfig()  # Optional: Tool output settings
+    metrics: MetricsConfig = MetricsConfig()  # Optional: Background metrics collection
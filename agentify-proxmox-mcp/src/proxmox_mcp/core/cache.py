@@ -0,0 +1,257 @@
+"""
+Response caching for the Proxmox API.
+
+This module provides a read-through cache in front of the ProxmoxAPI client:
+- TTL-based expiry configured per API endpoint
+- LRU eviction bounded by a maximum entry count
+- Automatic invalidation of node/VM entries on mutating calls
+
+Agents tend to call the same read-only tools (nodes, VMs, storage, cluster
+status) repeatedly within one conversation. Caching GET responses keyed by
+API path and parameters makes those repeat reads free, while invalidation
+on POST/PUT/DELETE keeps read-after-write results correct.
+"""
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterator, Tuple
+
+# Methods that never change state on the Proxmox side
+READ_METHODS = {"get"}
+# Methods that change state and trigger invalidation
+WRITE_METHODS = {"post", "put", "delete", "create", "set"}
+# Cache key: API path plus the sorted, repr()-ed request parameters
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+_bypass = threading.local()
+
+@contextmanager
+def bypass_cache() -> Iterator[None]:
+    """Send GET requests made by the current thread to the API, not the cache.
+
+    Responses still refresh the cache. Used where a tool needs two
+    readings taken a known interval apart, e.g. to turn counters into rates.
+    """
+    previous = getattr(_bypass, "active", False)
+    _bypass.active = True
+    try:
+        yield
+    finally:
+        _bypass.active = previous
+
+class ResponseCache:
+    """TTL + LRU cache for Proxmox API responses.
+
+    Entries are keyed by (path, params). The TTL of an entry is looked up
+    from a mapping of path patterns, where '*' matches a single path segment
+    (e.g. '/nodes/*/status'). Paths matching no pattern use the default TTL;
+    a TTL of 0 disables caching for that path.
+
+    The cache is thread-safe, as tools issue requests from worker threads.
+    """
+
+    def __init__(self, ttls: Dict[str, float], max_entries: int = 256, default_ttl: float = 0):
+        """Initialize the response cache.
+
+        Args:
+            ttls: Mapping of API path pattern to TTL in seconds
+            max_entries: Maximum number of cached responses before LRU eviction
+            default_ttl: TTL for paths matching no pattern (0 = not cached)
+        """
+        self.logger = logging.getLogger("proxmox-mcp.cache")
+        self.ttls = [(pattern.strip("/").split("/"), ttl) for pattern, ttl in ttls.items()]
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def make_key(path: str, params: Dict[str, Any]) -> CacheKey:
+        """Build a cache key from an API path and request parameters."""
+        return (path, tuple(sorted((k, repr(v)) for k, v in params.items())))
+
+    def ttl_for(self, path: str) -> float:
+        """Get the TTL for an API path.
+
+        Args:
+            path: API path (e.g. '/nodes/pve1/status')
+
+        Returns:
+            TTL in seconds from the first matching pattern, else default_ttl
+        """
+        segments = path.strip("/").split("/")
+        for pattern, ttl in self.ttls:
+            if len(pattern) == len(segments) and all(
+                fnmatchcase(segment, part) for segment, part in zip(segments, pattern)
+            ):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key: CacheKey) -> Tuple[bool, Any]:
+        """Look up a cached response.
+
+        Returns:
+            Tuple of (hit, value); value is a copy safe for the caller to modify
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+        return True, copy.deepcopy(value)
+
+    def set(self, key: CacheKey, value: Any, ttl: float) -> None:
+        """Store a response, evicting the least recently used entries if full."""
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path: str) -> None:
+        """Drop cached entries affected by a mutating call to path.
+
+        - Guest agent calls don't change API-visible state and are ignored
+        - Calls under /nodes/{node} drop everything cached for that node,
+          plus the cluster-wide /nodes and /cluster/resources views
+        - Any other mutation (storage, cluster config, pools) clears the cache
+
+        Args:
+            path: API path of the mutating call
+        """
+        segments = path.strip("/").split("/")
+        if "agent" in segments:
+            return
+
+        with self._lock:
+            if segments[0] == "nodes" and len(segments) >= 2:
+                node_prefix = "/nodes/" + segments[1]
+                stale = [
+                    key for key in self._entries
+                    if key[0] in ("/nodes", "/cluster/resources")
+                    or key[0] == node_prefix
+                    or key[0].startswith(node_prefix + "/")
+                ]
+                for key in stale:
+                    del self._entries[key]
+            else:
+                stale = list(self._entries)
+                self._entries.clear()
+        if stale:
+            self.logger.debug(f"Invalidated {len(stale)} cached responses after change to {path}")
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+class CachedResource:
+    """Caching proxy for a ProxmoxAPI resource.
+
+    Mirrors proxmoxer's attribute/call chaining (api.nodes(node).qemu.get())
+    while recording the API path. The chain is replayed on the wrapped API
+    only when a request method is called, so GET requests can be answered
+    from the cache without touching the network.
+    """
+
+    def __init__(self, api: Any, cache: ResponseCache, ops: Tuple[Tuple[str, Any], ...] = (),
+                 segments: Tuple[str, ...] = ()):
+        """Initialize the resource proxy.
+
+        Args:
+            api: Wrapped ProxmoxAPI instance
+            cache: Shared response cache
+            ops: Recorded attribute/call operations leading to this resource
+            segments: API path segments leading to this resource
+        """
+        self._api = api
+        self._cache = cache
+        self._ops = ops
+        self._segments = segments
+
+    @property
+    def _api_path(self) -> str:
+        """API path of this resource (e.g. '/nodes/pve1/qemu')."""
+        return "/" + "/".join(self._segments)
+
+    def __getattr__(self, item: str) -> Any:
+        if item.startswith("_"):
+            raise AttributeError(item)
+        if item in READ_METHODS or item in WRITE_METHODS:
+            return lambda *args, **params: self._request(item, args, params)
+        return CachedResource(self._api, self._cache, self._ops + (("attr", item),),
+                              self._segments + (item,))
+
+    def __call__(self, resource_id: Any = None) -> "CachedResource":
+        if resource_id in (None, ""):
+            return self
+        if isinstance(resource_id, (list, tuple)):
+            parts = [str(part) for part in resource_id]
+        else:
+            parts = str(resource_id).strip("/").split("/")
+        return CachedResource(self._api, self._cache, self._ops + (("call", resource_id),),
+                              self._segments + tuple(parts))
+
+    def __repr__(self) -> str:
+        return f"CachedResource ({self._api_path})"
+
+    def _resolve(self) -> Any:
+        """Replay the recorded chain on the wrapped API."""
+        target = self._api
+        for op, value in self._ops:
+            target = getattr(target, value) if op == "attr" else target(value)
+        return target
+
+    def _request(self, method: str, args: Tuple[Any, ...], params: Dict[str, Any]) -> Any:
+        """Perform a request, serving GETs from the cache when possible."""
+        resource = self._resolve()
+        path = self._api_path
+        if args:
+            path = "/".join([path.rstrip("/")] + [str(a) for a in args])
+
+        if method in READ_METHODS:
+            ttl = self._cache.ttl_for(path)
+            if ttl > 0:
+                key = ResponseCache.make_key(path, params)
+                if getattr(_bypass, "active", False):
+                    hit, value = False, None
+                else:
+                    hit, value = self._cache.get(key)
+                if hit:
+                    return value
+                value = getattr(resource, method)(*args, **params)
+                self._cache.set(key, value, ttl)
+                return value
+            return getattr(resource, method)(*args, **params)
+
+        try:
+            return getattr(resource, method)(*args, **params)
+        finally:
+            # Invalidate even on failure, the call may have partially applied
+            self._cache.invalidate(path)
+
+class CachedProxmoxAPI(CachedResource):
+    """Root of the caching proxy, used in place of a ProxmoxAPI instance."""
+
+    def __init__(self, api: Any, cache: ResponseCache):
+        """Initialize the caching API wrapper.
+
+        Args:
+            api: Initialized ProxmoxAPI instance
+            cache: Response cache shared by all tools
+        """
+        super().__init__(api, cache)
+
+    def __repr__(self) -> str:
+        return f"CachedProxmoxAPI ({self._api!r})"
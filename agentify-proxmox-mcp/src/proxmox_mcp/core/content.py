@@ -0,0 +1,120 @@
+"""
+Storage content index for the Proxmox MCP server.
+
+Finding an ISO, a container template or the latest backup of a guest means
+listing /nodes/{node}/storage/{storage}/content on every pool that can hold
+it. This module keeps the result of one such crawl in memory:
+- One flat catalog of ISO images, container templates and vzdump backups
+- A TTL after which the catalog is rebuilt on the next lookup
+- Name, size, date, guest and location search over the catalog
+
+Storage tools build the catalog with concurrent requests (see
+StorageTools); lookups within the TTL make no API request at all.
+"""
+import threading
+import time
+from fnmatch import fnmatchcase
+from typing import Any, Dict, List, Optional, Sequence
+
+# Storage content types kept in the index
+INDEXED_CONTENT = ("iso", "vztmpl", "backup")
+
+# Volume fields search results can be ordered by
+CONTENT_SORT_KEYS = ("ctime", "size", "name")
+
+def volume_name(volid: str) -> str:
+    """Get the file name of a volume ID (e.g. 'local:iso/debian.iso' -> 'debian.iso')."""
+    return volid.split(":", 1)[-1].rsplit("/", 1)[-1]
+
+class ContentIndex:
+    """TTL-bound catalog of storage volumes.
+
+    Holds the volumes of every indexed pool, as built by the last crawl.
+    The catalog counts as fresh for ttl seconds; a new crawl (e.g. an
+    explicit refresh) replaces it at any time.
+
+    The index is thread-safe, as tools run in worker threads.
+    """
+
+    def __init__(self, ttl: float = 300):
+        """Initialize an empty index.
+
+        Args:
+            ttl: Seconds a crawl's catalog is reused
+        """
+        self.ttl = ttl
+        self.built_at: Optional[float] = None
+        self.failed: List[str] = []
+        self._volumes: Optional[List[Dict[str, Any]]] = None
+        self._built_monotonic = 0.0
+        self._lock = threading.Lock()
+
+    def volumes(self) -> Optional[List[Dict[str, Any]]]:
+        """Get the catalog if it is fresh.
+
+        Returns:
+            List of volume dictionaries, or None if the index must be rebuilt
+        """
+        with self._lock:
+            if self._volumes is None or time.monotonic() - self._built_monotonic > self.ttl:
+                return None
+            return self._volumes
+
+    def replace(self, volumes: List[Dict[str, Any]], failed: Sequence[str] = ()) -> None:
+        """Store the catalog of a new crawl.
+
+        Args:
+            volumes: Volume dictionaries of all indexed pools
+            failed: Pools ('node/storage') whose content couldn't be listed
+        """
+        with self._lock:
+            self._volumes = list(volumes)
+            self.failed = sorted(failed)
+            self.built_at = time.time()
+            self._built_monotonic = time.monotonic()
+
+def search(volumes: List[Dict[str, Any]], content: Optional[str] = None, name: Optional[str] = None,
+           vmid: Optional[int] = None, storage: Optional[str] = None, node: Optional[str] = None,
+           min_size: Optional[int] = None, max_size: Optional[int] = None,
+           since: Optional[float] = None, until: Optional[float] = None,
+           sort_by: str = "ctime") -> List[Dict[str, Any]]:
+    """Filter and order volumes of the catalog.
+
+    Args:
+        volumes: Catalog from ContentIndex.volumes()
+        content: Only this content type ('iso', 'vztmpl' or 'backup')
+        name: Only volumes whose file name matches this glob (case-insensitive)
+        vmid: Only backups of this guest
+        storage: Only volumes on this storage
+        node: Only volumes reachable from this node
+        min_size: Smallest size in bytes
+        max_size: Largest size in bytes
+        since: Only volumes created at or after this epoch time
+        until: Only volumes created before this epoch time
+        sort_by: 'ctime' (newest first), 'size' (largest first) or 'name'
+
+    Returns:
+        Matching volumes in the requested order
+
+    Raises:
+        ValueError: If sort_by is unknown
+    """
+    if sort_by not in CONTENT_SORT_KEYS:
+        raise ValueError(f"Invalid sort_by '{sort_by}', "
+                         f"expected one of: {', '.join(CONTENT_SORT_KEYS)}")
+    pattern = name.lower() if name is not None else None
+    matches = [
+        volume for volume in volumes
+        if (content is None or volume["content"] == content)
+        and (pattern is None or fnmatchcase(volume["name"].lower(), pattern))
+        and (vmid is None or volume.get("vmid") == vmid)
+        and (storage is None or volume["storage"] == storage)
+        and (node is None or node in volume["nodes"])
+        and (min_size is None or volume["size"] >= min_size)
+        and (max_size is None or volume["size"] <= max_size)
+        and (since is None or volume["ctime"] >= since)
+        and (until is None or volume["ctime"] < until)
+    ]
+    if sort_by == "name":
+        return sorted(matches, key=lambda v: (v["name"], v["volid"]))
+    return sorted(matches, key=lambda v: (v[sort_by], v["volid"]), reverse=True)
@@ -0,0 +1,240 @@
+"""
+Multi-endpoint access to a Proxmox cluster.
+
+Every cluster node runs pveproxy and serves the full cluster API, so any
+node can answer any request. This module spreads requests over several
+API endpoints:
+- Round-robin distribution of read requests over healthy endpoints
+- Writes pinned to the first healthy endpoint
+- Transparent failover when an endpoint is unreachable
+- Background health checks bringing failed endpoints back
+
+Without it, a single busy or rebooting node makes the whole MCP server fail.
+"""
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from .cache import READ_METHODS, WRITE_METHODS
+
+# HTTP statuses returned by pveproxy itself when the node can't serve requests
+UNAVAILABLE_STATUSES = {502, 503, 504}
+
+class Endpoint:
+    """A single API endpoint and its health state."""
+
+    def __init__(self, name: str, api: Any):
+        """Initialize the endpoint.
+
+        Args:
+            name: Display name (host:port)
+            api: ProxmoxAPI instance connected to this endpoint
+        """
+        self.name = name
+        self.api = api
+        self.healthy = True
+        self.failures = 0
+        self.retry_at = 0.0
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.name}, {'healthy' if self.healthy else 'down'})"
+
+class EndpointPool:
+    """Health-tracked pool of API endpoints.
+
+    Read requests rotate over healthy endpoints. Writes always go to the
+    first healthy endpoint in configured order, keeping related changes on
+    one node. When an endpoint fails with a connection error (or pveproxy
+    answers 502/503/504), it is marked down and the request is retried on
+    the next endpoint. Writes only fail over when the connection was never
+    established, so a change is never applied twice.
+
+    Endpoints marked down are probed with /version in a background thread
+    once health_check_interval has passed, and rejoin the pool when they
+    answer. If every endpoint is down, all are tried as a last resort.
+    """
+
+    def __init__(self, endpoints: List[Endpoint], health_check_interval: float = 30):
+        """Initialize the endpoint pool.
+
+        Args:
+            endpoints: Endpoints in order of preference
+            health_check_interval: Seconds before a failed endpoint is probed again
+        """
+        if not endpoints:
+            raise ValueError("At least one API endpoint is required")
+        self.endpoints = endpoints
+        self.health_check_interval = health_check_interval
+        self.logger = logging.getLogger("proxmox-mcp.endpoints")
+        self._rotation = itertools.count()
+        self._lock = threading.Lock()
+        self._checking = False
+
+    def healthy(self) -> List[Endpoint]:
+        """Get the endpoints currently considered healthy."""
+        return [endpoint for endpoint in self.endpoints if endpoint.healthy]
+
+    def _order(self, read: bool) -> List[Endpoint]:
+        """Get the endpoints to try for a request, best candidate first."""
+        healthy = self.healthy()
+        down = sorted((e for e in self.endpoints if not e.healthy), key=lambda e: e.retry_at)
+        if read and len(healthy) > 1:
+            offset = next(self._rotation) % len(healthy)
+            healthy = healthy[offset:] + healthy[:offset]
+        return healthy + down
+
+    def request(self, ops: Tuple[Tuple[str, Any], ...], method: str,
+                args: Tuple[Any, ...], params: Dict[str, Any]) -> Any:
+        """Perform a request on the best available endpoint.
+
+        Args:
+            ops: Recorded attribute/call chain leading to the resource
+            method: Request method name (get, post, put, delete, ...)
+            args: Positional request arguments
+            params: Request parameters
+
+        Returns:
+            API response from the first endpoint that answered
+
+        Raises:
+            Exception: The error of the last endpoint tried if all failed,
+                       or any error that isn't an endpoint failure
+        """
+        read = method in READ_METHODS
+        self._schedule_health_check()
+        last_error: Optional[Exception] = None
+        for endpoint in self._order(read):
+            target = endpoint.api
+            for op, value in ops:
+                target = getattr(target, value) if op == "attr" else target(value)
+            try:
+                result = getattr(target, method)(*args, **params)
+            except Exception as e:
+                if not self._is_endpoint_failure(e, read):
+                    raise
+                self._mark_down(endpoint, e)
+                last_error = e
+                continue
+            if not endpoint.healthy:
+                self._mark_up(endpoint)
+            return result
+        raise last_error or RuntimeError("No endpoint available")
+
+    @staticmethod
+    def _is_endpoint_failure(error: Exception, read: bool) -> bool:
+        """Check whether an error means the endpoint, not the request, failed.
+
+        Reads may be repeated safely after any connection error. Writes are
+        only repeated if the connection was never established.
+        """
+        from requests.exceptions import ConnectionError, ConnectTimeout, Timeout
+        from urllib3.exceptions import ConnectTimeoutError
+
+        if read:
+            if isinstance(error, (ConnectionError, Timeout)):
+                return True
+            return getattr(error, "status_code", None) in UNAVAILABLE_STATUSES
+        if isinstance(error, ConnectTimeout):
+            return True
+        if isinstance(error, ConnectionError) and error.args:
+            return isinstance(getattr(error.args[0], "reason", None), ConnectTimeoutError)
+        return False
+
+    def _mark_down(self, endpoint: Endpoint, error: Exception) -> None:
+        """Take an endpoint out of rotation until it passes a health check."""
+        with self._lock:
+            endpoint.failures += 1
+            endpoint.retry_at = time.monotonic() + self.health_check_interval
+            was_healthy, endpoint.healthy = endpoint.healthy, False
+        if was_healthy:
+            self.logger.warning(f"API endpoint {endpoint.name} is down, failing over: {error}")
+
+    def _mark_up(self, endpoint: Endpoint) -> None:
+        """Return an endpoint to rotation."""
+        with self._lock:
+            endpoint.healthy = True
+            endpoint.failures = 0
+        self.logger.info(f"API endpoint {endpoint.name} is back up")
+
+    def _schedule_health_check(self) -> None:
+        """Probe endpoints that are due for a health check in the background."""
+        now = time.monotonic()
+        with self._lock:
+            if self._checking:
+                return
+            due = [e for e in self.endpoints if not e.healthy and e.retry_at <= now]
+            if not due:
+                return
+            self._checking = True
+        threading.Thread(target=self._check, args=(due,), name="proxmox-health-check",
+                         daemon=True).start()
+
+    def _check(self, endpoints: List[Endpoint]) -> None:
+        """Probe endpoints with a version request."""
+        try:
+            for endpoint in endpoints:
+                if self.check(endpoint):
+                    self._mark_up(endpoint)
+        finally:
+            with self._lock:
+                self._checking = False
+
+    def check(self, endpoint: Endpoint) -> bool:
+        """Check whether an endpoint answers API requests.
+
+        Args:
+            endpoint: Endpoint to probe
+
+        Returns:
+            True if the endpoint is healthy
+        """
+        try:
+            endpoint.api.version.get()
+            return True
+        except Exception as e:
+            self._mark_down(endpoint, e)
+            return False
+
+class FailoverResource:
+    """Proxy for a ProxmoxAPI resource spread over an endpoint pool.
+
+    Mirrors proxmoxer's attribute/call chaining, recording the chain and
+    replaying it on whichever endpoint serves the request.
+    """
+
+    def __init__(self, pool: EndpointPool, ops: Tuple[Tuple[str, Any], ...] = ()):
+        """Initialize the resource proxy.
+
+        Args:
+            pool: Endpoint pool serving requests
+            ops: Recorded attribute/call operations leading to this resource
+        """
+        self._pool = pool
+        self._ops = ops
+
+    def __getattr__(self, item: str) -> Any:
+        if item.startswith("_"):
+            raise AttributeError(item)
+        if item in READ_METHODS or item in WRITE_METHODS:
+            return lambda *args, **params: self._pool.request(self._ops, item, args, params)
+        return FailoverResource(self._pool, self._ops + (("attr", item),))
+
+    def __call__(self, resource_id: Any = None) -> "FailoverResource":
+        if resource_id in (None, ""):
+            return self
+        return FailoverResource(self._pool, self._ops + (("call", resource_id),))
+
+class FailoverProxmoxAPI(FailoverResource):
+    """Root of the failover proxy, used in place of a ProxmoxAPI instance."""
+
+    def __init__(self, pool: EndpointPool):
+        """Initialize the failover API wrapper.
+
+        Args:
+            pool: Endpoint pool with one ProxmoxAPI instance per cluster node
+        """
+        super().__init__(pool)
+
+    def __repr__(self) -> str:
+        return f"FailoverProxmoxAPI ({', '.join(e.name for e in self._pool.endpoints)})"
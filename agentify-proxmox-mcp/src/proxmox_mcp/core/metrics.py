@@ -0,0 +1,282 @@
+"""
+Background metrics collection for the Proxmox MCP server.
+
+Status tools used to hit the API on every call, and nothing kept history
+between calls. This module polls /cluster/resources on a fixed interval
+and keeps recent samples in memory:
+- Per-node and per-guest CPU, memory, disk and network samples
+- Fixed-size, array-backed ring buffers (no allocation once full)
+- The latest full snapshot, which read tools use instead of the API
+  while it is fresh
+- Short-window trend statistics (e.g. CPU over the last 15 minutes)
+
+One API request per interval serves every node and guest in the cluster.
+"""
+import logging
+import math
+import threading
+import time
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from proxmoxer import ProxmoxAPI
+
+
+# Metrics sampled from /cluster/resources for nodes and guests
+METRIC_FIELDS = ("cpu", "mem", "maxmem", "disk", "maxdisk", "netin", "netout", "diskread",
+                 "diskwrite")
+
+# Cumulative byte counters, reported as per-second rates in trends
+COUNTER_FIELDS = ("netin", "netout", "diskread", "diskwrite")
+
+# /cluster/resources types that get a time series
+SAMPLED_TYPES = ("node", "qemu", "lxc")
+
+class RingBuffer:
+    """Fixed-capacity time series of metric samples.
+
+    Timestamps and each metric are stored in preallocated arrays of
+    doubles, written in place at a rotating index. Missing values are
+    stored as NaN.
+    """
+
+    def __init__(self, capacity: int, fields: Sequence[str] = METRIC_FIELDS):
+        """Initialize the buffer.
+
+        Args:
+            capacity: Number of samples kept; older samples are overwritten
+            fields: Names of the metrics stored per sample
+        """
+        if capacity < 1:
+            raise ValueError("Ring buffer capacity must be at least 1")
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self.times = array("d", [math.nan]) * capacity
+        self.values = {field: array("d", [math.nan]) * capacity for field in self.fields}
+        self.count = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, timestamp: float, sample: Dict[str, Any]) -> None:
+        """Store a sample, overwriting the oldest one when full.
+
+        Args:
+            timestamp: Sample time in epoch seconds
+            sample: Metric values; missing or non-numeric metrics are stored as NaN
+        """
+        index = self._next
+        self.times[index] = timestamp
+        for field in self.fields:
+            value = sample.get(field)
+            if not isinstance(value, (int, float)):
+                value = math.nan
+            self.values[field][index] = float(value)
+        self._next = (index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _indices(self) -> List[int]:
+        """Get buffer indices from oldest to newest sample."""
+        start = (self._next - self.count) % self.capacity
+        return [(start + offset) % self.capacity for offset in range(self.count)]
+
+    def window(self, field: str, seconds: Optional[float] = None,
+               now: Optional[float] = None) -> List[Tuple[float, float]]:
+        """Get the samples of one metric, oldest first.
+
+        Args:
+            field: Metric name
+            seconds: Only samples from the last seconds (default: all kept samples)
+            now: Reference time in epoch seconds (default: current time)
+
+        Returns:
+            List of (timestamp, value) tuples, skipping missing values
+        """
+        values = self.values[field]
+        since = -math.inf if seconds is None else (time.time() if now is None else now) - seconds
+        return [
+            (self.times[i], values[i]) for i in self._indices()
+            if self.times[i] >= since and not math.isnan(values[i])
+        ]
+
+class MetricsCollector:
+    """Background poller keeping cluster metrics in ring buffers.
+
+    A daemon thread fetches /cluster/resources every interval seconds and
+    appends one sample per node and guest, keyed by the resource ID
+    ('node/pve1', 'qemu/100', 'lxc/200'). Series of resources that
+    disappear from the cluster are dropped. The full response is kept as
+    the latest snapshot for tools to answer from without API traffic.
+
+    A snapshot counts as fresh for two intervals, tolerating one slow
+    poll. mark_stale() discards it after a change made through the
+    server, so reads never lag behind the server's own writes.
+    """
+
+    def __init__(self, proxmox_api: "ProxmoxAPI", interval: float = 15, retention: float = 3600):
+        """Initialize the collector without starting it.
+
+        Args:
+            proxmox_api: Initialized ProxmoxAPI instance
+            interval: Seconds between polls
+            retention: Seconds of history kept per series
+        """
+        self.proxmox = proxmox_api
+        self.interval = interval
+        self.capacity = max(1, int(math.ceil(retention / interval)))
+        self.logger = logging.getLogger("proxmox-mcp.metrics")
+        self.series: Dict[str, RingBuffer] = {}
+        self._snapshot: Optional[List[Dict[str, Any]]] = None
+        self._snapshot_time = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the polling thread is active."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start polling in a daemon thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="proxmox-metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling and wait for the thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Poll until stopped; errors are logged and the next poll retries."""
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.poll()
+            except Exception as e:
+                self.logger.warning(f"Metrics poll failed: {e}")
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def poll(self) -> None:
+        """Fetch /cluster/resources once and record a sample per node and guest."""
+        resources = self.proxmox.cluster.resources.get()
+        timestamp = time.time()
+        with self._lock:
+            seen = set()
+            for resource in resources:
+                kind = resource.get("type")
+                if kind not in SAMPLED_TYPES:
+                    continue
+                key = resource.get("id")
+                if not key:
+                    key = f"{kind}/{resource['node'] if kind == 'node' else resource['vmid']}"
+                seen.add(key)
+                buffer = self.series.get(key)
+                if buffer is None:
+                    buffer = self.series[key] = RingBuffer(self.capacity)
+                buffer.append(timestamp, resource)
+            for key in list(self.series):
+                if key not in seen:
+                    del self.series[key]
+            self._snapshot = list(resources)
+            self._snapshot_time = time.monotonic()
+
+    def snapshot(self, types: Optional[Sequence[str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """Get the latest /cluster/resources response if it is fresh.
+
+        Args:
+            types: Only resources of these types (e.g. ('qemu',))
+
+        Returns:
+            List of resource dictionaries, or None if no fresh snapshot exists
+        """
+        with self._lock:
+            if self._snapshot is None or time.monotonic() - self._snapshot_time > 2 * self.interval:
+                return None
+            resources = self._snapshot
+        if types is not None:
+            resources = [r for r in resources if r.get("type") in types]
+        return [dict(r) for r in resources]
+
+    def mark_stale(self) -> None:
+        """Discard the snapshot after a change, so reads go to the API until the next poll."""
+        with self._lock:
+            self._snapshot = None
+
+    def resolve(self, target: str) -> str:
+        """Resolve a node name, VM/container ID or resource ID to a series key.
+
+        Args:
+            target: 'pve1', '100', 'node/pve1' or 'qemu/100'
+
+        Returns:
+            Series key
+
+        Raises:
+            ValueError: If no series matches
+        """
+        with self._lock:
+            keys = list(self.series)
+        candidates = [target] + [f"{kind}/{target}" for kind in SAMPLED_TYPES]
+        for key in candidates:
+            if key in keys:
+                return key
+        raise ValueError(f"No metrics collected for '{target}'")
+
+    def trend(self, key: str, seconds: float,
+              fields: Sequence[str] = METRIC_FIELDS) -> Dict[str, Dict[str, Any]]:
+        """Summarize a series over a recent window.
+
+        Gauges (cpu, mem, disk) are summarized as-is. Cumulative counters
+        (netin, netout, diskread, diskwrite) are converted to per-second
+        rates between consecutive samples first; counter resets are skipped.
+
+        Args:
+            key: Series key (see resolve())
+            seconds: Window length in seconds
+            fields: Metrics to summarize
+
+        Returns:
+            Mapping of metric to {samples, last, min, avg, max}; metrics
+            without samples in the window are omitted
+
+        Raises:
+            ValueError: If the series or a metric is unknown
+        """
+        unknown = [field for field in fields if field not in METRIC_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown metric(s): {', '.join(unknown)}; "
+                             f"available: {', '.join(METRIC_FIELDS)}")
+        now = time.time()
+        with self._lock:
+            buffer = self.series.get(key)
+            if buffer is None:
+                raise ValueError(f"No metrics collected for '{key}'")
+            windows = {field: buffer.window(field, seconds, now) for field in fields}
+
+        result = {}
+        for field, samples in windows.items():
+            if field in COUNTER_FIELDS:
+                values = [
+                    (v2 - v1) / (t2 - t1)
+                    for (t1, v1), (t2, v2) in zip(samples, samples[1:])
+                    if t2 > t1 and v2 >= v1
+                ]
+            else:
+                values = [value for _, value in samples]
+            if values:
+                result[field] = {
+                    "samples": len(values),
+                    "last": values[-1],
+                    "min": min(values),
+                    "avg": sum(values) / len(values),
+                    "max": max(values),
+                }
+        return result
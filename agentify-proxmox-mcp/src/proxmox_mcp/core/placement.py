@@ -0,0 +1,126 @@
+"""
+Capacity-aware placement of new VMs.
+
+Choosing where a VM goes needs the free memory and CPU load of every node
+and the free space of every image-capable storage. /cluster/resources
+reports all of it in one response. This module scores every feasible
+(node, storage) pair from that response, so placement costs no request
+beyond the (cached) resource view:
+- Nodes must be online, with enough cores and free memory
+- Storages must be available on the node, hold VM images and have room
+  for the disk
+- Pairs are ranked by the memory, CPU and disk headroom left after
+  placing the VM
+"""
+from typing import Any, Dict, List, Optional
+
+# Weight of each headroom fraction in a placement score (sums to 1)
+PLACEMENT_WEIGHTS = {"memory": 0.4, "cpu": 0.3, "disk": 0.3}
+
+def candidates(resources: List[Dict[str, Any]], memory: int, disk: int, cpus: int = 1,
+               node: Optional[str] = None, storage: Optional[str] = None,
+               check_memory: bool = True, check_disk: bool = True) -> List[Dict[str, Any]]:
+    """Score every (node, storage) pair that can host a VM, best first.
+
+    A pair's score is the weighted mean of the node's free memory fraction
+    and idle CPU fraction and the storage's free space fraction, with the
+    new VM's memory and disk already subtracted. Shared storage counts the
+    same free space from every node.
+
+    Memory and disk checks can be relaxed where the caller made the
+    choice: Proxmox allows overcommitting memory on a node the user picked
+    deliberately, and a thin pool may hold more than its free space.
+
+    Args:
+        resources: /cluster/resources response, all types
+        memory: VM memory in bytes
+        disk: VM disk size in bytes
+        cpus: VM cores
+        node: Only consider this node
+        storage: Only consider this storage
+        check_memory: Skip nodes without enough free memory
+        check_disk: Skip storages without enough free space
+
+    Returns:
+        Candidates as {node, storage, storage_type, score, free_memory,
+        free_disk, cpu, maxcpu}, highest score first
+
+    Raises:
+        ValueError: If no pair can host the VM; the message names the limiting resource
+    """
+    nodes = {
+        r["node"]: r for r in resources
+        if r.get("type") == "node" and r.get("status") == "online"
+        and (node is None or r["node"] == node)
+    }
+    if not nodes:
+        raise ValueError(f"Node '{node}' is not online" if node else "No online node found")
+
+    fitting = {
+        name: n for name, n in nodes.items()
+        if n.get("maxcpu", 0) >= cpus
+        and (not check_memory or n.get("maxmem", 0) - n.get("mem", 0) >= memory)
+    }
+    if not fitting:
+        need = f"{cpus} core(s) and {memory // 1024 ** 2} MB free memory"
+        raise ValueError(f"Node {node} doesn't have {need}" if node
+                         else f"No online node has {need}")
+
+    pools = [
+        r for r in resources
+        if r.get("type") == "storage" and r.get("node") in fitting
+        and r.get("status") == "available"
+        and "images" in r.get("content", "").split(",")
+        and (storage is None or r["storage"] == storage)
+    ]
+    if not pools:
+        where = f"on node {node}" if node else "on any node with enough memory"
+        raise ValueError(f"Storage '{storage}' not found or can't hold VM images {where}" if storage
+                         else f"No storage for VM images {where}")
+
+    result = []
+    for pool in pools:
+        free_disk = pool.get("maxdisk", 0) - pool.get("disk", 0)
+        if check_disk and free_disk < disk:
+            continue
+        host = fitting[pool["node"]]
+        free_memory = host.get("maxmem", 0) - host.get("mem", 0)
+        headroom = {
+            "memory": (free_memory - memory) / host["maxmem"] if host.get("maxmem") else 0,
+            "cpu": 1 - host.get("cpu", 0),
+            "disk": (free_disk - disk) / pool["maxdisk"] if pool.get("maxdisk") else 0,
+        }
+        result.append({
+            "node": pool["node"],
+            "storage": pool["storage"],
+            "storage_type": pool.get("plugintype", "unknown"),
+            "score": round(sum(PLACEMENT_WEIGHTS[k] * v for k, v in headroom.items()), 4),
+            "free_memory": free_memory,
+            "free_disk": free_disk,
+            "cpu": host.get("cpu", 0),
+            "maxcpu": host.get("maxcpu", 0),
+        })
+    if not result:
+        raise ValueError(f"No storage with {disk // 1024 ** 3} GB free for the VM disk")
+    return sorted(result, key=lambda c: (-c["score"], c["node"], c["storage"]))
+
+def commit(resources: List[Dict[str, Any]], placement: Dict[str, Any], memory: int,
+           disk: int) -> None:
+    """Account for a placed VM in a resource snapshot.
+
+    Adds the VM's memory to its node and its disk to its storage (on every
+    node, for shared storage), so placing the next VM of a batch from the
+    same snapshot sees the reduced headroom and spreads the load.
+
+    Args:
+        resources: /cluster/resources response, modified in place
+        placement: Candidate chosen for the VM
+        memory: VM memory in bytes
+        disk: VM disk size in bytes
+    """
+    for resource in resources:
+        if resource.get("type") == "node" and resource["node"] == placement["node"]:
+            resource["mem"] = resource.get("mem", 0) + memory
+        elif (resource.get("type") == "storage" and resource["storage"] == placement["storage"]
+              and (resource.get("shared") or resource["node"] == placement["node"])):
+            resource["disk"] = resource.get("disk", 0) + disk
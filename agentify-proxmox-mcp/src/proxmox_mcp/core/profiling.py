@@ -0,0 +1,92 @@
+"""
+Startup profiling for the Proxmox MCP server.
+
+This module measures how long the server takes to become ready:
+- Interpreter startup and module imports, as wall time from process start
+- Configuration loading and logging setup
+- Tool registration
+- Proxmox API connection (deferred to the background or first use)
+
+Phases are always measured, which costs a few perf_counter calls. The
+report is only written when profiling is enabled, to stderr, as stdout
+carries the MCP stdio protocol.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+# Environment variable enabling the startup profile report
+PROFILE_ENV = "PROXMOX_MCP_PROFILE_STARTUP"
+
+# Cold-start budget in seconds, from process start until tools are registered
+COLD_START_TARGET = 1.0
+
+def process_uptime() -> Optional[float]:
+    """Get the wall-clock seconds since this process started.
+
+    Read from /proc, so it covers interpreter startup and every import
+    before the caller runs.
+
+    Returns:
+        Seconds since process start, or None where /proc is unavailable
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesized command name; starttime is field 22
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+class StartupProfiler:
+    """Collects named phase timings and reports them."""
+
+    def __init__(self, enabled: bool = False):
+        """Initialize the profiler.
+
+        Args:
+            enabled: Write reports to stderr
+        """
+        self.enabled = enabled
+        self.phases: List[Tuple[str, float]] = []
+        self.notes: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure the duration of a block as a named phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record a phase measured elsewhere."""
+        self.phases.append((name, seconds))
+
+    def note(self, name: str, seconds: float) -> None:
+        """Record a timing that is reported but not part of the total (e.g. CPU time)."""
+        self.notes.append((name, seconds))
+
+    def total(self) -> float:
+        """Get the summed duration of all recorded phases."""
+        return sum(seconds for _, seconds in self.phases)
+
+    def report(self, title: str = "Startup profile") -> str:
+        """Format the recorded phases, one per line, with a total."""
+        width = max([len(name) for name, _ in self.phases + self.notes] + [5])
+        lines = [f"{title}:"]
+        lines += [f"  {name:<{width}}  {seconds * 1000:8.1f} ms" for name, seconds in self.phases]
+        lines.append(f"  {'total':<{width}}  {self.total() * 1000:8.1f} ms")
+        lines += [f"  {name:<{width}}  {seconds * 1000:8.1f} ms (not in total)"
+                  for name, seconds in self.notes]
+        return "\n".join(lines)
+
+    def emit(self, title: str = "Startup profile") -> None:
+        """Write the report to stderr if profiling is enabled."""
+        if self.enabled:
+            print(self.report(title), file=sys.stderr, flush=True)
@@ -5,6 +5,10 @@ This module handles the core Proxmox API integration, providing:
 - Secure API connection setup and management
 - Token-based authentication
 - Connection testing and validation
+- HTTP connection pooling, keep-alive and retries
+- Load spreading and failover across multiple cluster nodes
+- Deferred connection on first use for fast server startup
+- Response caching for read-only API calls
 - Error handling for API operations
 
 The ProxmoxManager class serves as the central point for all Proxmox API
@@ -12,9 +16,15 @@ interactions, ensuring consistent connection handling and authentication
 across the MCP server.
 """
 import logging
-from typing import Dict, Any
-from proxmoxer import ProxmoxAPI
-from ..config.models import ProxmoxConfig, AuthConfig
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple, Union
+from ..config.models import ProxmoxConfig, AuthConfig, CacheConfig
+from .cache import CachedProxmoxAPI, ResponseCache
+from .endpoints import Endpoint, EndpointPool, FailoverProxmoxAPI
+
+if TYPE_CHECKING:
+    from proxmoxer import ProxmoxAPI
 
 class ProxmoxManager:
     """Manager class for Proxmox API operations.
@@ -24,21 +34,39 @@ class ProxmoxManager:
     - Configuration validation and merging
     - Connection testing and health checks
     - Token-based authentication setup
+    - HTTP session tuning (pool size, keep-alive, retries)
+    - Endpoint failover when several cluster nodes are configured
+    - Optional lazy connection on first use
+    - Response caching in front of the API
     
     The manager provides a single point of access to the Proxmox API,
     ensuring proper initialization and error handling for all API operations.
     """
     
-    def __init__(self, proxmox_config: ProxmoxConfig, auth_config: AuthConfig):
+    def __init__(self, proxmox_config: ProxmoxConfig, auth_config: AuthConfig,
+                 cache_config: Optional[CacheConfig] = None, lazy: bool = False):
         """Initialize the Proxmox API manager.
 
         Args:
             proxmox_config: Proxmox connection configuration
             auth_config: Authentication configuration
+            cache_config: Response cache configuration (default: caching enabled)
+            lazy: Defer connecting until the API is first used (default: connect now)
         """
         self.logger = logging.getLogger("proxmox-mcp.proxmox")
+        self.proxmox_config = proxmox_config
         self.config = self._create_config(proxmox_config, auth_config)
-        self.api = self._setup_api()
+        self.pool: Optional[EndpointPool] = None
+        self.connect_time: Optional[float] = None
+        self._api: Optional[Union["ProxmoxAPI", FailoverProxmoxAPI]] = None
+        self._connect_lock = threading.Lock()
+        if not lazy:
+            self.connect()
+
+        cache_config = cache_config or CacheConfig()
+        self.cache = None
+        if cache_config.enabled:
+            self.cache = ResponseCache(cache_config.ttls, max_entries=cache_config.max_entries)
 
     def _create_config(self, proxmox_config: ProxmoxConfig, auth_config: AuthConfig) -> Dict[str, Any]:
         """Create a configuration dictionary for ProxmoxAPI.
@@ -49,6 +77,7 @@ class ProxmoxManager:
         - SSL verification settings
         - Token-based authentication details
         - Service type specification
+        - Request timeout
 
         Args:
             proxmox_config: Proxmox connection configuration (host, port, SSL settings)
@@ -64,20 +93,75 @@ class ProxmoxManager:
             'token_name': auth_config.token_name,
             'token_value': auth_config.token_value,
             'verify_ssl': proxmox_config.verify_ssl,
-            'service': proxmox_config.service
+            'service': proxmox_config.service,
+            'timeout': proxmox_config.timeout
         }
 
-    def _setup_api(self) -> ProxmoxAPI:
+    @property
+    def api(self) -> Union["ProxmoxAPI", FailoverProxmoxAPI]:
+        """Connected API instance, connecting first if necessary."""
+        return self.connect()
+
+    @property
+    def connected(self) -> bool:
+        """Whether the API connection has been established."""
+        return self._api is not None
+
+    def connect(self) -> Union["ProxmoxAPI", FailoverProxmoxAPI]:
+        """Establish the API connection if it isn't already.
+
+        Safe to call from several threads: concurrent callers wait for a
+        single connection attempt. A failed attempt isn't cached, the next
+        call tries again.
+
+        Returns:
+            Connected ProxmoxAPI instance (or failover wrapper)
+
+        Raises:
+            RuntimeError: If the connection fails
+        """
+        if self._api is None:
+            with self._connect_lock:
+                if self._api is None:
+                    start = time.perf_counter()
+                    self._api = self._setup_api()
+                    self.connect_time = time.perf_counter() - start
+        return self._api
+
+    def _endpoints(self) -> List[Tuple[str, int]]:
+        """Get the configured API endpoints as (host, port), primary first.
+
+        Entries of the hosts list may carry their own port ('pve2:8006'),
+        otherwise the configured port is used. Duplicates are dropped.
+        """
+        endpoints = [(self.proxmox_config.host, self.proxmox_config.port)]
+        for entry in self.proxmox_config.hosts:
+            host, port = entry, self.proxmox_config.port
+            name, sep, suffix = entry.rpartition(":")
+            if sep and suffix.isdigit() and (name.count(":") == 0 or name.endswith("]")):
+                host, port = name, int(suffix)
+            if (host, port) not in endpoints:
+                endpoints.append((host, port))
+        return endpoints
+
+    def _setup_api(self) -> Union["ProxmoxAPI", FailoverProxmoxAPI]:
         """Initialize and test Proxmox API connection.
 
         Performs the following steps:
         1. Creates ProxmoxAPI instance with configured settings
-        2. Tests connection by making a version check request
-        3. Validates authentication and permissions
-        4. Logs connection status and any issues
+        2. Tunes its HTTP session for connection reuse and retries
+        3. Tests connection by making a version check request
+        4. Validates authentication and permissions
+        5. Logs connection status and any issues
+
+        With additional hosts configured, one ProxmoxAPI instance is created
+        per endpoint and combined into a failover pool. Startup succeeds as
+        long as one endpoint answers; the others are marked down and probed
+        again later.
 
         Returns:
-            Initialized and tested ProxmoxAPI instance
+            Initialized and tested ProxmoxAPI instance, or a failover wrapper
+            spreading requests over all endpoints
 
         Raises:
             RuntimeError: If connection fails due to:
@@ -86,9 +170,15 @@ class ProxmoxManager:
                         - Network connectivity issues
                         - SSL certificate validation errors
         """
+        endpoints = self._endpoints()
+        if len(endpoints) > 1:
+            return self._setup_pool(endpoints)
+        # proxmoxer pulls in requests and urllib3, so it's imported off the startup path
+        from proxmoxer import ProxmoxAPI
         try:
             self.logger.info(f"Connecting to Proxmox host: {self.config['host']}")
             api = ProxmoxAPI(**self.config)
+            self._configure_session(api)
             
             # Test connection
             api.version.get()
@@ -97,16 +187,134 @@ class ProxmoxManager:
             return api
         except Exception as e:
             self.logger.error(f"Failed to connect to Proxmox: {e}")
-            raise RuntimeError(f"Failed to connect to Proxmox: {e}")
+            raise RuntimeError(f"Failed to connect to Proxmox: {e}") from e
+
+    def _setup_pool(self, endpoints: List[Tuple[str, int]]) -> FailoverProxmoxAPI:
+        """Connect to several endpoints and combine them into a failover pool.
+
+        Args:
+            endpoints: (host, port) of every endpoint, primary first
+
+        Returns:
+            Failover wrapper used in place of a ProxmoxAPI instance
+
+        Raises:
+            RuntimeError: If no endpoint can be reached
+        """
+        from proxmoxer import ProxmoxAPI
+        pool_endpoints = []
+        for host, port in endpoints:
+            try:
+                api = ProxmoxAPI(**dict(self.config, host=host, port=port))
+            except Exception as e:
+                raise RuntimeError(f"Failed to connect to Proxmox: {e}") from e
+            self._configure_session(api)
+            pool_endpoints.append(Endpoint(f"{host}:{port}", api))
+
+        self.pool = EndpointPool(pool_endpoints, self.proxmox_config.health_check_interval)
+        names = ", ".join(endpoint.name for endpoint in pool_endpoints)
+        self.logger.info(f"Connecting to Proxmox endpoints: {names}")
+        healthy = [endpoint.name for endpoint in pool_endpoints if self.pool.check(endpoint)]
+        if not healthy:
+            self.logger.error(f"Failed to connect to Proxmox: no endpoint reachable ({names})")
+            raise RuntimeError(f"Failed to connect to Proxmox: no endpoint reachable ({names})")
+        self.logger.info(f"Successfully connected to Proxmox API via {', '.join(healthy)}")
+        return FailoverProxmoxAPI(self.pool)
+
+    def _configure_session(self, api: "ProxmoxAPI") -> None:
+        """Tune the HTTP session used by a ProxmoxAPI instance.
+
+        proxmoxer creates a plain requests session, whose adapter keeps at
+        most 10 idle connections per host. Concurrent tool calls beyond that
+        open (and TLS handshake) fresh connections that are discarded after
+        use. Mounting an adapter sized by pool_maxsize keeps them alive for
+        reuse. The adapter also retries with exponential backoff:
+        - Connection failures, for any method (the request was never sent)
+        - Read errors such as connection resets, for GETs only
+        - GETs answered with one of retry_statuses (e.g. 503 while pveproxy restarts)
+
+        Mutating requests are never resent after reaching the server, so a
+        retry can't start a VM twice.
+
+        Args:
+            api: ProxmoxAPI instance whose session should be tuned
+        """
+        from requests import Session
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = getattr(api, "_store", {}).get("session")
+        if not isinstance(session, Session):
+            self.logger.debug("ProxmoxAPI backend has no requests session, skipping HTTP tuning")
+            return
+
+        config = self.proxmox_config
+        retry = Retry(
+            total=config.retries,
+            connect=config.retries,
+            read=config.retries,
+            status=config.retries,
+            other=0,
+            backoff_factor=config.retry_backoff,
+            status_forcelist=config.retry_statuses,
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            max_retries=retry,
+        )
+        session.mount("https://", adapter)
+        session.headers["Connection"] = "keep-alive"
 
-    def get_api(self) -> ProxmoxAPI:
+    def get_api(
+        self,
+    ) -> Union["ProxmoxAPI", FailoverProxmoxAPI, "LazyProxmoxAPI", CachedProxmoxAPI]:
         """Get the initialized Proxmox API instance.
         
         Provides access to the configured and tested ProxmoxAPI instance
         for making API calls. The instance maintains connection state and
-        handles authentication automatically.
+        handles authentication automatically. When caching is enabled, the
+        API is wrapped so GET responses are served from the shared cache
+        and mutating calls invalidate the affected entries. Cache misses go
+        through the endpoint pool when several hosts are configured. If the
+        manager hasn't connected yet, the returned API connects on its
+        first request.
 
         Returns:
-            ProxmoxAPI instance ready for making API calls
+            ProxmoxAPI (or caching wrapper) instance ready for making API calls
         """
-        return self.api
+        api = self._api if self._api is not None else LazyProxmoxAPI(self)
+        if self.cache is not None:
+            return CachedProxmoxAPI(api, self.cache)
+        return api
+
+class LazyProxmoxAPI:
+    """Stand-in for a ProxmoxAPI instance that connects on first use.
+
+    Attribute access (api.nodes, api.cluster, ...) connects the manager if
+    needed and forwards to the real API, so tools can be created before the
+    connection exists.
+    """
+
+    def __init__(self, manager: ProxmoxManager):
+        """Initialize the lazy API wrapper.
+
+        Args:
+            manager: Manager owning the connection
+        """
+        self._manager = manager
+
+    def __getattr__(self, item: str) -> Any:
+        if item.startswith("_"):
+            raise AttributeError(item)
+        return getattr(self._manager.api, item)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._manager.api(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "connected" if self._manager.connected else "not connected"
+        return f"LazyProxmoxAPI ({self._manager.config['host']}, {state})"
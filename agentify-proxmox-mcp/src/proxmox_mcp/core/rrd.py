@@ -0,0 +1,140 @@
+"""
+Aggregation of Proxmox RRD metric series.
+
+Proxmox keeps round-robin databases of node and guest metrics, exposed at
+/nodes/{node}/rrddata and /nodes/{node}/{qemu|lxc}/{vmid}/rrddata. This
+module reduces many such series to a few statistics each (sample count,
+average, maximum and percentiles), so capacity questions over hundreds of
+guests become one table.
+
+When NumPy is installed (pip install proxmox-mcp[metrics]), all series are
+packed into one NaN-padded matrix and reduced with vectorized nan-aware
+functions. Without it, a pure-Python path computes the same statistics,
+using the same linear interpolation for percentiles.
+"""
+import math
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+# RRD timeframes accepted by the API and their resolution in seconds
+TIMEFRAMES = {"hour": 60, "day": 1800, "week": 10800, "month": 43200, "year": 604800}
+
+# RRD consolidation functions
+CONSOLIDATIONS = ("AVERAGE", "MAX")
+
+# Metrics that can be aggregated, mapped to their (guest, node) rrddata field;
+# None where the metric doesn't exist for that kind of resource
+RRD_METRICS = {
+    "cpu": ("cpu", "cpu"),
+    "mem": ("mem", "memused"),
+    "netin": ("netin", "netin"),
+    "netout": ("netout", "netout"),
+    "diskread": ("diskread", None),
+    "diskwrite": ("diskwrite", None),
+    "loadavg": (None, "loadavg"),
+    "iowait": (None, "iowait"),
+}
+
+_numpy: Any = None
+
+def _load_numpy() -> Any:
+    """Import NumPy on first use, returning False if it isn't installed."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy
+
+def extract(points: Sequence[Dict[str, Any]], field: str) -> List[float]:
+    """Get the values of one field from RRD data points, skipping gaps.
+
+    Args:
+        points: rrddata response (one dictionary per time slot)
+        field: Metric name (e.g. 'cpu', 'netin')
+
+    Returns:
+        Numeric values in time order
+    """
+    values = []
+    for point in points:
+        value = point.get(field)
+        if isinstance(value, (int, float)) and not math.isnan(value):
+            values.append(float(value))
+    return values
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Compute a percentile of sorted values with linear interpolation.
+
+    Matches NumPy's default ('linear') method.
+
+    Args:
+        sorted_values: Non-empty values in ascending order
+        q: Percentile between 0 and 100
+
+    Returns:
+        Interpolated percentile value
+    """
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def aggregate(series: Dict[Hashable, List[float]], percentiles: Sequence[float] = (50, 95),
+              use_numpy: Optional[bool] = None) -> Dict[Hashable, Dict[str, float]]:
+    """Reduce each series to summary statistics.
+
+    Args:
+        series: Mapping of key to series values
+        percentiles: Percentiles to compute, between 0 and 100
+        use_numpy: Force (True) or disable (False) the NumPy path; default: use it if installed
+
+    Returns:
+        Mapping of key to {samples, avg, max, p<N>...}; empty series are omitted
+
+    Raises:
+        ValueError: If a percentile is out of range, or NumPy is forced but not installed
+    """
+    if any(not 0 <= q <= 100 for q in percentiles):
+        raise ValueError("Percentiles must be between 0 and 100")
+    series = {key: values for key, values in series.items() if values}
+    if not series:
+        return {}
+
+    np = _load_numpy() if use_numpy is not False else False
+    if use_numpy and not np:
+        raise ValueError("NumPy is not installed")
+    if np:
+        return _aggregate_numpy(np, series, percentiles)
+
+    result = {}
+    for key, values in series.items():
+        ordered = sorted(values)
+        stats = {"samples": len(values), "avg": sum(values) / len(values), "max": ordered[-1]}
+        for q in percentiles:
+            stats[f"p{q:g}"] = percentile(ordered, q)
+        result[key] = stats
+    return result
+
+def _aggregate_numpy(np: Any, series: Dict[Hashable, List[float]],
+                     percentiles: Sequence[float]) -> Dict[Hashable, Dict[str, float]]:
+    """Vectorized aggregate() over a NaN-padded matrix, one row per series."""
+    keys = list(series)
+    width = max(len(values) for values in series.values())
+    matrix = np.full((len(keys), width), np.nan)
+    for row, key in enumerate(keys):
+        matrix[row, :len(series[key])] = series[key]
+
+    counts = np.count_nonzero(~np.isnan(matrix), axis=1)
+    means = np.nanmean(matrix, axis=1)
+    maxima = np.nanmax(matrix, axis=1)
+    quantiles = np.nanpercentile(matrix, list(percentiles), axis=1) if percentiles else []
+
+    result = {}
+    for row, key in enumerate(keys):
+        stats = {"samples": int(counts[row]), "avg": float(means[row]), "max": float(maxima[row])}
+        for index, q in enumerate(percentiles):
+            stats[f"p{q:g}"] = float(quantiles[index][row])
+        result[key] = stats
+    return result
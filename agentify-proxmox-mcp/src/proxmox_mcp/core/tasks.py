@@ -0,0 +1,281 @@
+"""
+Task tracking for asynchronous Proxmox operations.
+
+Mutating API calls (VM creation, deletion, power operations) return a UPID
+identifying a background task on a node. This module keeps track of those
+tasks and waits for their completion:
+- UPID registration and parsing
+- Batched polling, one /nodes/{node}/tasks request per node instead of one
+  status request per task, with all nodes polled concurrently
+- Shared polling between concurrent waiters
+- Bounded in-memory task history
+
+The TaskTracker is shared by all tools so that agents can await any task
+they started without hammering the API.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from proxmoxer import ProxmoxAPI
+
+
+def parse_upid(upid: str) -> Dict[str, Any]:
+    """Parse a Proxmox UPID into its components.
+
+    Format: UPID:{node}:{pid}:{pstart}:{starttime}:{type}:{id}:{user}:
+
+    Args:
+        upid: Task identifier returned by a mutating API call
+
+    Returns:
+        Dictionary with node, type, id, user and starttime (epoch seconds)
+
+    Raises:
+        ValueError: If the string is not a valid UPID
+    """
+    parts = str(upid).split(":")
+    if len(parts) < 8 or parts[0] != "UPID":
+        raise ValueError(f"Invalid task ID: {upid}")
+    try:
+        starttime = int(parts[4], 16)
+    except ValueError:
+        raise ValueError(f"Invalid task ID: {upid}") from None
+    return {
+        "node": parts[1],
+        "starttime": starttime,
+        "type": parts[5],
+        "id": parts[6],
+        "user": parts[7],
+    }
+
+class TaskTracker:
+    """Registry and batched poller for Proxmox tasks.
+
+    Registered tasks are refreshed with one /nodes/{node}/tasks request per
+    node that has running tasks. Tasks not found in that listing fall back
+    to an individual status request. Polls are shared: a waiter arriving
+    shortly after another one's poll reuses its results instead of issuing
+    new requests.
+
+    The tracker is thread-safe, as tools run in worker threads.
+    """
+
+    # Minimum seconds between two polls of the API
+    min_poll_interval: float = 0.25
+    # Upper bound for the delay between polls while waiting
+    poll_max: float = 2.0
+    # Seconds a node's poll may take before it is left to finish in the background
+    node_timeout: float = 10.0
+
+    def __init__(self, proxmox_api: "ProxmoxAPI", max_tasks: int = 500):
+        """Initialize the task tracker.
+
+        Args:
+            proxmox_api: Initialized ProxmoxAPI instance
+            max_tasks: Maximum number of finished tasks kept, oldest dropped first; running
+                       tasks and tasks being waited on are always kept
+        """
+        self.proxmox = proxmox_api
+        self.max_tasks = max_tasks
+        self.logger = logging.getLogger("proxmox-mcp.tasks")
+        self._tasks: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._waiting: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._poll_lock = threading.Lock()
+        self._last_poll = 0.0
+
+    def register(self, upid: Any, description: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Start tracking a task.
+
+        Args:
+            upid: Task identifier returned by a mutating API call
+            description: Optional human-readable description (e.g. 'start VM 100')
+
+        Returns:
+            Task state dictionary, or None if upid is not a valid UPID
+        """
+        try:
+            task = parse_upid(upid)
+        except ValueError:
+            self.logger.debug(f"Not tracking invalid task ID: {upid}")
+            return None
+
+        with self._lock:
+            if upid in self._tasks:
+                return dict(self._tasks[upid])
+            task.update({
+                "upid": upid,
+                "description": description or f"{task['type']} {task['id']}".strip(),
+                "status": "running",
+                "exitstatus": None,
+                "endtime": None,
+            })
+            self._tasks[upid] = task
+            self._trim()
+            return dict(task)
+
+    def _trim(self) -> None:
+        """Drop the oldest finished tasks beyond max_tasks.
+
+        Running tasks and tasks someone is waiting on are never dropped, so
+        the history may exceed max_tasks while many tasks are in flight.
+        """
+        excess = len(self._tasks) - self.max_tasks
+        if excess <= 0:
+            return
+        evictable = [upid for upid, task in self._tasks.items()
+                     if task["status"] == "stopped" and upid not in self._waiting]
+        for upid in evictable[:excess]:
+            del self._tasks[upid]
+
+    def get(self, upid: str) -> Optional[Dict[str, Any]]:
+        """Get the last known state of a task."""
+        with self._lock:
+            task = self._tasks.get(upid)
+            return dict(task) if task else None
+
+    def list_tasks(self, running_only: bool = False, refresh: bool = True) -> List[Dict[str, Any]]:
+        """List tracked tasks, newest first.
+
+        Args:
+            running_only: Only include tasks that haven't finished
+            refresh: Poll the API for running tasks first
+
+        Returns:
+            List of task state dictionaries
+        """
+        if refresh:
+            self.poll()
+        with self._lock:
+            tasks = [dict(task) for task in self._tasks.values()]
+        if running_only:
+            tasks = [task for task in tasks if task["status"] == "running"]
+        return sorted(tasks, key=lambda task: task["starttime"], reverse=True)
+
+    def poll(self, force: bool = False) -> None:
+        """Refresh all running tasks with one request per node.
+
+        Nodes are polled concurrently, so a slow or unreachable node delays
+        waiters on other nodes by at most node_timeout. Its tasks keep their
+        last known state until a later poll gets through.
+
+        Skipped if another poll finished less than min_poll_interval ago,
+        unless force is set.
+        """
+        with self._poll_lock:
+            if not force and time.monotonic() - self._last_poll < self.min_poll_interval:
+                return
+            with self._lock:
+                by_node: Dict[str, List[Dict[str, Any]]] = {}
+                for task in self._tasks.values():
+                    if task["status"] == "running":
+                        by_node.setdefault(task["node"], []).append(task)
+
+            if by_node:
+                executor = ThreadPoolExecutor(max_workers=len(by_node),
+                                              thread_name_prefix="proxmox-task-poll")
+                futures = {executor.submit(self._poll_node, node, tasks): node
+                           for node, tasks in by_node.items()}
+                _, late = wait(futures, timeout=self.node_timeout)
+                # Don't block on late nodes; their workers finish in the background
+                executor.shutdown(wait=False)
+                for future in late:
+                    self.logger.warning(f"Polling tasks on node {futures[future]} took over "
+                                        f"{self.node_timeout:.0f}s, skipped for this poll")
+            self._last_poll = time.monotonic()
+
+    def _poll_node(self, node: str, tasks: List[Dict[str, Any]]) -> None:
+        """Refresh running tasks of one node from its task listing."""
+        pending = {task["upid"] for task in tasks}
+        since = min(task["starttime"] for task in tasks)
+        try:
+            listing = list(self.proxmox.nodes(node).tasks.get(source="all", since=since,
+                                                              limit=len(pending) + 500))
+        except Exception as e:
+            self.logger.warning(f"Failed to list tasks on node {node}: {e}")
+            listing = []
+
+        for entry in listing:
+            upid = entry.get("upid")
+            if upid not in pending:
+                continue
+            pending.discard(upid)
+            if entry.get("endtime"):
+                self._finish(upid, entry.get("status", "unknown"), entry.get("endtime"))
+
+        # Tasks missing from the listing get an individual status request
+        for upid in pending:
+            try:
+                status = self.proxmox.nodes(node).tasks(upid).status.get()
+            except Exception as e:
+                self.logger.warning(f"Failed to get status of task {upid}: {e}")
+                continue
+            if status.get("status") == "stopped":
+                self._finish(upid, status.get("exitstatus", "unknown"), status.get("endtime"))
+
+    def _finish(self, upid: str, exitstatus: str, endtime: Optional[int]) -> None:
+        """Mark a task as finished."""
+        with self._lock:
+            task = self._tasks.get(upid)
+            if task is not None:
+                task.update({"status": "stopped", "exitstatus": exitstatus, "endtime": endtime})
+        self.logger.info(f"Task {upid} finished: {exitstatus}")
+
+    def wait(self, upids: Iterable[Any], timeout: float = 300) -> Dict[str, Dict[str, Any]]:
+        """Wait until tasks have finished or the timeout passes.
+
+        Unknown UPIDs are registered first. Polling backs off from
+        min_poll_interval up to poll_max and is shared with other waiters.
+
+        Args:
+            upids: Task identifiers to wait for
+            timeout: Seconds to wait in total
+
+        Returns:
+            Mapping of UPID to its last known task state; tasks still
+            running at the timeout have status 'running', tasks no longer
+            tracked have status 'unknown'
+
+        Raises:
+            ValueError: If a UPID is invalid
+        """
+        upids = list(dict.fromkeys(str(upid) for upid in upids))
+        for upid in upids:
+            parse_upid(upid)
+
+        with self._lock:
+            for upid in upids:
+                self._waiting[upid] = self._waiting.get(upid, 0) + 1
+        try:
+            for upid in upids:
+                self.register(upid)
+            deadline = time.monotonic() + timeout
+            delay = self.min_poll_interval
+            while True:
+                self.poll()
+                states = {upid: self.get(upid) or self._unknown(upid) for upid in upids}
+                if all(state["status"] != "running" for state in states.values()):
+                    return states
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return states
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, self.poll_max)
+        finally:
+            with self._lock:
+                for upid in upids:
+                    self._waiting[upid] -= 1
+                    if not self._waiting[upid]:
+                        del self._waiting[upid]
+                self._trim()
+
+    @staticmethod
+    def _unknown(upid: str) -> Dict[str, Any]:
+        """State of a task that is no longer tracked."""
+        return dict(parse_upid(upid), upid=upid, description="", status="unknown",
+                    exitstatus=None, endtime=None)
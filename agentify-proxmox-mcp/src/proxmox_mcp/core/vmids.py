@@ -0,0 +1,126 @@
+"""
+Cluster-wide VM ID allocation.
+
+New guests need a VM ID that is unused across the whole cluster. Probing
+candidate IDs one by one is slow, and two creates running at the same time
+can both see the same ID as free. This module allocates IDs from
+/cluster/nextid and remembers them locally:
+- Single and bulk allocation with one or two API requests
+- Validation of caller-chosen IDs against the cluster
+- An in-process reservation set, so concurrent creates through this server
+  never get the same ID, even before Proxmox reports the new guest
+
+Reservations expire after a while. By then Proxmox itself lists the guest
+and stops handing out its ID.
+"""
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Union
+
+from .cache import bypass_cache
+
+if TYPE_CHECKING:
+    from proxmoxer import ProxmoxAPI
+
+
+# Highest VM ID Proxmox accepts
+MAX_VMID = 999999999
+
+class VMIDAllocator:
+    """Allocator of unused VM IDs, shared by all tools.
+
+    The allocator is thread-safe, as tools run in worker threads.
+    """
+
+    def __init__(self, proxmox_api: "ProxmoxAPI", reservation_ttl: float = 300):
+        """Initialize the allocator.
+
+        Args:
+            proxmox_api: Initialized ProxmoxAPI instance
+            reservation_ttl: Seconds an allocated ID stays reserved
+        """
+        self.proxmox = proxmox_api
+        self.reservation_ttl = reservation_ttl
+        self._reserved: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def reserved(self) -> List[int]:
+        """IDs currently reserved by this process."""
+        with self._lock:
+            self._expire()
+            return sorted(self._reserved)
+
+    def allocate(self, count: int = 1) -> List[int]:
+        """Reserve the lowest unused VM IDs.
+
+        The first ID comes from /cluster/nextid, which honours the
+        cluster's configured ID range. Further IDs follow it, skipping
+        guests listed by /cluster/resources and IDs reserved locally.
+
+        Args:
+            count: Number of IDs to allocate
+
+        Returns:
+            Allocated IDs in ascending order
+
+        Raises:
+            ValueError: If count is not positive or the ID space is exhausted
+        """
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        with self._lock, bypass_cache():
+            self._expire()
+            vmid = int(self.proxmox.cluster.nextid.get())
+            used = set()
+            if count > 1 or vmid in self._reserved:
+                resources = self.proxmox.cluster.resources.get(type="vm")
+                used = {int(r["vmid"]) for r in resources if "vmid" in r}
+            allocated: List[int] = []
+            expiry = time.monotonic() + self.reservation_ttl
+            while len(allocated) < count:
+                if vmid > MAX_VMID:
+                    raise ValueError("No free VM IDs left")
+                if vmid not in used and vmid not in self._reserved:
+                    allocated.append(vmid)
+                    self._reserved[vmid] = expiry
+                vmid += 1
+            return allocated
+
+    def reserve(self, vmid: Union[int, str]) -> int:
+        """Reserve an ID chosen by the caller, checking the cluster first.
+
+        Args:
+            vmid: VM ID to reserve
+
+        Returns:
+            The reserved ID
+
+        Raises:
+            ValueError: If the ID is in use in the cluster or reserved by another create
+        """
+        try:
+            vmid = int(vmid)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid VM ID '{vmid}'") from None
+        with self._lock:
+            self._expire()
+            if vmid in self._reserved:
+                raise ValueError(f"VM ID {vmid} is already being used by another create")
+            try:
+                self.proxmox.cluster.nextid.get(vmid=vmid)
+            except Exception as e:
+                raise ValueError(f"VM ID {vmid} is not available: {e}") from e
+            self._reserved[vmid] = time.monotonic() + self.reservation_ttl
+            return vmid
+
+    def release(self, vmid: Union[int, str]) -> None:
+        """Return an ID whose create failed, so it can be allocated again."""
+        with self._lock:
+            self._reserved.pop(int(vmid), None)
+
+    def _expire(self) -> None:
+        """Drop reservations past their TTL; the caller holds the lock."""
+        now = time.monotonic()
+        for vmid in [v for v, expiry in self._reserved.items() if expiry <= now]:
+            del self._reserved[vmid]
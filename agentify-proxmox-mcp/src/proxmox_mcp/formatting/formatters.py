@@ -1,7 +1,7 @@
 """
 Core formatting functions for Proxmox MCP output.
 """
-from typing import List, Union, Dict, Any
+from typing import List, Optional, Union, Dict, Any
 from .theme import ProxmoxTheme
 from .colors import ProxmoxColors
 
@@ -126,7 +126,9 @@ class ProxmoxFormatters:
         return f"{prefix}{key_str}: {value}"
     
     @staticmethod
-    def format_command_output(success: bool, command: str, output: str, error: str = None) -> str:
+    def format_command_output(success: bool, command: str, output: str, error: Optional[str] = None,
+                              exit_code: Optional[int] = None, elapsed: Optional[float] = None,
+                              exited: bool = True, truncated: bool = False) -> str:
         """Format command execution output.
         
         Args:
@@ -134,6 +136,10 @@ class ProxmoxFormatters:
             command: The command that was executed
             output: Command output
             error: Optional error message
+            exit_code: Optional command exit code
+            elapsed: Optional execution time in seconds
+            exited: Whether the command finished before the deadline
+            truncated: Whether only the last part of the output was kept
             
         Returns:
             Formatted command output string
@@ -141,11 +147,21 @@ class ProxmoxFormatters:
         result = [
             f"{ProxmoxTheme.ACTIONS['command']} Console Command Result",
             f"  • Status: {'SUCCESS' if success else 'FAILED'}",
-            f"  • Command: {command}",
+            f"  • Command: {command}"
+        ]
+        if not exited:
+            result.append("  • Exit Code: still running (deadline reached, output may be partial)")
+        elif exit_code is not None:
+            result.append(f"  • Exit Code: {exit_code}")
+        if elapsed is not None:
+            result.append(f"  • Duration: {elapsed:.2f}s")
+        if truncated:
+            result.append("  • Output: truncated, showing the last part only")
+        result.extend([
             "",
             "Output:",
             output.strip()
-        ]
+        ])
         
         if error:
             result.extend([
@@ -39,13 +39,20 @@ class ProxmoxTemplates:
                 f"  • Status: {status.upper()}",
                 f"  • Uptime: {ProxmoxFormatters.format_uptime(node.get('uptime', 0))}",
                 f"  • CPU Cores: {node.get('maxcpu', 'N/A')}",
+            ])
+            if "cpu" in node:
+                result.append(f"  • CPU Usage: {node['cpu'] * 100:.1f}%")
+            if node.get("loadavg"):
+                loadavg = " / ".join(f"{value:.2f}" for value in node["loadavg"])
+                result.append(f"  • Load Average: {loadavg}")
+            result.append(
                 f"  • Memory: {ProxmoxFormatters.format_bytes(memory_used)} / "
                 f"{ProxmoxFormatters.format_bytes(memory_total)} ({memory_percent:.1f}%)"
-            ])
+            )
             
             # Add disk usage if available
             disk = node.get("disk", {})
-            if disk:
+            if disk and disk.get("total"):
                 disk_used = disk.get("used", 0)
                 disk_total = disk.get("total", 0)
                 disk_percent = (disk_used / disk_total * 100) if disk_total > 0 else 0
@@ -62,35 +69,45 @@ class ProxmoxTemplates:
         
         Args:
             node: Node name
-            status: Node status data
+            status: Node status data (/nodes/{node}/status payload)
             
         Returns:
             Formatted node status string
         """
-        memory = status.get("memory", {})
-        memory_used = memory.get("used", 0)
-        memory_total = memory.get("total", 0)
-        memory_percent = (memory_used / memory_total * 100) if memory_total > 0 else 0
-        
+        def usage(label: str, resource: Dict[str, Any]) -> str:
+            used = resource.get("used", 0)
+            total = resource.get("total", 0)
+            percent = (used / total * 100) if total > 0 else 0
+            return (f"  • {label}: {ProxmoxFormatters.format_bytes(used)} / "
+                    f"{ProxmoxFormatters.format_bytes(total)} ({percent:.1f}%)")
+
+        cpuinfo = status.get("cpuinfo", {})
         result = [
             f"{ProxmoxTheme.RESOURCES['node']} Node: {node}",
             f"  • Status: {status.get('status', 'unknown').upper()}",
             f"  • Uptime: {ProxmoxFormatters.format_uptime(status.get('uptime', 0))}",
-            f"  • CPU Cores: {status.get('maxcpu', 'N/A')}",
-            f"  • Memory: {ProxmoxFormatters.format_bytes(memory_used)} / "
-            f"{ProxmoxFormatters.format_bytes(memory_total)} ({memory_percent:.1f}%)"
+            f"  • CPU Cores: {cpuinfo.get('cpus', status.get('maxcpu', 'N/A'))}",
         ]
+        if cpuinfo.get("model"):
+            result.append(f"  • CPU Model: {cpuinfo['model']}")
+        if "cpu" in status:
+            result.append(f"  • CPU Usage: {status['cpu'] * 100:.1f}%")
+        if status.get("loadavg"):
+            loadavg = " / ".join(str(value) for value in status["loadavg"])
+            result.append(f"  • Load Average: {loadavg}")
+        result.append(usage("Memory", status.get("memory", {})))
+        if status.get("swap", {}).get("total"):
+            result.append(usage("Swap", status["swap"]))
         
-        # Add disk usage if available
-        disk = status.get("disk", {})
+        # Add disk usage if available (rootfs in the status payload)
+        disk = status.get("rootfs") or status.get("disk", {})
         if disk:
-            disk_used = disk.get("used", 0)
-            disk_total = disk.get("total", 0)
-            disk_percent = (disk_used / disk_total * 100) if disk_total > 0 else 0
-            result.append(
-                f"  • Disk: {ProxmoxFormatters.format_bytes(disk_used)} / "
-                f"{ProxmoxFormatters.format_bytes(disk_total)} ({disk_percent:.1f}%)"
-            )
+            result.append(usage("Root FS" if "rootfs" in status else "Disk", disk))
+        if status.get("ksm", {}).get("shared"):
+            ksm_shared = ProxmoxFormatters.format_bytes(status["ksm"]["shared"])
+            result.append(f"  • KSM Shared: {ksm_shared}")
+        if status.get("pveversion"):
+            result.append(f"  • Version: {status['pveversion']}")
         
         return "\n".join(result)
     
@@ -146,9 +163,16 @@ class ProxmoxTemplates:
                 f"{ProxmoxTheme.RESOURCES['storage']} {store['storage']}",
                 f"  • Status: {store.get('status', 'unknown').upper()}",
                 f"  • Type: {store['type']}",
+            ])
+            if store.get("nodes"):
+                scope = "Shared" if store.get("shared") else "Local"
+                result.append(f"  • {scope}: {', '.join(store['nodes'])}")
+            if store.get("content"):
+                result.append(f"  • Content: {', '.join(store['content'])}")
+            result.append(
                 f"  • Usage: {ProxmoxFormatters.format_bytes(used)} / "
                 f"{ProxmoxFormatters.format_bytes(total)} ({percent:.1f}%)"
-            ])
+            )
             
         return "\n".join(result)
     
@@ -185,6 +209,36 @@ class ProxmoxTemplates:
             
         return "\n".join(result)
 
+    @staticmethod
+    def container_status(status: Dict[str, Any]) -> str:
+        """Template for detailed container status output.
+
+        Args:
+            status: Container status data, including the node it runs on
+
+        Returns:
+            Formatted container status string
+        """
+        memory_used = status.get("mem", 0)
+        memory_total = status.get("maxmem", 0)
+        memory_percent = (memory_used / memory_total * 100) if memory_total > 0 else 0
+        disk_used = status.get("disk", 0)
+        disk_total = status.get("maxdisk", 0)
+        disk_percent = (disk_used / disk_total * 100) if disk_total > 0 else 0
+
+        return "\n".join([
+            f"{ProxmoxTheme.RESOURCES['container']} {status.get('name', 'unknown')} "
+            f"(ID: {status.get('vmid', 'N/A')})",
+            f"  • Status: {status.get('status', 'unknown').upper()}",
+            f"  • Node: {status.get('node', 'unknown')}",
+            f"  • Uptime: {ProxmoxFormatters.format_uptime(status.get('uptime', 0))}",
+            f"  • CPU: {status.get('cpu', 0) * 100:.1f}% of {status.get('cpus', 'N/A')} cores",
+            f"  • Memory: {ProxmoxFormatters.format_bytes(memory_used)} / "
+            f"{ProxmoxFormatters.format_bytes(memory_total)} ({memory_percent:.1f}%)",
+            f"  • Disk: {ProxmoxFormatters.format_bytes(disk_used)} / "
+            f"{ProxmoxFormatters.format_bytes(disk_total)} ({disk_percent:.1f}%)"
+        ])
+
     @staticmethod
     def cluster_status(status: Dict[str, Any]) -> str:
         """Template for cluster status output.
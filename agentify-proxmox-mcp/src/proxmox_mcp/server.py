@@ -7,72 +7,217 @@ This module implements the core MCP server for Proxmox integration, providing:
 - Proxmox API connection management
 - MCP tool registration and routing
 - Signal handling for graceful shutdown
+- Fast startup with the Proxmox connection deferred to the background
 
 The server exposes a set of tools for managing Proxmox resources including:
 - Node management
 - VM operations
 - Storage management
 - Cluster status monitoring
+- Task tracking for long-running operations
 """
 import logging
 import os
 import sys
 import signal
-from typing import Optional, List, Annotated
+import threading
+import time
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Dict, Optional, List, Annotated, Literal, TypeVar
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 from mcp.server.fastmcp.tools import Tool
 from mcp.types import TextContent as Content
 from pydantic import Field
 
 from .config.loader import load_config
 from .core.logging import setup_logging
+from .core.profiling import COLD_START_TARGET, PROFILE_ENV, StartupProfiler, process_uptime
 from .core.proxmox import ProxmoxManager
-from .tools.node import NodeTools
-from .tools.vm import VMTools
-from .tools.storage import StorageTools
-from .tools.cluster import ClusterTools
+from .core.content import ContentIndex
+from .core.metrics import METRIC_FIELDS, MetricsCollector
+from .core.tasks import TaskTracker
+from .core.vmids import VMIDAllocator
 from .tools.definitions import (
     GET_NODES_DESC,
     GET_NODE_STATUS_DESC,
+    COMPARE_NODES_DESC,
     GET_VMS_DESC,
     CREATE_VM_DESC,
+    CREATE_VMS_BATCH_DESC,
     EXECUTE_VM_COMMAND_DESC,
+    EXECUTE_VM_COMMAND_STREAM_DESC,
+    EXECUTE_VM_COMMAND_BATCH_DESC,
     START_VM_DESC,
     STOP_VM_DESC,
     SHUTDOWN_VM_DESC,
     RESET_VM_DESC,
+    BULK_VM_POWER_DESC,
     DELETE_VM_DESC,
     GET_CONTAINERS_DESC,
+    GET_CONTAINER_STATUS_DESC,
+    CONTAINER_POWER_DESC,
     GET_STORAGE_DESC,
-    GET_CLUSTER_STATUS_DESC
+    FIND_STORAGE_CONTENT_DESC,
+    GET_CLUSTER_STATUS_DESC,
+    WAIT_TASK_DESC,
+    LIST_TASKS_DESC,
+    GET_METRICS_TREND_DESC,
+    GET_RRD_STATS_DESC,
+    GET_TOP_GUESTS_DESC,
+    GUEST_FIELDS,
+    DEFAULT_GUEST_PAGE_SIZE,
+    MAX_GUEST_PAGE_SIZE,
+    MAX_BATCH_SIZE,
+    VM_LIMITS
 )
 
+if TYPE_CHECKING:
+    from .tools.base import ProxmoxTool
+    from .tools.cluster import ClusterTools
+    from .tools.container import ContainerTools
+    from .tools.metrics import MetricsTools
+    from .tools.node import NodeTools
+    from .tools.storage import StorageTools
+    from .tools.tasks import TaskTools
+    from .tools.vm import VMTools
+
+ToolT = TypeVar("ToolT", bound="ProxmoxTool")
+
 class ProxmoxMCPServer:
     """Main server class for Proxmox MCP."""
 
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, profile_startup: Optional[bool] = None,
+                 import_time: Optional[float] = None, import_cpu_time: Optional[float] = None):
         """Initialize the server.
 
+        No network request is made here: the Proxmox connection is
+        established in the background once the server starts, or on the
+        first tool call, whichever comes first. Tools are registered
+        immediately so the MCP client doesn't wait on the Proxmox API.
+
         Args:
             config_path: Path to configuration file
+            profile_startup: Report startup phase timings to stderr
+                             (default: PROXMOX_MCP_PROFILE_STARTUP env variable)
+            import_time: Wall-clock seconds from process start until main() ran
+                         (interpreter startup and imports), reported as the 'import' phase
+            import_cpu_time: CPU seconds spent before main(), reported separately
+                             where the wall time can't be measured
         """
-        self.config = load_config(config_path)
-        self.logger = setup_logging(self.config.logging)
-        
-        # Initialize core components
-        self.proxmox_manager = ProxmoxManager(self.config.proxmox, self.config.auth)
-        self.proxmox = self.proxmox_manager.get_api()
+        if profile_startup is None:
+            profile_startup = os.getenv(PROFILE_ENV, "").lower() in ("1", "true", "yes")
+        self.profiler = StartupProfiler(profile_startup)
+        if import_time is not None:
+            self.profiler.record("import", import_time)
+        elif import_cpu_time is not None:
+            self.profiler.note("import (CPU time)", import_cpu_time)
+
+        with self.profiler.phase("config"):
+            self.config = load_config(config_path)
+        with self.profiler.phase("logging"):
+            self.logger = setup_logging(self.config.logging)
         
-        # Initialize tools
-        self.node_tools = NodeTools(self.proxmox)
-        self.vm_tools = VMTools(self.proxmox)
-        self.storage_tools = StorageTools(self.proxmox)
-        self.cluster_tools = ClusterTools(self.proxmox)
+        with self.profiler.phase("tools"):
+            # Initialize core components, connecting on first use
+            self.proxmox_manager = ProxmoxManager(self.config.proxmox, self.config.auth,
+                                                  self.config.cache, lazy=True)
+            self.proxmox = self.proxmox_manager.get_api()
+
+            # Tasks started by any tool are tracked in one place
+            self.task_tracker = TaskTracker(self.proxmox)
+            self.task_tracker.node_timeout = self.config.proxmox.request_budget()
+
+            # VM IDs handed out to concurrent creates
+            self.vmids = VMIDAllocator(self.proxmox)
+
+            # Catalog of ISOs, templates and backups, built on first search
+            self.content_index = ContentIndex(self.config.cache.content_ttl)
+
+            # Background metrics, polled once the server starts
+            self.metrics = None
+            if self.config.metrics.enabled:
+                self.metrics = MetricsCollector(self.proxmox, self.config.metrics.interval,
+                                                self.config.metrics.retention)
         
-        # Initialize MCP server
-        self.mcp = FastMCP("ProxmoxMCP")
-        self._setup_tools()
+        with self.profiler.phase("register"):
+            # Initialize MCP server
+            self.mcp = FastMCP("ProxmoxMCP")
+            self._setup_tools()
+
+        self.profiler.emit("Startup profile (ready to serve)")
+        if self.profiler.total() > COLD_START_TARGET:
+            self.logger.warning(f"Server startup took {self.profiler.total():.2f}s "
+                                f"(target: {COLD_START_TARGET:.1f}s)")
+
+    def _configure_tool(self, tool: ToolT) -> ToolT:
+        """Apply configured defaults to a newly created tool instance."""
+        tool.output_format = self.config.output.format
+        # Fanned-out requests are only given up once their retries have run out
+        tool.call_timeout = self.config.proxmox.request_budget()
+        tool.metrics = self.metrics
+        return tool
+
+    # Tool implementations are imported and created on first invocation,
+    # registering a tool only needs its signature and description.
+    @cached_property
+    def node_tools(self) -> "NodeTools":
+        from .tools.node import NodeTools
+        return self._configure_tool(NodeTools(self.proxmox))
+
+    @cached_property
+    def vm_tools(self) -> "VMTools":
+        from .tools.vm import VMTools
+        return self._configure_tool(VMTools(self.proxmox, self.task_tracker, self.vmids))
+
+    @cached_property
+    def container_tools(self) -> "ContainerTools":
+        from .tools.container import ContainerTools
+        return self._configure_tool(ContainerTools(self.proxmox, self.task_tracker, self.vmids))
+
+    @cached_property
+    def storage_tools(self) -> "StorageTools":
+        from .tools.storage import StorageTools
+        return self._configure_tool(StorageTools(self.proxmox, self.content_index))
+
+    @cached_property
+    def cluster_tools(self) -> "ClusterTools":
+        from .tools.cluster import ClusterTools
+        return self._configure_tool(ClusterTools(self.proxmox))
+
+    @cached_property
+    def task_tools(self) -> "TaskTools":
+        from .tools.tasks import TaskTools
+        return self._configure_tool(TaskTools(self.proxmox, self.task_tracker))
+
+    @cached_property
+    def metrics_tools(self) -> "MetricsTools":
+        from .tools.metrics import MetricsTools
+        return self._configure_tool(MetricsTools(self.proxmox))
+
+    def _connect_in_background(self) -> threading.Thread:
+        """Connect to the Proxmox API without delaying the MCP stdio loop.
+
+        A failure is logged rather than raised; the next tool call tries
+        to connect again and reports the error to the client.
+
+        Returns:
+            Started daemon thread performing the connection
+        """
+        def connect() -> None:
+            try:
+                self.proxmox_manager.connect()
+            except RuntimeError as e:
+                self.logger.warning(
+                    f"Background connection failed, retrying on first tool call: {e}"
+                )
+            if self.proxmox_manager.connect_time is not None:
+                self.profiler.record("connect", self.proxmox_manager.connect_time)
+                self.profiler.emit("Startup profile (connected)")
+
+        thread = threading.Thread(target=connect, name="proxmox-connect", daemon=True)
+        thread.start()
+        return thread
 
     def _setup_tools(self) -> None:
         """Register MCP tools with the server.
@@ -82,100 +227,592 @@ class ProxmoxMCPServer:
         - VM operation tools (list VMs, execute commands, power management)
         - Storage management tools (list storage)
         - Cluster tools (get cluster status)
+        - Task tools (wait for tasks, list tasks)
+        - Metrics tools (recent usage trends from memory, RRD statistics)
         
         Each tool is registered with appropriate descriptions and parameter
-        validation using Pydantic models.
+        validation using Pydantic models. All tools are coroutines whose
+        blocking API calls run in worker threads, so concurrent tool calls
+        overlap instead of stalling the event loop.
         """
+        # Per-call output format of read tools, overriding the configured default
+        OutputFormat = Annotated[Optional[Literal["text", "json"]], Field(
+            description="Output format: 'text' (formatted) or 'json' (compact, for programmatic "
+                        "use); default from config",
+            default=None,
+        )]
         
         # Node tools
         @self.mcp.tool(description=GET_NODES_DESC)
-        def get_nodes():
-            return self.node_tools.get_nodes()
+        async def get_nodes(output_format: OutputFormat = None):
+            return await self.node_tools.get_nodes(output_format)
 
         @self.mcp.tool(description=GET_NODE_STATUS_DESC)
-        def get_node_status(
-            node: Annotated[str, Field(description="Name/ID of node to query (e.g. 'pve1', 'proxmox-node2')")]
+        async def get_node_status(
+            node: Annotated[str, Field(
+                description="Name/ID of node to query (e.g. 'pve1', 'proxmox-node2')"
+            )],
+            output_format: OutputFormat = None
         ):
-            return self.node_tools.get_node_status(node)
+            return await self.node_tools.get_node_status(node, output_format)
+
+        @self.mcp.tool(description=COMPARE_NODES_DESC)
+        async def compare_nodes(
+            sort_by: Annotated[Literal["node", "cpu", "load", "mem", "disk"], Field(
+                description="Rank nodes by most headroom in this resource", default="node"
+            )] = "node",
+            output_format: OutputFormat = None
+        ):
+            return await self.node_tools.compare_nodes(sort_by, output_format)
 
         # VM tools
         @self.mcp.tool(description=GET_VMS_DESC)
-        def get_vms():
-            return self.vm_tools.get_vms()
+        async def get_vms(
+            include_config: Annotated[bool, Field(
+                description="Also fetch each VM's config for configured core counts (slower)",
+                default=False,
+            )] = False,
+            output_format: OutputFormat = None,
+            node: Annotated[Optional[str], Field(
+                description="Only VMs on this node (e.g. 'pve1')", default=None
+            )] = None,
+            status: Annotated[Optional[str], Field(
+                description="Only VMs in this state (e.g. 'running', 'stopped')", default=None
+            )] = None,
+            name: Annotated[Optional[str], Field(
+                description="Only VMs whose name matches this glob (e.g. 'web-*')", default=None
+            )] = None,
+            tag: Annotated[Optional[str], Field(
+                description="Only VMs carrying this tag", default=None
+            )] = None,
+            vmid_min: Annotated[Optional[int], Field(
+                description="Lowest VM ID to include", default=None
+            )] = None,
+            vmid_max: Annotated[Optional[int], Field(
+                description="Highest VM ID to include", default=None
+            )] = None,
+            fields: Annotated[Optional[List[str]], Field(
+                description=f"Fields to return, from: {', '.join(GUEST_FIELDS)}", default=None
+            )] = None,
+            limit: Annotated[int, Field(
+                description="Maximum number of VMs per page",
+                default=DEFAULT_GUEST_PAGE_SIZE, ge=1, le=MAX_GUEST_PAGE_SIZE,
+            )] = DEFAULT_GUEST_PAGE_SIZE,
+            cursor: Annotated[Optional[str], Field(
+                description="Cursor returned by the previous page", default=None
+            )] = None
+        ):
+            return await self.vm_tools.get_vms(
+                include_config, output_format, node=node, status=status, name=name, tag=tag,
+                vmid_min=vmid_min, vmid_max=vmid_max, fields=fields, limit=limit, cursor=cursor
+            )
 
         @self.mcp.tool(description=CREATE_VM_DESC)
-        def create_vm(
-            node: Annotated[str, Field(description="Host node name (e.g. 'pve')")],
-            vmid: Annotated[str, Field(description="New VM ID number (e.g. '200', '300')")],
+        async def create_vm(
             name: Annotated[str, Field(description="VM name (e.g. 'my-new-vm', 'web-server')")],
-            cpus: Annotated[int, Field(description="Number of CPU cores (e.g. 1, 2, 4)", ge=1, le=32)],
-            memory: Annotated[int, Field(description="Memory size in MB (e.g. 2048 for 2GB)", ge=512, le=131072)],
-            disk_size: Annotated[int, Field(description="Disk size in GB (e.g. 10, 20, 50)", ge=5, le=1000)],
-            storage: Annotated[Optional[str], Field(description="Storage name (optional, will auto-detect)", default=None)] = None,
-            ostype: Annotated[Optional[str], Field(description="OS type (optional, default: 'l26' for Linux)", default=None)] = None
+            cpus: Annotated[int, Field(
+                description="Number of CPU cores (e.g. 1, 2, 4)",
+                ge=VM_LIMITS["cpus"][0], le=VM_LIMITS["cpus"][1],
+            )],
+            memory: Annotated[int, Field(
+                description="Memory size in MB (e.g. 2048 for 2GB)",
+                ge=VM_LIMITS["memory"][0], le=VM_LIMITS["memory"][1],
+            )],
+            disk_size: Annotated[int, Field(
+                description="Disk size in GB (e.g. 10, 20, 50)",
+                ge=VM_LIMITS["disk_size"][0], le=VM_LIMITS["disk_size"][1],
+            )],
+            vmid: Annotated[Optional[str], Field(
+                description="New VM ID number (optional, next free ID if not specified)",
+                default=None,
+            )] = None,
+            node: Annotated[Optional[str], Field(
+                description="Host node name (optional, placed on the node with the most headroom)",
+                default=None,
+            )] = None,
+            storage: Annotated[Optional[str], Field(
+                description="Storage name (optional, placed on the storage with the most free "
+                            "space)",
+                default=None,
+            )] = None,
+            ostype: Annotated[Optional[str], Field(
+                description="OS type (optional, default: 'l26' for Linux)", default=None
+            )] = None
         ):
-            return self.vm_tools.create_vm(node, vmid, name, cpus, memory, disk_size, storage, ostype)
+            return await self.vm_tools.create_vm(node, vmid, name, cpus, memory, disk_size, storage,
+                                                 ostype)
+
+        @self.mcp.tool(description=CREATE_VMS_BATCH_DESC)
+        async def create_vms_batch(
+            specs: Annotated[Optional[List[Dict[str, Any]]], Field(
+                description="VM specs with keys name (required), cpus, memory, disk_size, node, "
+                            "storage, ostype, template, vmid",
+                default=None,
+            )] = None,
+            count: Annotated[Optional[int], Field(
+                description="Number of VMs when no specs are given",
+                default=None, ge=1, le=MAX_BATCH_SIZE,
+            )] = None,
+            name_pattern: Annotated[str, Field(
+                description="Name of VM number n in count mode (e.g. 'lab-{n:02d}')",
+                default="vm-{n}",
+            )] = "vm-{n}",
+            start_index: Annotated[int, Field(
+                description="First number in count mode", default=1, ge=0
+            )] = 1,
+            cpus: Annotated[int, Field(
+                description="Number of CPU cores",
+                default=1, ge=VM_LIMITS["cpus"][0], le=VM_LIMITS["cpus"][1],
+            )] = 1,
+            memory: Annotated[int, Field(
+                description="Memory size in MB",
+                default=2048, ge=VM_LIMITS["memory"][0], le=VM_LIMITS["memory"][1],
+            )] = 2048,
+            disk_size: Annotated[int, Field(
+                description="Disk size in GB",
+                default=10, ge=VM_LIMITS["disk_size"][0], le=VM_LIMITS["disk_size"][1],
+            )] = 10,
+            node: Annotated[Optional[str], Field(
+                description="Host node name (optional, auto-placed per VM)", default=None
+            )] = None,
+            storage: Annotated[Optional[str], Field(
+                description="Storage name (optional, auto-placed per VM)", default=None
+            )] = None,
+            ostype: Annotated[Optional[str], Field(
+                description="OS type (optional, default: 'l26' for Linux)", default=None
+            )] = None,
+            template: Annotated[Optional[int], Field(
+                description="Template VM ID to full-clone instead of creating empty VMs",
+                default=None,
+            )] = None,
+            max_per_node: Annotated[int, Field(
+                description="Maximum concurrent create/clone tasks per node", default=2, ge=1, le=16
+            )] = 2,
+            wait: Annotated[bool, Field(
+                description="Wait for all tasks to finish", default=True
+            )] = True,
+            timeout: Annotated[float, Field(
+                description="Seconds the batch may take when waiting", default=1800, gt=0, le=14400
+            )] = 1800
+        ):
+            return await self.vm_tools.create_vms_batch(
+                specs, count, name_pattern, start_index, cpus, memory, disk_size, node, storage,
+                ostype, template, max_per_node, wait, timeout
+            )
 
         @self.mcp.tool(description=EXECUTE_VM_COMMAND_DESC)
         async def execute_vm_command(
-            node: Annotated[str, Field(description="Host node name (e.g. 'pve1', 'proxmox-node2')")],
+            node: Annotated[str, Field(
+                description="Host node name (e.g. 'pve1', 'proxmox-node2')"
+            )],
             vmid: Annotated[str, Field(description="VM ID number (e.g. '100', '101')")],
-            command: Annotated[str, Field(description="Shell command to run (e.g. 'uname -a', 'systemctl status nginx')")]
+            command: Annotated[str, Field(
+                description="Shell command to run (e.g. 'uname -a', 'systemctl status nginx')"
+            )],
+            timeout: Annotated[Optional[float], Field(
+                description="Seconds to wait for the command to finish (optional, default: 30)",
+                default=None, gt=0, le=3600,
+            )] = None
         ):
-            return await self.vm_tools.execute_command(node, vmid, command)
+            return await self.vm_tools.execute_command(node, vmid, command, timeout)
+
+        @self.mcp.tool(description=EXECUTE_VM_COMMAND_STREAM_DESC)
+        async def execute_vm_command_stream(
+            node: Annotated[str, Field(
+                description="Host node name (e.g. 'pve1', 'proxmox-node2')"
+            )],
+            vmid: Annotated[str, Field(description="VM ID number (e.g. '100', '101')")],
+            command: Annotated[str, Field(
+                description="Shell command to run (e.g. 'apt-get upgrade -y')"
+            )],
+            ctx: Context,
+            timeout: Annotated[float, Field(
+                description="Seconds to wait for the command to finish", default=600, gt=0, le=86400
+            )] = 600,
+            max_bytes: Annotated[int, Field(
+                description="Maximum bytes of output kept in the final result",
+                default=65536, ge=1024, le=10485760,
+            )] = 65536
+        ):
+            received = 0
+
+            async def on_output(stream: str, chunk: str) -> None:
+                nonlocal received
+                received += len(chunk)
+                prefix = "stderr: " if stream == "err" else ""
+                try:
+                    await ctx.report_progress(received, message=f"{prefix}{chunk}")
+                except Exception as e:
+                    # Progress is best-effort; keep the command running without it
+                    self.logger.debug(f"Could not send progress notification: {e}")
+
+            return await self.vm_tools.execute_command_stream(node, vmid, command, on_output,
+                                                              timeout, max_bytes)
+
+        @self.mcp.tool(description=EXECUTE_VM_COMMAND_BATCH_DESC)
+        async def execute_vm_command_batch(
+            command: Annotated[str, Field(
+                description="Shell command to run in every VM (e.g. 'uptime')"
+            )],
+            vms: Annotated[Optional[List[str]], Field(
+                description="VM IDs, optionally with node prefix (e.g. ['100', 'pve1:101'])",
+                default=None,
+            )] = None,
+            tag: Annotated[Optional[str], Field(
+                description="Run in all VMs carrying this tag (e.g. 'web')", default=None
+            )] = None,
+            name: Annotated[Optional[str], Field(
+                description="Run in all VMs whose name matches this glob (e.g. 'web-*')",
+                default=None,
+            )] = None,
+            max_concurrency: Annotated[int, Field(
+                description="Maximum concurrent API requests", default=10, ge=1, le=100
+            )] = 10,
+            timeout: Annotated[Optional[float], Field(
+                description="Seconds to wait for commands to finish (optional, default: 30)",
+                default=None, gt=0, le=3600,
+            )] = None
+        ):
+            return await self.vm_tools.execute_command_batch(command, vms, tag, name,
+                                                             max_concurrency, timeout)
 
         # VM Power Management tools
         @self.mcp.tool(description=START_VM_DESC)
-        def start_vm(
+        async def start_vm(
             node: Annotated[str, Field(description="Host node name (e.g. 'pve')")],
             vmid: Annotated[str, Field(description="VM ID number (e.g. '101')")]
         ):
-            return self.vm_tools.start_vm(node, vmid)
+            return await self.vm_tools.start_vm(node, vmid)
 
         @self.mcp.tool(description=STOP_VM_DESC)
-        def stop_vm(
+        async def stop_vm(
             node: Annotated[str, Field(description="Host node name (e.g. 'pve')")],
             vmid: Annotated[str, Field(description="VM ID number (e.g. '101')")]
         ):
-            return self.vm_tools.stop_vm(node, vmid)
+            return await self.vm_tools.stop_vm(node, vmid)
 
         @self.mcp.tool(description=SHUTDOWN_VM_DESC)
-        def shutdown_vm(
+        async def shutdown_vm(
             node: Annotated[str, Field(description="Host node name (e.g. 'pve')")],
             vmid: Annotated[str, Field(description="VM ID number (e.g. '101')")]
         ):
-            return self.vm_tools.shutdown_vm(node, vmid)
+            return await self.vm_tools.shutdown_vm(node, vmid)
 
         @self.mcp.tool(description=RESET_VM_DESC)
-        def reset_vm(
+        async def reset_vm(
             node: Annotated[str, Field(description="Host node name (e.g. 'pve')")],
             vmid: Annotated[str, Field(description="VM ID number (e.g. '101')")]
         ):
-            return self.vm_tools.reset_vm(node, vmid)
+            return await self.vm_tools.reset_vm(node, vmid)
+
+        @self.mcp.tool(description=BULK_VM_POWER_DESC)
+        async def bulk_vm_power(
+            action: Annotated[Literal["start", "stop", "shutdown", "reset"], Field(
+                description="Power action to run"
+            )],
+            vms: Annotated[Optional[List[str]], Field(
+                description="VM IDs, optionally with node prefix (e.g. ['100', 'pve1:101'])",
+                default=None,
+            )] = None,
+            tag: Annotated[Optional[str], Field(
+                description="Select all VMs carrying this tag (e.g. 'lab')", default=None
+            )] = None,
+            name: Annotated[Optional[str], Field(
+                description="Select all VMs whose name matches this glob (e.g. 'web-*')",
+                default=None,
+            )] = None,
+            max_concurrency: Annotated[int, Field(
+                description="Maximum concurrent API requests", default=10, ge=1, le=100
+            )] = 10,
+            wait: Annotated[bool, Field(
+                description="Wait for the power tasks to finish", default=False
+            )] = False,
+            timeout: Annotated[float, Field(
+                description="Seconds to wait for tasks when wait is set", default=300, gt=0, le=3600
+            )] = 300
+        ):
+            return await self.vm_tools.bulk_power(action, vms, tag, name, max_concurrency, wait,
+                                                  timeout)
 
         @self.mcp.tool(description=DELETE_VM_DESC)
-        def delete_vm(
+        async def delete_vm(
             node: Annotated[str, Field(description="Host node name (e.g. 'pve')")],
             vmid: Annotated[str, Field(description="VM ID number (e.g. '998')")],
-            force: Annotated[bool, Field(description="Force deletion even if VM is running", default=False)] = False
+            force: Annotated[bool, Field(
+                description="Force deletion even if VM is running", default=False
+            )] = False
         ):
-            return self.vm_tools.delete_vm(node, vmid, force)
+            return await self.vm_tools.delete_vm(node, vmid, force)
+
+        # Container tools
+        @self.mcp.tool(description=GET_CONTAINERS_DESC)
+        async def get_containers(
+            include_config: Annotated[bool, Field(
+                description="Also fetch each container's config for configured core counts "
+                            "(slower)",
+                default=False,
+            )] = False,
+            output_format: OutputFormat = None,
+            node: Annotated[Optional[str], Field(
+                description="Only containers on this node (e.g. 'pve1')", default=None
+            )] = None,
+            status: Annotated[Optional[str], Field(
+                description="Only containers in this state (e.g. 'running', 'stopped')",
+                default=None,
+            )] = None,
+            name: Annotated[Optional[str], Field(
+                description="Only containers whose name matches this glob (e.g. 'web-*')",
+                default=None,
+            )] = None,
+            tag: Annotated[Optional[str], Field(
+                description="Only containers carrying this tag", default=None
+            )] = None,
+            vmid_min: Annotated[Optional[int], Field(
+                description="Lowest container ID to include", default=None
+            )] = None,
+            vmid_max: Annotated[Optional[int], Field(
+                description="Highest container ID to include", default=None
+            )] = None,
+            fields: Annotated[Optional[List[str]], Field(
+                description=f"Fields to return, from: {', '.join(GUEST_FIELDS)}", default=None
+            )] = None,
+            limit: Annotated[int, Field(
+                description="Maximum number of containers per page",
+                default=DEFAULT_GUEST_PAGE_SIZE, ge=1, le=MAX_GUEST_PAGE_SIZE,
+            )] = DEFAULT_GUEST_PAGE_SIZE,
+            cursor: Annotated[Optional[str], Field(
+                description="Cursor returned by the previous page", default=None
+            )] = None
+        ):
+            return await self.container_tools.get_containers(
+                include_config, output_format, node=node, status=status, name=name, tag=tag,
+                vmid_min=vmid_min, vmid_max=vmid_max, fields=fields, limit=limit, cursor=cursor
+            )
+
+        @self.mcp.tool(description=GET_CONTAINER_STATUS_DESC)
+        async def get_container_status(
+            node: Annotated[str, Field(description="Host node name (e.g. 'pve1')")],
+            vmid: Annotated[str, Field(description="Container ID (e.g. '200')")],
+            output_format: OutputFormat = None
+        ):
+            return await self.container_tools.get_container_status(node, vmid, output_format)
+
+        @self.mcp.tool(description=CONTAINER_POWER_DESC)
+        async def container_power(
+            action: Annotated[Literal["start", "stop", "shutdown", "reboot"], Field(
+                description="Power action to run"
+            )],
+            containers: Annotated[Optional[List[str]], Field(
+                description="Container IDs, optionally with node prefix (e.g. ['200', 'pve1:201'])",
+                default=None,
+            )] = None,
+            tag: Annotated[Optional[str], Field(
+                description="Select all containers carrying this tag (e.g. 'lab')", default=None
+            )] = None,
+            name: Annotated[Optional[str], Field(
+                description="Select all containers whose name matches this glob (e.g. 'web-*')",
+                default=None,
+            )] = None,
+            max_concurrency: Annotated[int, Field(
+                description="Maximum concurrent API requests", default=10, ge=1, le=100
+            )] = 10,
+            wait: Annotated[bool, Field(
+                description="Wait for the power tasks to finish", default=False
+            )] = False,
+            timeout: Annotated[float, Field(
+                description="Seconds to wait for tasks when wait is set", default=300, gt=0, le=3600
+            )] = 300
+        ):
+            return await self.container_tools.container_power(action, containers, tag, name,
+                                                              max_concurrency, wait, timeout)
 
         # Storage tools
         @self.mcp.tool(description=GET_STORAGE_DESC)
-        def get_storage():
-            return self.storage_tools.get_storage()
+        async def get_storage(output_format: OutputFormat = None):
+            return await self.storage_tools.get_storage(output_format)
+
+        @self.mcp.tool(description=FIND_STORAGE_CONTENT_DESC)
+        async def find_storage_content(
+            content: Annotated[Optional[Literal["iso", "vztmpl", "backup"]], Field(
+                description="Only this content type", default=None
+            )] = None,
+            name: Annotated[Optional[str], Field(
+                description="Only file names matching this glob, case-insensitive (e.g. "
+                            "'*ubuntu*')",
+                default=None,
+            )] = None,
+            vmid: Annotated[Optional[int], Field(
+                description="Only backups of this VM/container", default=None
+            )] = None,
+            storage: Annotated[Optional[str], Field(
+                description="Only volumes on this storage", default=None
+            )] = None,
+            node: Annotated[Optional[str], Field(
+                description="Only volumes reachable from this node", default=None
+            )] = None,
+            min_size_mb: Annotated[Optional[float], Field(
+                description="Smallest size in MB", default=None, ge=0
+            )] = None,
+            max_size_mb: Annotated[Optional[float], Field(
+                description="Largest size in MB", default=None, ge=0
+            )] = None,
+            newer_than_days: Annotated[Optional[float], Field(
+                description="Only volumes created within this many days", default=None, gt=0
+            )] = None,
+            older_than_days: Annotated[Optional[float], Field(
+                description="Only volumes created more than this many days ago", default=None, gt=0
+            )] = None,
+            sort_by: Annotated[Literal["ctime", "size", "name"], Field(
+                description="'ctime' (newest first), 'size' (largest first) or 'name'",
+                default="ctime",
+            )] = "ctime",
+            limit: Annotated[int, Field(
+                description="Maximum number of volumes returned", default=50, ge=1, le=1000
+            )] = 50,
+            refresh: Annotated[bool, Field(
+                description="Re-scan storage even if the index is fresh", default=False
+            )] = False,
+            output_format: OutputFormat = None
+        ):
+            return await self.storage_tools.find_storage_content(
+                content, name, vmid, storage, node, min_size_mb, max_size_mb, newer_than_days,
+                older_than_days, sort_by, limit, refresh, output_format
+            )
 
         # Cluster tools
         @self.mcp.tool(description=GET_CLUSTER_STATUS_DESC)
-        def get_cluster_status():
-            return self.cluster_tools.get_cluster_status()
+        async def get_cluster_status(output_format: OutputFormat = None):
+            return await self.cluster_tools.get_cluster_status(output_format)
+
+        # Task tools
+        @self.mcp.tool(description=WAIT_TASK_DESC)
+        async def wait_task(
+            upids: Annotated[List[str], Field(
+                description="Task IDs returned by mutating tools (e.g. ['UPID:pve1:...'])",
+                min_length=1,
+            )],
+            timeout: Annotated[float, Field(
+                description="Seconds to wait before returning", default=300, gt=0, le=3600
+            )] = 300
+        ):
+            return await self.task_tools.wait_task(upids, timeout)
+
+        @self.mcp.tool(description=LIST_TASKS_DESC)
+        async def list_tasks(
+            running_only: Annotated[bool, Field(
+                description="Only show tasks that haven't finished", default=False
+            )] = False
+        ):
+            return await self.task_tools.list_tasks(running_only)
+
+        # Metrics tools
+        @self.mcp.tool(description=GET_METRICS_TREND_DESC)
+        async def get_metrics_trend(
+            target: Annotated[str, Field(
+                description="Node name, VM/container ID or resource ID (e.g. 'pve1', '100', "
+                            "'lxc/200')",
+            )],
+            window: Annotated[float, Field(
+                description="Window length in minutes", default=15, gt=0
+            )] = 15,
+            metrics: Annotated[Optional[List[str]], Field(
+                description=f"Metrics to summarize, from: {', '.join(METRIC_FIELDS)}", default=None
+            )] = None,
+            output_format: OutputFormat = None
+        ):
+            return await self.metrics_tools.get_metrics_trend(target, window, metrics,
+                                                              output_format)
+
+        @self.mcp.tool(description=GET_RRD_STATS_DESC)
+        async def get_rrd_stats(
+            metric: Annotated[
+                Literal["cpu", "mem", "netin", "netout", "diskread", "diskwrite", "loadavg",
+                        "iowait"],
+                Field(description="Metric to aggregate", default="cpu"),
+            ] = "cpu",
+            scope: Annotated[Literal["vms", "containers", "guests", "nodes"], Field(
+                description="Resources to aggregate over", default="vms"
+            )] = "vms",
+            timeframe: Annotated[Literal["hour", "day", "week", "month", "year"], Field(
+                description="RRD timeframe", default="hour"
+            )] = "hour",
+            cf: Annotated[Literal["AVERAGE", "MAX"], Field(
+                description="RRD consolidation function", default="AVERAGE"
+            )] = "AVERAGE",
+            node: Annotated[Optional[str], Field(
+                description="Only resources on this node", default=None
+            )] = None,
+            tag: Annotated[Optional[str], Field(
+                description="Only guests carrying this tag", default=None
+            )] = None,
+            name: Annotated[Optional[str], Field(
+                description="Only guests whose name matches this glob (e.g. 'web-*')", default=None
+            )] = None,
+            ids: Annotated[Optional[List[str]], Field(
+                description="Only these VM/container IDs, or node names for scope 'nodes'",
+                default=None,
+            )] = None,
+            percentiles: Annotated[Optional[List[float]], Field(
+                description="Percentiles to compute (default: [50, 95])", default=None
+            )] = None,
+            sort_by: Annotated[Optional[str], Field(
+                description="Ranking column: 'avg', 'max' or 'p<N>' (default: highest percentile)",
+                default=None,
+            )] = None,
+            top: Annotated[int, Field(
+                description="Number of rows returned", default=20, ge=1, le=1000
+            )] = 20,
+            max_concurrency: Annotated[int, Field(
+                description="Maximum concurrent API requests", default=10, ge=1, le=100
+            )] = 10,
+            output_format: OutputFormat = None
+        ):
+            return await self.metrics_tools.get_rrd_stats(
+                metric, scope, timeframe, cf, node, tag, name, ids, percentiles, sort_by, top,
+                max_concurrency, output_format
+            )
+
+        @self.mcp.tool(description=GET_TOP_GUESTS_DESC)
+        async def get_top_guests(
+            metric: Annotated[
+                Literal["cpu", "mem", "diskread", "diskwrite", "netin", "netout"],
+                Field(description="Metric to rank by", default="cpu"),
+            ] = "cpu",
+            scope: Annotated[Literal["vms", "containers", "guests"], Field(
+                description="Guests to rank", default="guests"
+            )] = "guests",
+            node: Annotated[Optional[str], Field(
+                description="Only guests on this node", default=None
+            )] = None,
+            tag: Annotated[Optional[str], Field(
+                description="Only guests carrying this tag", default=None
+            )] = None,
+            name: Annotated[Optional[str], Field(
+                description="Only guests whose name matches this glob (e.g. 'web-*')", default=None
+            )] = None,
+            top: Annotated[int, Field(
+                description="Number of rows returned", default=10, ge=1, le=1000
+            )] = 10,
+            interval: Annotated[Optional[float], Field(
+                description="Seconds between two live samples for I/O rates",
+                default=None, gt=0, le=60,
+            )] = None,
+            window: Annotated[Optional[float], Field(
+                description="Minutes of collected history to average over", default=None, gt=0
+            )] = None,
+            output_format: OutputFormat = None
+        ):
+            return await self.metrics_tools.get_top_guests(
+                metric, scope, node, tag, name, top, interval, window, output_format
+            )
 
     def start(self) -> None:
         """Start the MCP server.
         
         Initializes the server with:
         - Signal handlers for graceful shutdown (SIGINT, SIGTERM)
+        - Proxmox API connection in a background thread
+        - Background metrics collection, if enabled
         - Async runtime for handling concurrent requests
         - Error handling and logging
         
@@ -193,19 +830,29 @@ class ProxmoxMCPServer:
 
         try:
             self.logger.info("Starting MCP server...")
+            self._connect_in_background()
+            if self.metrics is not None:
+                self.metrics.start()
             anyio.run(self.mcp.run_stdio_async)
         except Exception as e:
             self.logger.error(f"Server error: {e}")
             sys.exit(1)
 
-if __name__ == "__main__":
+def main() -> None:
+    """Run the server with the configuration named by PROXMOX_MCP_CONFIG."""
     config_path = os.getenv("PROXMOX_MCP_CONFIG")
     if not config_path:
         print("PROXMOX_MCP_CONFIG environment variable must be set")
         sys.exit(1)
     
     try:
-        server = ProxmoxMCPServer(config_path)
+        # Interpreter startup and module imports happened before main(); without
+        # /proc, only their CPU time is known, which isn't comparable to wall time
+        import_time = process_uptime()
+        server = ProxmoxMCPServer(
+            config_path, import_time=import_time,
+            import_cpu_time=time.process_time() if import_time is None else None
+        )
         server.start()
     except KeyboardInterrupt:
         print("\nShutting down gracefully...")
@@ -213,3 +860,6 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -3,18 +3,67 @@ Base classes and utilities for Proxmox MCP tools.
 
 This module provides the foundation for all Proxmox MCP tools, including:
 - Base tool class with common functionality
-- Response formatting utilities
+- Response formatting utilities (text templates or compact JSON)
+- Concurrent per-node/per-resource request fan-out
+- Offloading of blocking API calls from the event loop
 - Error handling mechanisms
 - Logging setup
 
 All tool implementations inherit from the ProxmoxTool base class to ensure
 consistent behavior and error handling across the MCP server.
 """
+import asyncio
+import functools
+import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    NoReturn,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 from mcp.types import TextContent as Content
-from proxmoxer import ProxmoxAPI
-from ..formatting import ProxmoxTemplates
+
+if TYPE_CHECKING:
+    from proxmoxer import ProxmoxAPI
+    from ..core.metrics import MetricsCollector
+
+T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
+
+# Output formats supported by _format_response
+OUTPUT_FORMATS = ("text", "json")
+
+def run_in_thread(func: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    """Turn a blocking tool method into an awaitable one.
+
+    proxmoxer performs synchronous HTTP requests. Running a tool method in
+    a worker thread keeps the MCP event loop free, so concurrent tool
+    invocations overlap instead of queueing behind one slow API call. All
+    threads share the API session's connection pool.
+
+    Args:
+        func: Blocking tool method
+
+    Returns:
+        Coroutine function running func in the default thread pool
+    """
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    return wrapper
 
 class ProxmoxTool:
     """Base class for Proxmox MCP tools.
@@ -26,10 +75,21 @@ class ProxmoxTool:
     - Error handling
     
     All tool classes should inherit from this base class to ensure consistent
-    behavior and error handling across the MCP server.
+    behavior and error handling across the MCP server. Public tool methods
+    are awaitable; blocking implementations are wrapped with run_in_thread.
     """
 
-    def __init__(self, proxmox_api: ProxmoxAPI):
+    # Upper bound on concurrent API requests issued by a single fan-out
+    max_workers: int = 8
+    # Seconds a single fanned-out request may run before it counts as failed; the
+    # server sets it to the connection's request budget, so retries finish first
+    call_timeout: float = 10.0
+    # Default output format when a call doesn't specify one: 'text' or 'json'
+    output_format: str = "text"
+    # Background metrics collector whose fresh snapshot can replace API reads
+    metrics: Optional["MetricsCollector"] = None
+
+    def __init__(self, proxmox_api: "ProxmoxAPI"):
         """Initialize the tool.
 
         Args:
@@ -38,7 +98,88 @@ class ProxmoxTool:
         self.proxmox = proxmox_api
         self.logger = logging.getLogger(f"proxmox-mcp.{self.__class__.__name__.lower()}")
 
-    def _format_response(self, data: Any, resource_type: Optional[str] = None) -> List[Content]:
+    def _fan_out(
+        self,
+        calls: Mapping[K, Callable[[], Any]],
+        timeout: Optional[float] = None,
+        max_workers: Optional[int] = None,
+    ) -> Tuple[Dict[K, Any], Dict[K, Exception]]:
+        """Run independent API requests concurrently on a bounded thread pool.
+
+        Used by tools that need one request per node or per resource. The
+        wall-clock time becomes roughly that of the slowest request instead
+        of the sum of all round trips. Each request gets its own timeout,
+        measured from when it starts running, so a queued request is never
+        charged for time spent waiting for a free worker.
+
+        Failures are captured per key rather than raised, allowing callers
+        to fall back to basic information for the affected entries. A
+        request that exceeds its timeout is reported as a TimeoutError; its
+        worker thread is abandoned and finishes in the background. Requests
+        still queued once every batch could have timed out are failed too,
+        so the fan-out as a whole is always bounded.
+
+        Args:
+            calls: Mapping of result key to zero-argument callable
+            timeout: Per-request timeout in seconds (default: call_timeout)
+            max_workers: Concurrency limit for this fan-out (default: max_workers)
+
+        Returns:
+            Tuple of (results, errors) dictionaries keyed like calls
+        """
+        results: Dict[K, Any] = {}
+        errors: Dict[K, Exception] = {}
+        if not calls:
+            return results, errors
+
+        timeout = self.call_timeout if timeout is None else timeout
+        workers = min(max_workers or self.max_workers, len(calls))
+        batches = -(-len(calls) // workers)
+        overall_deadline = time.monotonic() + timeout * batches
+        started: Dict[K, float] = {}
+
+        def run(key: K, func: Callable[[], Any]) -> Any:
+            started[key] = time.monotonic()
+            return func()
+
+        executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="proxmox-fan-out",
+        )
+        futures = {executor.submit(run, key, func): key for key, func in calls.items()}
+        pending = set(futures)
+        try:
+            while pending:
+                # Wake up at the earliest deadline among running requests
+                now = time.monotonic()
+                deadlines = [
+                    started[futures[f]] + timeout for f in pending if futures[f] in started
+                ]
+                wait_for = max(0.0, min(deadlines + [overall_deadline]) - now)
+                done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    key = futures[future]
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        errors[key] = e
+
+                now = time.monotonic()
+                for future in list(pending):
+                    key = futures[future]
+                    start = started.get(key)
+                    if now >= overall_deadline or (start is not None and now - start >= timeout):
+                        pending.discard(future)
+                        errors[key] = TimeoutError(f"Request timed out after {timeout:.1f}s")
+                        self.logger.warning(f"Request for {key} timed out after {timeout:.1f}s")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results, errors
+
+    def _format_response(self, data: Any, resource_type: Optional[str] = None,
+                         output_format: Optional[str] = None) -> List[Content]:
         """Format response data into MCP content using templates.
 
         This method handles formatting of various Proxmox resource types into
@@ -46,14 +187,35 @@ class ProxmoxTool:
         different resource types (nodes, VMs, storage, etc.) and falls back
         to JSON formatting for unknown types.
 
+        In 'json' output format, templates are skipped entirely and the
+        collected data is returned as compact JSON, which is several times
+        smaller than the rendered text and needs no parsing by the caller.
+
         Args:
             data: Raw data from Proxmox API to format
             resource_type: Type of resource for template selection. Valid types:
-                         'nodes', 'node_status', 'vms', 'storage', 'containers', 'cluster'
+                         'nodes', 'node_status', 'vms', 'storage', 'containers',
+                         'container_status', 'cluster'
+            output_format: 'text' or 'json' (default: the tool's output_format)
 
         Returns:
             List of Content objects formatted according to resource type
+
+        Raises:
+            ValueError: If the output format is unknown
         """
+        output_format = output_format or self.output_format
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Invalid output format '{output_format}', "
+                             f"expected one of: {', '.join(OUTPUT_FORMATS)}")
+        if output_format == "json":
+            if resource_type == "node_status" and isinstance(data, tuple) and len(data) == 2:
+                data = {"node": data[0], **data[1]}
+            return [Content(type="text", text=json.dumps(data, separators=(",", ":"), default=str))]
+
+        # Imported on first use to keep server startup light
+        from ..formatting import ProxmoxTemplates
+
         if resource_type == "nodes":
             formatted = ProxmoxTemplates.node_list(data)
         elif resource_type == "node_status":
@@ -68,16 +230,17 @@ class ProxmoxTool:
             formatted = ProxmoxTemplates.storage_list(data)
         elif resource_type == "containers":
             formatted = ProxmoxTemplates.container_list(data)
+        elif resource_type == "container_status":
+            formatted = ProxmoxTemplates.container_status(data)
         elif resource_type == "cluster":
             formatted = ProxmoxTemplates.cluster_status(data)
         else:
             # Fallback to JSON formatting for unknown types
-            import json
             formatted = json.dumps(data, indent=2)
 
         return [Content(type="text", text=formatted)]
 
-    def _handle_error(self, operation: str, error: Exception) -> None:
+    def _handle_error(self, operation: str, error: Exception) -> NoReturn:
         """Handle and log errors from Proxmox operations.
 
         Provides standardized error handling across all tools by:
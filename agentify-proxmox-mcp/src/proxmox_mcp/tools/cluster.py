@@ -10,9 +10,9 @@ This module provides tools for monitoring and managing Proxmox clusters:
 The tools provide essential information for maintaining
 cluster health and ensuring proper operation.
 """
-from typing import List
+from typing import List, Optional
 from mcp.types import TextContent as Content
-from .base import ProxmoxTool
+from .base import ProxmoxTool, run_in_thread
 from .definitions import GET_CLUSTER_STATUS_DESC
 
 class ClusterTools(ProxmoxTool):
@@ -28,7 +28,8 @@ class ClusterTools(ProxmoxTool):
     proper operation of the Proxmox environment.
     """
 
-    def get_cluster_status(self) -> List[Content]:
+    @run_in_thread
+    def get_cluster_status(self, output_format: Optional[str] = None) -> List[Content]:
         """Get overall Proxmox cluster health and configuration status.
 
         Retrieves comprehensive cluster information including:
@@ -43,6 +44,9 @@ class ClusterTools(ProxmoxTool):
         - Verifying resource availability
         - Detecting potential issues
 
+        Args:
+            output_format: 'text' (formatted) or 'json' (compact); defaults to the configured format
+
         Returns:
             List of Content objects containing formatted cluster status:
             {
@@ -73,6 +77,6 @@ class ClusterTools(ProxmoxTool):
                 "nodes": len([node for node in result if node.get("type") == "node"]) if result else 0,
                 "resources": [res for res in result if res.get("type") == "resource"] if result else []
             }
-            return self._format_response(status, "cluster")
+            return self._format_response(status, "cluster", output_format)
         except Exception as e:
             self._handle_error("get cluster status", e)
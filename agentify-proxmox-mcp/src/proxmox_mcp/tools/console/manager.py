@@ -9,23 +9,33 @@ This module provides functionality for interacting with VM consoles:
 
 The module implements a robust command execution system with:
 - VM state verification
-- Asynchronous command execution
+- Asynchronous command execution (API calls run in worker threads)
+- Adaptive completion polling with a configurable deadline
+- Concurrent batch execution across many VMs with multiplexed polling
+- Streaming of output for long-running commands, as far as the guest
+  agent reports it before exit
 - Detailed status tracking
 - Comprehensive error handling
 """
 
+import asyncio
 import logging
-from typing import Dict, Any
+import time
+from typing import TYPE_CHECKING, Dict, Any, AsyncIterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from proxmoxer import ProxmoxAPI
+
 
 class VMConsoleManager:
     """Manager class for VM console operations.
-    
+
     Provides functionality for:
     - Executing commands in VM consoles
     - Managing command execution lifecycle
     - Handling command output and errors
     - Monitoring execution status
-    
+
     Uses QEMU guest agent for reliable command execution with:
     - VM state verification before execution
     - Asynchronous command processing
@@ -33,16 +43,24 @@ class VMConsoleManager:
     - Comprehensive error handling
     """
 
-    def __init__(self, proxmox_api):
+    # First delay between exec-status polls, doubled after every poll
+    poll_initial: float = 0.005
+    # Upper bound for the delay between exec-status polls
+    poll_max: float = 1.0
+
+    def __init__(self, proxmox_api: "ProxmoxAPI", timeout: float = 30.0):
         """Initialize the VM console manager.
 
         Args:
             proxmox_api: Initialized ProxmoxAPI instance
+            timeout: Default number of seconds to wait for a command to exit
         """
         self.proxmox = proxmox_api
+        self.timeout = timeout
         self.logger = logging.getLogger("proxmox-mcp.vm-console")
 
-    async def execute_command(self, node: str, vmid: str, command: str) -> Dict[str, Any]:
+    async def execute_command(self, node: str, vmid: str, command: str,
+                              timeout: Optional[float] = None) -> Dict[str, Any]:
         """Execute a command in a VM's console via QEMU guest agent.
 
         Implements a two-phase command execution process:
@@ -50,12 +68,13 @@ class VMConsoleManager:
            - Verifies VM exists and is running
            - Initiates command execution via guest agent
            - Captures command PID for tracking
-        
+
         2. Result Collection:
-           - Monitors command execution status
-           - Captures command output and errors
-           - Handles completion status
-        
+           - Polls command status with exponential backoff, starting at a
+             few milliseconds, until the command exits or the deadline passes
+           - Accumulates command output and errors across polls
+           - Reports the real exit code and elapsed time
+
         Requirements:
         - VM must be running
         - QEMU guest agent must be installed and active
@@ -65,6 +84,7 @@ class VMConsoleManager:
             node: Name of the node where VM is running (e.g., 'pve1')
             vmid: ID of the VM to execute command in (e.g., '100')
             command: Shell command to execute in the VM
+            timeout: Seconds to wait for the command to exit (default: manager timeout)
 
         Returns:
             Dictionary containing command execution results:
@@ -72,7 +92,9 @@ class VMConsoleManager:
                 "success": true/false,
                 "output": "command output",
                 "error": "error output if any",
-                "exit_code": command_exit_code
+                "exit_code": command_exit_code (None if still running),
+                "exited": true/false,
+                "elapsed": seconds
             }
 
         Raises:
@@ -86,95 +108,328 @@ class VMConsoleManager:
                        - API communication errors occur
         """
         try:
-            # Verify VM exists and is running
-            vm_status = self.proxmox.nodes(node).qemu(vmid).status.current.get()
+            started = time.monotonic()
+            endpoint, pid = await self._start_command(node, vmid, command)
+            result = await self._wait_for_exit(endpoint, pid, timeout, started)
+
+            self.logger.debug(f"Processed output: {result['output']}")
+            self.logger.debug(f"Processed error: {result['error']}")
+            self.logger.debug(f"Processed exit code: {result['exit_code']}")
+            self.logger.debug(f"Executed command '{command}' on VM {vmid} (node: {node})")
+
+            return result
+
+        except ValueError:
+            # Re-raise ValueError for VM not running
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to execute command on VM {vmid}: {str(e)}")
+            if "not found" in str(e).lower():
+                raise ValueError(f"VM {vmid} not found on node {node}") from e
+            raise RuntimeError(f"Failed to execute command: {str(e)}") from e
+
+    async def _start_command(self, node: str, vmid: str, command: str,
+                             verify: bool = True) -> Tuple[Any, int]:
+        """Verify the VM is running and start a command via the guest agent.
+
+        Args:
+            node: Name of the node where VM is running
+            vmid: ID of the VM to execute command in
+            command: Shell command to execute in the VM
+            verify: Check the VM is running before starting the command
+
+        Returns:
+            Tuple of (guest agent endpoint, command PID)
+
+        Raises:
+            ValueError: If the VM is not running
+            RuntimeError: If the command could not be started
+        """
+        # Verify VM exists and is running
+        if verify:
+            status_api = self.proxmox.nodes(node).qemu(vmid).status.current
+            vm_status = await asyncio.to_thread(status_api.get)
             if vm_status["status"] != "running":
                 self.logger.error(f"Failed to execute command on VM {vmid}: VM is not running")
                 raise ValueError(f"VM {vmid} on node {node} is not running")
 
-            # Get VM's console
-            self.logger.info(f"Executing command on VM {vmid} (node: {node}): {command}")
-            
-            # Get the API endpoint
-            # Use the guest agent exec endpoint
-            endpoint = self.proxmox.nodes(node).qemu(vmid).agent
-            self.logger.debug(f"Using API endpoint: {endpoint}")
-            
-            # Execute the command using two-step process
-            try:
-                # Start command execution
-                self.logger.info("Starting command execution...")
-                try:
-                    self.logger.debug(f"Executing command via agent: {command}")
-                    exec_result = endpoint("exec").post(command=command)
-                    self.logger.debug(f"Raw exec response: {exec_result}")
-                    self.logger.info(f"Command started with result: {exec_result}")
-                except Exception as e:
-                    self.logger.error(f"Failed to start command: {str(e)}")
-                    raise RuntimeError(f"Failed to start command: {str(e)}")
-
-                if 'pid' not in exec_result:
-                    raise RuntimeError("No PID returned from command execution")
-
-                pid = exec_result['pid']
-                self.logger.info(f"Waiting for command completion (PID: {pid})...")
-
-                # Add a small delay to allow command to complete
-                import asyncio
-                await asyncio.sleep(1)
-
-                # Get command output using exec-status
-                try:
-                    self.logger.debug(f"Getting status for PID {pid}...")
-                    console = endpoint("exec-status").get(pid=pid)
-                    self.logger.debug(f"Raw exec-status response: {console}")
-                    if not console:
-                        raise RuntimeError("No response from exec-status")
-                except Exception as e:
-                    self.logger.error(f"Failed to get command status: {str(e)}")
-                    raise RuntimeError(f"Failed to get command status: {str(e)}")
-                self.logger.info(f"Command completed with status: {console}")
-            except Exception as e:
-                self.logger.error(f"API call failed: {str(e)}")
-                raise RuntimeError(f"API call failed: {str(e)}")
-            self.logger.debug(f"Raw API response type: {type(console)}")
-            self.logger.debug(f"Raw API response: {console}")
-            
-            # Handle different response structures
-            if isinstance(console, dict):
-                # Handle exec-status response format
-                output = console.get("out-data", "")
-                error = console.get("err-data", "")
-                exit_code = console.get("exitcode", 0)
-                exited = console.get("exited", 0)
-                
-                if not exited:
-                    self.logger.warning("Command may not have completed")
+        self.logger.info(f"Executing command on VM {vmid} (node: {node}): {command}")
+
+        # Use the guest agent exec endpoint
+        endpoint = self.proxmox.nodes(node).qemu(vmid).agent
+        self.logger.debug(f"Using API endpoint: {endpoint}")
+
+        try:
+            self.logger.debug(f"Executing command via agent: {command}")
+            exec_result = await asyncio.to_thread(endpoint("exec").post, command=command)
+            self.logger.debug(f"Raw exec response: {exec_result}")
+        except Exception as e:
+            self.logger.error(f"Failed to start command: {str(e)}")
+            raise RuntimeError(f"Failed to start command: {str(e)}") from e
+
+        if not isinstance(exec_result, dict) or 'pid' not in exec_result:
+            raise RuntimeError("No PID returned from command execution")
+
+        self.logger.info(f"Command started with PID {exec_result['pid']}")
+        return endpoint, exec_result['pid']
+
+    async def _get_status(self, endpoint: Any, pid: int) -> Any:
+        """Read the guest agent exec-status for a command PID.
+
+        Raises:
+            RuntimeError: If the status could not be read
+        """
+        try:
+            self.logger.debug(f"Getting status for PID {pid}...")
+            status = await asyncio.to_thread(endpoint("exec-status").get, pid=pid)
+            self.logger.debug(f"Raw exec-status response: {status}")
+        except Exception as e:
+            self.logger.error(f"Failed to get command status: {str(e)}")
+            raise RuntimeError(f"Failed to get command status: {str(e)}") from e
+        if not status:
+            raise RuntimeError("No response from exec-status")
+        return status
+
+    async def _wait_for_exit(self, endpoint: Any, pid: int, timeout: Optional[float],
+                             started: float) -> Dict[str, Any]:
+        """Poll exec-status with exponential backoff until the command exits.
+
+        Output reported across polls is appended (see _record_status). If
+        the deadline passes first, the partial result is returned with
+        exited set to False.
+
+        Args:
+            endpoint: Guest agent endpoint of the VM
+            pid: Command PID returned by exec
+            timeout: Seconds to wait (default: manager timeout)
+            started: time.monotonic() value when execution started
+
+        Returns:
+            Command result dictionary (see execute_command)
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = started + timeout
+        delay = self.poll_initial
+        state = self._new_state()
+
+        while True:
+            await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            status = await self._get_status(endpoint, pid)
+            if self._record_status(state, status):
+                break
+            if time.monotonic() >= deadline:
+                self.logger.warning(f"Command (PID: {pid}) still running after {timeout:.1f}s")
+                break
+            delay = min(delay * 2, self.poll_max)
+
+        result = self._build_result(state, started)
+        self.logger.info(f"Command (PID: {pid}) finished polling after {result['elapsed']:.3f}s, "
+                         f"exit code: {result['exit_code']}")
+        return result
+
+    @staticmethod
+    def _new_state() -> Dict[str, Any]:
+        """Create the accumulated state of a running command."""
+        return {"output": [], "error": [], "exited": False, "exit_code": None}
+
+    def _record_status(self, state: Dict[str, Any], status: Any) -> bool:
+        """Accumulate an exec-status response into a command state.
+
+        Output data is taken as reported and appended, never compared with
+        earlier polls. The stock QEMU guest agent reports a command's whole
+        output exactly once, in the status that has exited set; agents that
+        report output earlier are expected to report each piece only once.
+
+        Returns:
+            True if the command has exited
+        """
+        if not isinstance(status, dict):
+            # Some versions might return data differently
+            self.logger.debug(f"Unexpected response type: {type(status)}")
+            state["output"].append(str(status))
+            state["exited"], state["exit_code"] = True, 0
+            return True
+
+        state["output"].append(status.get("out-data", ""))
+        state["error"].append(status.get("err-data", ""))
+        if status.get("exited", 0):
+            state["exited"], state["exit_code"] = True, status.get("exitcode")
+        return bool(state["exited"])
+
+    @staticmethod
+    def _build_result(state: Dict[str, Any], started: float) -> Dict[str, Any]:
+        """Build the command result dictionary from accumulated state."""
+        return {
+            "success": True,
+            "output": "".join(state["output"]),
+            "error": "".join(state["error"]),
+            "exit_code": state["exit_code"],
+            "exited": state["exited"],
+            "elapsed": time.monotonic() - started
+        }
+
+    async def execute_command_batch(self, targets: List[Tuple[str, str]], command: str,
+                                    max_concurrency: int = 10, timeout: Optional[float] = None,
+                                    verify: bool = True) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Execute the same command in many VMs concurrently.
+
+        Commands are dispatched to all VMs with at most max_concurrency
+        API requests in flight. The exec-status of every running command is
+        then polled in a single multiplexed loop with exponential backoff,
+        instead of one polling loop per VM. Failures are captured per VM.
+
+        Args:
+            targets: List of (node, vmid) pairs
+            command: Shell command to execute in every VM
+            max_concurrency: Maximum number of concurrent API requests
+            timeout: Seconds to wait for commands to exit (default: manager timeout)
+            verify: Check each VM is running first; callers that already know
+                    the VM status from /cluster/resources can skip this
+
+        Returns:
+            Dictionary keyed by (node, vmid) with a command result dictionary
+            (see execute_command) or {"success": false, "error": message}
+        """
+        targets = list(dict.fromkeys(targets))
+        timeout = self.timeout if timeout is None else timeout
+        semaphore = asyncio.Semaphore(max_concurrency)
+        started = time.monotonic()
+        deadline = started + timeout
+        results: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+        async def start(target: Tuple[str, str]) -> Tuple[Any, int]:
+            async with semaphore:
+                node, vmid = target
+                return await self._start_command(node, vmid, command, verify)
+
+        self.logger.info(f"Executing command on {len(targets)} VMs: {command}")
+        started_commands = await asyncio.gather(*(start(t) for t in targets),
+                                                return_exceptions=True)
+
+        running: Dict[Tuple[str, str], Tuple[Any, int, Dict[str, Any]]] = {}
+        for target, start_outcome in zip(targets, started_commands):
+            if isinstance(start_outcome, BaseException):
+                results[target] = {"success": False, "error": str(start_outcome)}
             else:
-                # Some versions might return data differently
-                self.logger.debug(f"Unexpected response type: {type(console)}")
-                output = str(console)
-                error = ""
-                exit_code = 0
-            
-            self.logger.debug(f"Processed output: {output}")
-            self.logger.debug(f"Processed error: {error}")
-            self.logger.debug(f"Processed exit code: {exit_code}")
-            
-            self.logger.debug(f"Executed command '{command}' on VM {vmid} (node: {node})")
+                endpoint, pid = start_outcome
+                running[target] = (endpoint, pid, self._new_state())
 
-            return {
-                "success": True,
-                "output": output,
-                "error": error,
-                "exit_code": exit_code
-            }
+        async def poll(target: Tuple[str, str]) -> bool:
+            async with semaphore:
+                endpoint, pid, state = running[target]
+                return self._record_status(state, await self._get_status(endpoint, pid))
 
+        delay = self.poll_initial
+        while running:
+            await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            pending = list(running)
+            outcomes = await asyncio.gather(*(poll(t) for t in pending), return_exceptions=True)
+            for target, outcome in zip(pending, outcomes):
+                if isinstance(outcome, BaseException):
+                    results[target] = {"success": False, "error": str(outcome)}
+                    del running[target]
+                elif outcome:
+                    results[target] = self._build_result(running.pop(target)[2], started)
+            if running and time.monotonic() >= deadline:
+                self.logger.warning(f"{len(running)} commands still running after {timeout:.1f}s")
+                for target, (_, _, state) in running.items():
+                    results[target] = self._build_result(state, started)
+                break
+            delay = min(delay * 2, self.poll_max)
+
+        return {target: results[target] for target in targets}
+
+    async def stream_command(self, node: str, vmid: str, command: str,
+                             timeout: Optional[float] = None,
+                             max_bytes: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Execute a command and yield its output incrementally.
+
+        Polls exec-status like execute_command, but yields every piece of
+        stdout/stderr as soon as a poll reports it:
+            {"type": "output", "stream": "out"/"err", "data": "chunk"}
+        and finally the command result (see execute_command):
+            {"type": "result", "success": true, ..., "truncated": true/false}
+
+        Only the last max_bytes of each stream are kept for the final
+        result, so huge outputs are never buffered whole in memory.
+
+        The stock QEMU guest agent only reports output once the command has
+        exited, so with it all output arrives in one piece at the end. Output
+        is streamed while the command runs only with an agent that reports
+        partial output in exec-status.
+
+        Args:
+            node: Name of the node where VM is running (e.g., 'pve1')
+            vmid: ID of the VM to execute command in (e.g., '100')
+            command: Shell command to execute in the VM
+            timeout: Seconds to wait for the command to exit (default: manager timeout)
+            max_bytes: Maximum bytes of each stream kept for the result (None = unlimited)
+
+        Raises:
+            ValueError: If the VM is not found or not running
+            RuntimeError: If the command could not be started or polled
+        """
+        try:
+            started = time.monotonic()
+            endpoint, pid = await self._start_command(node, vmid, command)
         except ValueError:
-            # Re-raise ValueError for VM not running
             raise
         except Exception as e:
-            self.logger.error(f"Failed to execute command on VM {vmid}: {str(e)}")
             if "not found" in str(e).lower():
-                raise ValueError(f"VM {vmid} not found on node {node}")
-            raise RuntimeError(f"Failed to execute command: {str(e)}")
+                raise ValueError(f"VM {vmid} not found on node {node}") from e
+            raise RuntimeError(f"Failed to execute command: {str(e)}") from e
+
+        timeout = self.timeout if timeout is None else timeout
+        deadline = started + timeout
+        delay = self.poll_initial
+        buffers = {"out": "", "err": ""}
+        truncated = False
+        exited, exit_code = False, None
+
+        while True:
+            await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            status = await self._get_status(endpoint, pid)
+            if not isinstance(status, dict):
+                status = {"out-data": str(status), "exited": 1, "exitcode": 0}
+
+            got_output = False
+            for stream in ("out", "err"):
+                chunk = status.get(f"{stream}-data", "")
+                if not chunk:
+                    continue
+                got_output = True
+                buffers[stream] += chunk
+                if max_bytes is not None and len(buffers[stream].encode()) > max_bytes:
+                    buffers[stream] = self._tail(buffers[stream], max_bytes)
+                    truncated = True
+                yield {"type": "output", "stream": stream, "data": chunk}
+            if status.get("out-truncated") or status.get("err-truncated"):
+                truncated = True
+
+            if status.get("exited", 0):
+                exited, exit_code = True, status.get("exitcode")
+                break
+            if time.monotonic() >= deadline:
+                self.logger.warning(f"Command (PID: {pid}) still running after {timeout:.1f}s")
+                break
+            # Keep polling quickly while output is flowing
+            delay = self.poll_initial if got_output else min(delay * 2, self.poll_max)
+
+        yield {
+            "type": "result",
+            "success": True,
+            "output": buffers["out"],
+            "error": buffers["err"],
+            "exit_code": exit_code,
+            "exited": exited,
+            "elapsed": time.monotonic() - started,
+            "truncated": truncated
+        }
+
+    @staticmethod
+    def _tail(text: str, max_bytes: int) -> str:
+        """Keep the last max_bytes (UTF-8) of a string."""
+        encoded = text.encode()
+        if len(encoded) <= max_bytes:
+            return text
+        return encoded[-max_bytes:].decode(errors="ignore")
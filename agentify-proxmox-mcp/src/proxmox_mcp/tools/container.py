@@ -0,0 +1,139 @@
+"""
+Container-related tools for Proxmox MCP.
+
+This module provides tools for managing LXC containers:
+- Listing all containers across the cluster with their status, with
+  filtering, field projection and cursor pagination
+- Retrieving detailed status of a single container
+- Power operations on one or many containers with optional
+  wait-for-completion
+
+Containers are collected with the same single /cluster/resources sweep
+and concurrent per-guest fetches as VMs (see GuestTools), so listing
+hundreds of containers costs one API call rather than one per node.
+"""
+from typing import List, Optional
+from mcp.types import TextContent as Content
+from .base import run_in_thread
+from .guests import GuestTools
+from .definitions import DEFAULT_GUEST_PAGE_SIZE
+
+# Power actions supported by container_power, mapped to the status that makes them a no-op
+CONTAINER_POWER_ACTIONS = {
+    "start": ("running", "already running"),
+    "stop": ("stopped", "already stopped"),
+    "shutdown": ("stopped", "already stopped"),
+    "reboot": ("stopped", "stopped, start it first"),
+}
+
+class ContainerTools(GuestTools):
+    """Tools for managing Proxmox LXC containers.
+
+    Provides functionality for:
+    - Retrieving cluster-wide container information
+    - Getting detailed container status
+    - Container power management (start, stop, shutdown, reboot)
+    """
+
+    guest_type = "lxc"
+    guest_label = "container"
+    list_title = "Containers"
+    resource_type = "containers"
+    power_actions = CONTAINER_POWER_ACTIONS
+
+    @run_in_thread
+    def get_containers(self, include_config: bool = False, output_format: Optional[str] = None,
+                       node: Optional[str] = None, status: Optional[str] = None,
+                       name: Optional[str] = None, tag: Optional[str] = None,
+                       vmid_min: Optional[int] = None, vmid_max: Optional[int] = None,
+                       fields: Optional[List[str]] = None, limit: int = DEFAULT_GUEST_PAGE_SIZE,
+                       cursor: Optional[str] = None) -> List[Content]:
+        """List LXC containers across the cluster with their status.
+
+        Containers are collected with a single /cluster/resources sweep.
+        Filters, field projection and pagination behave exactly as for
+        get_vms; per-container config is fetched concurrently, for the
+        current page only, when include_config is set.
+
+        Args:
+            include_config: Also fetch each container's config for configured cores
+            output_format: 'text' (formatted) or 'json' (compact); defaults to the configured format
+            node: Only containers on this node
+            status: Only containers in this state (e.g. 'running', 'stopped')
+            name: Only containers whose name matches this glob (e.g. 'web-*')
+            tag: Only containers carrying this tag
+            vmid_min: Lowest container ID to include
+            vmid_max: Highest container ID to include
+            fields: Fields to return (default: vmid, name, status, node, cpus, memory);
+                    see GUEST_FIELDS for all available fields
+            limit: Maximum number of containers per page
+            cursor: Cursor returned by the previous page
+
+        Returns:
+            List of Content objects containing formatted container information.
+            JSON output wraps the page as {"containers": [...], "total": matching,
+            "next_cursor": cursor or null}.
+
+        Raises:
+            ValueError: If a field, the cursor or the limit is invalid
+            RuntimeError: If the cluster-wide query fails
+        """
+        return self._list_guests(include_config, output_format, node, status, name, tag,
+                                 vmid_min, vmid_max, fields, limit, cursor)
+
+    @run_in_thread
+    def get_container_status(self, node: str, vmid: str,
+                             output_format: Optional[str] = None) -> List[Content]:
+        """Get detailed status of a single container.
+
+        Args:
+            node: Host node name (e.g., 'pve1')
+            vmid: Container ID (e.g., '200')
+            output_format: 'text' (formatted) or 'json' (compact); defaults to the configured format
+
+        Returns:
+            List of Content objects containing status, uptime, CPU, memory
+            and disk usage
+
+        Raises:
+            ValueError: If the container is not found
+            RuntimeError: If the status query fails
+        """
+        try:
+            status = self._guest_api(node, vmid).status.current.get()
+            return self._format_response({"node": node, **status}, "container_status",
+                                         output_format)
+        except Exception as e:
+            if "does not exist" in str(e).lower() or "not found" in str(e).lower():
+                raise ValueError(f"Container {vmid} not found on node {node}") from e
+            self._handle_error(f"get status of container {vmid}", e)
+
+    @run_in_thread
+    def container_power(self, action: str, containers: Optional[List[str]] = None,
+                        tag: Optional[str] = None, name: Optional[str] = None,
+                        max_concurrency: int = 10, wait: bool = False,
+                        timeout: float = 300) -> List[Content]:
+        """Run a power action on one or many containers.
+
+        Targets are resolved from a single /cluster/resources snapshot and
+        containers already in the requested state are skipped. Requests are
+        issued with bounded parallelism and started tasks are registered
+        with the task tracker.
+
+        Args:
+            action: One of 'start', 'stop', 'shutdown', 'reboot'
+            containers: Container IDs, optionally prefixed with the node (e.g., ['200', 'pve1:201'])
+            tag: Select all containers carrying this tag
+            name: Select all containers whose name matches this glob (e.g., 'web-*')
+            max_concurrency: Maximum number of concurrent API requests
+            wait: Wait for the power tasks to finish
+            timeout: Seconds to wait for tasks when wait is enabled
+
+        Returns:
+            List of Content objects containing a per-container summary table
+
+        Raises:
+            ValueError: If the action is unknown, no selector is given or a container is not found
+            RuntimeError: If the container lookup fails
+        """
+        return self._bulk_power(action, containers, tag, name, max_concurrency, wait, timeout)
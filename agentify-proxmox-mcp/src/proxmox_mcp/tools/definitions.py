@@ -3,40 +3,130 @@ Tool descriptions for Proxmox MCP tools.
 """
 
 # Node tool descriptions
-GET_NODES_DESC = """List all nodes in the Proxmox cluster with their status, CPU, memory, and role information.
+GET_NODES_DESC = """List all nodes in the Proxmox cluster with their status, CPU usage, load, memory
+and root filesystem usage.
+
+Parameters:
+output_format - 'text' (formatted) or 'json' (compact) (optional, default: from config)
 
 Example:
-{"node": "pve1", "status": "online", "cpu_usage": 0.15, "memory": {"used": "8GB", "total": "32GB"}}"""
+{"node": "pve1", "status": "online", "maxcpu": 16, "cpu": 0.15, "loadavg": [1.2, 0.9, 0.8],
+ "memory": {"used": 8589934592, "total": 34359738368}}"""
 
 GET_NODE_STATUS_DESC = """Get detailed status information for a specific Proxmox node.
 
+Includes CPU model and usage, load average, memory, swap, root filesystem, KSM sharing and version.
+
 Parameters:
 node* - Name/ID of node to query (e.g. 'pve1')
+output_format - 'text' (formatted) or 'json' (compact) (optional, default: from config)
 
 Example:
-{"cpu": {"usage": 0.15}, "memory": {"used": "8GB", "total": "32GB"}}"""
+{"cpu": 0.15, "loadavg": ["1.20", "0.90", "0.80"],
+ "memory": {"used": 8589934592, "total": 34359738368}, "rootfs": {...}}"""
+
+COMPARE_NODES_DESC = """Compare the headroom of all nodes in one compact table: CPU usage and free
+cores, load average, memory, swap, root filesystem, KSM sharing and uptime.
+
+Answers "which node has room for this guest" with a single call; the node status sweep is shared
+with get_nodes.
+
+Parameters:
+sort_by - Rank nodes by most headroom: 'node' (name), 'cpu' (free cores), 'load' (load per core),
+          'mem' (free memory) or 'disk' (free root FS) (optional, default: node)
+output_format - 'text' (formatted) or 'json' (compact) (optional, default: from config)
+
+Example:
+Node with the most free memory first: sort_by='mem'"""
+
+# Fields get_vms/get_containers can return, and those returned when no projection is given
+GUEST_FIELDS = ("vmid", "name", "status", "node", "cpus", "memory", "cpu_usage", "uptime", "disk",
+                "tags", "template")
+DEFAULT_GUEST_FIELDS = ("vmid", "name", "status", "node", "cpus", "memory")
+
+# get_vms/get_containers page sizes
+DEFAULT_GUEST_PAGE_SIZE = 100
+MAX_GUEST_PAGE_SIZE = 1000
+
+# Accepted (min, max) of new VM specifications: cores, memory in MB, disk size in GB
+VM_LIMITS = {"cpus": (1, 32), "memory": (512, 131072), "disk_size": (5, 1000)}
+
+# Most VMs create_vms_batch provisions in one call
+MAX_BATCH_SIZE = 100
 
 # VM tool descriptions
-GET_VMS_DESC = """List all virtual machines across the cluster with their status and resource usage.
+GET_VMS_DESC = """List virtual machines across the cluster with their status and resource usage.
+
+Results are ordered by VM ID and paginated; pass next_cursor from a page as cursor to get the next
+one.
+
+Parameters:
+include_config - Also fetch per-VM config for configured core counts (optional, default: false)
+output_format - 'text' (formatted) or 'json' (compact) (optional, default: from config)
+node - Only VMs on this node (optional)
+status - Only VMs in this state, e.g. 'running' (optional)
+name - Only VMs whose name matches this glob, e.g. 'web-*' (optional)
+tag - Only VMs carrying this tag (optional)
+vmid_min / vmid_max - VM ID range to include (optional)
+fields - Fields to return, from: vmid, name, status, node, cpus, memory, cpu_usage, uptime, disk,
+         tags, template
+         (optional, default: vmid, name, status, node, cpus, memory)
+limit - Maximum number of VMs per page (optional, default: 100, max: 1000)
+cursor - Cursor returned by the previous page (optional)
 
 Example:
 {"vmid": "100", "name": "ubuntu", "status": "running", "cpu": 2, "memory": 4096}"""
 
 CREATE_VM_DESC = """Create a new virtual machine with specified configuration.
 
+Without node or storage, the VM is placed on the node and storage with the most memory, CPU and disk
+headroom, scored from one cluster-wide resource snapshot. Without vmid, the next free ID in the
+cluster is allocated.
+
 Parameters:
-node* - Host node name (e.g. 'pve')
-vmid* - New VM ID number (e.g. '200', '300')
 name* - VM name (e.g. 'my-new-vm', 'web-server')
 cpus* - Number of CPU cores (e.g. 1, 2, 4)
 memory* - Memory size in MB (e.g. 2048 for 2GB, 4096 for 4GB)
 disk_size* - Disk size in GB (e.g. 10, 20, 50)
-storage - Storage name (optional, will auto-detect if not specified)
+vmid - New VM ID number (optional, next free ID if not specified)
+node - Host node name (optional, auto-placed if not specified)
+storage - Storage name (optional, auto-placed if not specified)
 ostype - OS type (optional, default: 'l26' for Linux)
 
 Examples:
-- Create VM with 1 CPU, 2GB RAM, 10GB disk: node='pve', vmid='200', name='test-vm', cpus=1, memory=2048, disk_size=10
-- Create VM with 2 CPUs, 4GB RAM, 20GB disk: node='pve', vmid='201', name='web-server', cpus=2, memory=4096, disk_size=20"""
+- Create VM with 1 CPU, 2GB RAM, 10GB disk wherever it fits best: name='test-vm', cpus=1,
+  memory=2048, disk_size=10
+- Create VM with 2 CPUs, 4GB RAM, 20GB disk on node pve: node='pve', vmid='201', name='web-server',
+  cpus=2, memory=4096, disk_size=20"""
+
+CREATE_VMS_BATCH_DESC = """Create or clone many VMs in one call, e.g. a lab of 20-50 VMs.
+
+Give either specs (one dict per VM) or count with name_pattern. The other parameters are defaults
+that each spec can override. The whole batch is placed from one cluster-wide resource snapshot, each
+VM accounting for the ones placed before it, and VM IDs are allocated in bulk. At most max_per_node
+create/clone tasks run per node; with wait, the call returns once every task finished.
+
+Parameters:
+specs - List of VM specs (optional); keys: name*, cpus, memory, disk_size, node, storage, ostype,
+        template, vmid
+        (same limits as create_vm)
+count - Number of VMs when no specs are given (optional, max: 100)
+name_pattern - Name of VM number n in count mode (optional, default: 'vm-{n}', e.g. 'lab-{n:02d}')
+start_index - First number in count mode (optional, default: 1)
+cpus - Number of CPU cores (optional, default: 1, range: 1-32)
+memory - Memory size in MB (optional, default: 2048, range: 512-131072)
+disk_size - Disk size in GB (optional, default: 10, range: 5-1000)
+node - Host node name (optional, auto-placed if not specified)
+storage - Storage name (optional, auto-placed if not specified)
+ostype - OS type (optional, default: 'l26' for Linux)
+template - Template VM ID to full-clone instead of creating empty VMs (optional)
+max_per_node - Maximum concurrent tasks per node (optional, default: 2)
+wait - Wait for all tasks to finish (optional, default: true)
+timeout - Seconds the batch may take when waiting (optional, default: 1800)
+
+Examples:
+- 20 lab VMs cloned from template 9000: count=20, name_pattern='lab-{n:02d}', template=9000
+- Mixed sizes: specs=[{"name": "db", "cpus": 4, "memory": 8192}, {"name": "web", "node": "pve2"}]"""
 
 EXECUTE_VM_COMMAND_DESC = """Execute commands in a VM via QEMU guest agent.
 
@@ -44,9 +134,45 @@ Parameters:
 node* - Host node name (e.g. 'pve1')
 vmid* - VM ID number (e.g. '100')
 command* - Shell command to run (e.g. 'uname -a')
+timeout - Seconds to wait for the command to finish (optional, default: 30)
 
 Example:
-{"success": true, "output": "Linux vm1 5.4.0", "exit_code": 0}"""
+{"success": true, "output": "Linux vm1 5.4.0", "exit_code": 0, "elapsed": 0.04}"""
+
+EXECUTE_VM_COMMAND_STREAM_DESC = """Execute a long-running command in a VM via QEMU guest agent,
+streaming output as progress notifications.
+
+Use for commands that run for minutes (e.g. 'apt-get upgrade -y', 'tail -n 1000 /var/log/syslog').
+The stock QEMU guest agent only reports output once the command has exited; with it, all output
+arrives in one notification at the end. Output streams while the command runs only with an agent
+that reports partial output.
+
+Parameters:
+node* - Host node name (e.g. 'pve1')
+vmid* - VM ID number (e.g. '100')
+command* - Shell command to run
+timeout - Seconds to wait for the command to finish (optional, default: 600)
+max_bytes - Maximum bytes of output kept in the final result, last part wins
+            (optional, default: 65536)
+
+Example:
+{"success": true, "output": "...last lines...", "exit_code": 0, "elapsed": 142.3}"""
+
+EXECUTE_VM_COMMAND_BATCH_DESC = """Execute the same command in many VMs in parallel via QEMU guest
+agent.
+
+Parameters:
+command* - Shell command to run in every VM (e.g. 'uptime')
+vms - VM IDs, optionally with node prefix (e.g. ['100', 'pve1:101'])
+tag - Run in all VMs carrying this tag (e.g. 'web')
+name - Run in all VMs whose name matches this glob (e.g. 'web-*')
+max_concurrency - Maximum concurrent API requests (optional, default: 10)
+timeout - Seconds to wait for commands to finish (optional, default: 30)
+
+At least one of vms, tag or name is required. Returns a compact per-VM table.
+
+Example:
+Check nginx on all web VMs: command='systemctl is-active nginx', tag='web'"""
 
 # VM Power Management tool descriptions
 START_VM_DESC = """Start a virtual machine.
@@ -85,6 +211,22 @@ vmid* - VM ID number (e.g. '101')
 Example:
 Reset VPN-Server with ID 101 on node pve"""
 
+BULK_VM_POWER_DESC = """Run a power action (start, stop, shutdown, reset) on many VMs in parallel.
+
+Parameters:
+action* - One of 'start', 'stop', 'shutdown', 'reset'
+vms - VM IDs, optionally with node prefix (e.g. ['100', 'pve1:101'])
+tag - Select all VMs carrying this tag (e.g. 'lab')
+name - Select all VMs whose name matches this glob (e.g. 'web-*')
+max_concurrency - Maximum concurrent API requests (optional, default: 10)
+wait - Wait for the power tasks to finish (optional, default: false)
+timeout - Seconds to wait for tasks when wait is set (optional, default: 300)
+
+At least one of vms, tag or name is required. VMs already in the target state are skipped.
+
+Example:
+Gracefully shut down all lab VMs and wait: action='shutdown', tag='lab', wait=true"""
+
 DELETE_VM_DESC = """Delete/remove a virtual machine completely.
 
 ⚠️ WARNING: This operation permanently deletes the VM and all its data!
@@ -104,19 +246,190 @@ Example:
 Delete test VM with ID 998 on node pve"""
 
 # Container tool descriptions
-GET_CONTAINERS_DESC = """List all LXC containers across the cluster with their status and configuration.
+GET_CONTAINERS_DESC = """List LXC containers across the cluster with their status and resource
+usage.
+
+Results are ordered by container ID and paginated; pass next_cursor from a page as cursor to get the
+next one.
+
+Parameters:
+include_config - Also fetch per-container config for configured core counts
+                 (optional, default: false)
+output_format - 'text' (formatted) or 'json' (compact) (optional, default: from config)
+node - Only containers on this node (optional)
+status - Only containers in this state, e.g. 'running' (optional)
+name - Only containers whose name matches this glob, e.g. 'web-*' (optional)
+tag - Only containers carrying this tag (optional)
+vmid_min / vmid_max - Container ID range to include (optional)
+fields - Fields to return, from: vmid, name, status, node, cpus, memory, cpu_usage, uptime, disk,
+         tags, template
+         (optional, default: vmid, name, status, node, cpus, memory)
+limit - Maximum number of containers per page (optional, default: 100, max: 1000)
+cursor - Cursor returned by the previous page (optional)
 
 Example:
-{"vmid": "200", "name": "nginx", "status": "running", "template": "ubuntu-20.04"}"""
+{"vmid": "200", "name": "nginx", "status": "running", "node": "pve1", "cpus": 2, "memory": 2048}"""
+
+GET_CONTAINER_STATUS_DESC = """Get detailed status of a single LXC container.
+
+Parameters:
+node* - Host node name (e.g. 'pve1')
+vmid* - Container ID (e.g. '200')
+output_format - 'text' (formatted) or 'json' (compact) (optional, default: from config)
+
+Example:
+{"vmid": 200, "name": "nginx", "status": "running", "uptime": 3600, "cpu": 0.02,
+ "mem": 268435456}"""
+
+CONTAINER_POWER_DESC = """Run a power action (start, stop, shutdown, reboot) on one or many LXC
+containers in parallel.
+
+Parameters:
+action* - One of 'start', 'stop', 'shutdown', 'reboot'
+containers - Container IDs, optionally with node prefix (e.g. ['200', 'pve1:201'])
+tag - Select all containers carrying this tag (e.g. 'lab')
+name - Select all containers whose name matches this glob (e.g. 'web-*')
+max_concurrency - Maximum concurrent API requests (optional, default: 10)
+wait - Wait for the power tasks to finish (optional, default: false)
+timeout - Seconds to wait for tasks when wait is set (optional, default: 300)
+
+At least one of containers, tag or name is required. Containers already in the target state are
+skipped.
+
+Example:
+Start container 200 on pve1 and wait: action='start', containers=['pve1:200'], wait=true"""
 
 # Storage tool descriptions
 GET_STORAGE_DESC = """List storage pools across the cluster with their usage and configuration.
 
+Shared pools (e.g. Ceph, NFS) are listed once with all their nodes; local pools are listed once per
+node.
+
+Parameters:
+output_format - 'text' (formatted) or 'json' (compact) (optional, default: from config)
+
 Example:
-{"storage": "local-lvm", "type": "lvm", "used": "500GB", "total": "1TB"}"""
+{"storage": "local-lvm", "type": "lvmthin", "shared": false, "nodes": ["pve1"],
+ "used": 536870912000, "total": 1099511627776}"""
+
+FIND_STORAGE_CONTENT_DESC = """Search ISO images, container templates (vztmpl) and vzdump backups
+across all storage.
+
+Answered from an in-memory index of every pool's content, rebuilt concurrently when older than its
+TTL (default 5 minutes).
+
+Parameters:
+content - 'iso', 'vztmpl' or 'backup' (optional)
+name - File name glob, case-insensitive (e.g. '*ubuntu*22.04*') (optional)
+vmid - Only backups of this VM/container (optional)
+storage - Only volumes on this storage (optional)
+node - Only volumes reachable from this node (optional)
+min_size_mb / max_size_mb - Size range in MB (optional)
+newer_than_days / older_than_days - Age range in days (optional)
+sort_by - 'ctime' (newest first), 'size' (largest first) or 'name' (optional, default: ctime)
+limit - Maximum number of volumes returned (optional, default: 50)
+refresh - Re-scan storage even if the index is fresh (optional, default: false)
+output_format - 'text' (formatted) or 'json' (compact) (optional, default: from config)
+
+Example:
+Latest backup of VM 123: content='backup', vmid=123, limit=1"""
 
 # Cluster tool descriptions
 GET_CLUSTER_STATUS_DESC = """Get overall Proxmox cluster health and configuration status.
 
+Parameters:
+output_format - 'text' (formatted) or 'json' (compact) (optional, default: from config)
+
 Example:
 {"name": "proxmox", "quorum": "ok", "nodes": 3, "ha_status": "active"}"""
+
+# Task tool descriptions
+WAIT_TASK_DESC = """Wait for Proxmox tasks (VM creation, deletion, power operations) to finish.
+
+Parameters:
+upids* - Task IDs as returned by mutating tools (e.g. ['UPID:pve1:0001A2B3:...'])
+timeout - Seconds to wait before returning (optional, default: 300)
+
+Tasks are polled in batches per node. Returns each task's final status (OK or the error), or
+'running' if it didn't finish in time.
+
+Example:
+Wait for VM 200 creation: upids=['UPID:pve:0012F0C1:01A2B3C4:65F1D2E3:qmcreate:200:root@pam:']"""
+
+LIST_TASKS_DESC = """List tasks started through this server with their current status.
+
+Parameters:
+running_only - Only show tasks that haven't finished (optional, default: false)
+
+Example:
+{"upid": "UPID:pve:...:qmstart:100:root@pam:", "description": "start VM 100", "status": "stopped",
+ "exitstatus": "OK"}"""
+
+# Metrics tool descriptions
+GET_METRICS_TREND_DESC = """Summarize a node's or guest's recent CPU, memory, disk and network usage
+from in-memory history.
+
+Answered from samples the server collects in the background, without any Proxmox API request.
+
+Parameters:
+target* - Node name, VM/container ID or resource ID (e.g. 'pve1', '100', 'lxc/200')
+window - Window length in minutes (optional, default: 15)
+metrics - Metrics to summarize: cpu, mem, maxmem, disk, maxdisk, netin, netout, diskread, diskwrite
+          (optional, default: all)
+output_format - 'text' (formatted) or 'json' (compact) (optional, default: from config)
+
+Counters (netin, netout, diskread, diskwrite) are reported as bytes per second.
+
+Example:
+CPU of node pve1 over the last 15 minutes: target='pve1', metrics=['cpu']"""
+
+GET_RRD_STATS_DESC = """Aggregate historical RRD metrics over many VMs, containers or nodes in one
+call.
+
+Fetches the RRD series of every selected resource concurrently and returns percentiles, average and
+maximum per resource, ranked, top rows only. Use it for capacity questions ("which VMs used the most
+CPU today").
+
+Parameters:
+metric - cpu, mem, netin, netout, diskread, diskwrite (guests) or cpu, mem, netin, netout, loadavg,
+         iowait (nodes) (optional, default: cpu)
+scope - 'vms', 'containers', 'guests' or 'nodes' (optional, default: vms)
+timeframe - 'hour', 'day', 'week', 'month' or 'year' (optional, default: hour)
+cf - Consolidation function 'AVERAGE' or 'MAX' (optional, default: AVERAGE)
+node - Only resources on this node (optional)
+tag - Only guests carrying this tag (optional)
+name - Only guests whose name matches this glob (optional)
+ids - Only these VM/container IDs, or node names for scope 'nodes' (optional)
+percentiles - Percentiles to compute (optional, default: [50, 95])
+sort_by - Ranking column: 'avg', 'max' or 'p<N>' (optional, default: highest percentile)
+top - Number of rows returned (optional, default: 20)
+output_format - 'text' (formatted) or 'json' (compact) (optional, default: from config)
+
+Example:
+Top 10 VMs by 95th percentile disk writes over the last day: metric='diskwrite', timeframe='day',
+top=10"""
+
+GET_TOP_GUESTS_DESC = """Rank VMs and containers by current resource pressure and return only the
+top rows.
+
+Scores every guest from one cluster-wide resources query and keeps the heaviest few, for hotspot
+questions ("which guests are hammering the disks right now").
+
+Parameters:
+metric - cpu (cores in use), mem (% of allocated), diskread, diskwrite, netin, netout (bytes/s)
+         (optional, default: cpu)
+scope - 'vms', 'containers' or 'guests' (optional, default: guests)
+node - Only guests on this node (optional)
+tag - Only guests carrying this tag (optional)
+name - Only guests whose name matches this glob (optional)
+top - Number of rows returned (optional, default: 10)
+interval - Seconds between two live samples used to compute I/O rates, up to 60; I/O metrics only
+           (optional)
+window - Minutes of collected metrics history to average over instead (optional)
+output_format - 'text' (formatted) or 'json' (compact) (optional, default: from config)
+
+Disk and network counters are cumulative: without interval or window they rank by bytes since guest
+start.
+
+Example:
+Top 5 guests by disk writes over a 5-second sample: metric='diskwrite', interval=5, top=5"""
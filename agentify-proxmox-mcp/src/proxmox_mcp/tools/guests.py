@@ -0,0 +1,378 @@
+"""
+Shared guest (VM and container) tooling for Proxmox MCP.
+
+QEMU VMs and LXC containers are both listed by /cluster/resources and
+share most of their API shape (nodes/{node}/{qemu|lxc}/{vmid}/...). This
+module provides the collection path both guest types use:
+- One cluster-wide /cluster/resources sweep instead of per-node loops
+- Filtering by node, status, name glob, tag and VM ID range
+- Field projection and cursor pagination
+- Concurrent per-guest config fetches for the current page only
+- Selector resolution and bulk power actions with task tracking
+- Answering listings from the metrics collector's snapshot when fresh
+
+VMTools and ContainerTools subclass GuestTools and only set the guest
+type; their public tool methods delegate here.
+"""
+import time
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from mcp.types import TextContent as Content
+from .base import ProxmoxTool
+from ..core.tasks import TaskTracker
+from ..core.vmids import VMIDAllocator
+from .definitions import GUEST_FIELDS, DEFAULT_GUEST_FIELDS, DEFAULT_GUEST_PAGE_SIZE
+
+if TYPE_CHECKING:
+    from proxmoxer import ProxmoxAPI
+
+
+class GuestTools(ProxmoxTool):
+    """Base class for tools operating on one guest type.
+
+    Subclasses set guest_type to the API path segment ('qemu' or 'lxc'),
+    guest_label and list_title for messages, resource_type for response
+    templates and power_actions to the supported bulk power actions.
+    """
+
+    # API path segment and /cluster/resources type of the guests
+    guest_type: str = "qemu"
+    # Singular label used in messages
+    guest_label: str = "VM"
+    # Title of guest list tables
+    list_title: str = "Virtual Machines"
+    # Template used by _format_response for guest lists
+    resource_type: str = "vms"
+    # Power actions, mapped to the status that makes them a no-op and the reason shown
+    power_actions: Dict[str, Tuple[str, str]] = {}
+
+    def __init__(self, proxmox_api: "ProxmoxAPI", task_tracker: Optional[TaskTracker] = None,
+                 vmids: Optional[VMIDAllocator] = None):
+        """Initialize guest tools.
+
+        Args:
+            proxmox_api: Initialized ProxmoxAPI instance
+            task_tracker: Shared task tracker; a private one is created if omitted
+            vmids: Shared VM ID allocator; a private one is created if omitted
+        """
+        super().__init__(proxmox_api)
+        self.tasks = task_tracker or TaskTracker(proxmox_api)
+        self.vmids = vmids or VMIDAllocator(proxmox_api)
+
+    def _guest_api(self, node: str, vmid: Any) -> Any:
+        """Get the API resource of a single guest (nodes/{node}/{type}/{vmid})."""
+        return getattr(self.proxmox.nodes(node), self.guest_type)(vmid)
+
+    def _get_guest_resources(self, live: bool = False) -> List[dict]:
+        """Fetch all guests of this type in the cluster with one API call.
+
+        /cluster/resources?type=vm returns both QEMU VMs and LXC containers,
+        so the result is narrowed down to this tool's guest type. When the
+        metrics collector holds a fresh snapshot, it is used instead and no
+        request is made.
+
+        Args:
+            live: Always query the API, e.g. before acting on guest state
+
+        Returns:
+            List of resource dictionaries sorted by VM ID
+        """
+        guests = None
+        if not live and self.metrics is not None:
+            guests = self.metrics.snapshot((self.guest_type,))
+        if guests is None:
+            resources = self.proxmox.cluster.resources.get(type="vm")
+            guests = [r for r in resources if r.get("type", "qemu") == self.guest_type]
+        return sorted(guests, key=lambda r: int(r["vmid"]))
+
+    def _register_task(self, upid: Any, description: str) -> Optional[Dict[str, Any]]:
+        """Register a started task and discard the metrics snapshot it invalidates.
+
+        Args:
+            upid: Task ID returned by the mutating API call
+            description: Human-readable task description
+
+        Returns:
+            Task state, or None if upid is not a valid task ID
+        """
+        if self.metrics is not None:
+            self.metrics.mark_stale()
+        return self.tasks.register(upid, description)
+
+    def _list_guests(self, include_config: bool = False, output_format: Optional[str] = None,
+                     node: Optional[str] = None, status: Optional[str] = None,
+                     name: Optional[str] = None, tag: Optional[str] = None,
+                     vmid_min: Optional[int] = None, vmid_max: Optional[int] = None,
+                     fields: Optional[List[str]] = None, limit: int = DEFAULT_GUEST_PAGE_SIZE,
+                     cursor: Optional[str] = None) -> List[Content]:
+        """List one page of guests matching the given filters.
+
+        Filters are applied to a single /cluster/resources sweep, ordered by
+        VM ID, and only the requested page is formatted. Per-guest config is
+        fetched concurrently, for the page only, when include_config is set;
+        guests whose config can't be read keep the resource view values.
+
+        Args:
+            include_config: Also fetch each guest's config for configured cores
+            output_format: 'text' (formatted) or 'json' (compact); defaults to the configured format
+            node: Only guests on this node
+            status: Only guests in this state (e.g. 'running', 'stopped')
+            name: Only guests whose name matches this glob (e.g. 'web-*')
+            tag: Only guests carrying this tag
+            vmid_min: Lowest VM ID to include
+            vmid_max: Highest VM ID to include
+            fields: Fields to return (default: DEFAULT_GUEST_FIELDS)
+            limit: Maximum number of guests per page
+            cursor: Cursor returned by the previous page (the last VM ID it contained)
+
+        Returns:
+            List of Content objects with the page. JSON output wraps it as
+            {"<resource_type>": [...], "total": matching, "next_cursor": cursor or null}.
+
+        Raises:
+            ValueError: If a field, the cursor or the limit is invalid
+            RuntimeError: If the cluster-wide query fails
+        """
+        label = self.guest_label
+        unknown = [field for field in fields or [] if field not in GUEST_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}; "
+                             f"available: {', '.join(GUEST_FIELDS)}")
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        try:
+            after = int(cursor) if cursor else None
+        except ValueError:
+            raise ValueError(f"Invalid cursor: {cursor}") from None
+
+        try:
+            matching = [
+                guest for guest in self._get_guest_resources()
+                if (node is None or guest["node"] == node)
+                and (status is None or guest.get("status") == status)
+                and (name is None or fnmatchcase(guest.get("name", ""), name))
+                and (tag is None or tag in self._split_tags(guest.get("tags")))
+                and (vmid_min is None or int(guest["vmid"]) >= vmid_min)
+                and (vmid_max is None or int(guest["vmid"]) <= vmid_max)
+            ]
+            remaining = [guest for guest in matching if after is None or int(guest["vmid"]) > after]
+            page = remaining[:limit]
+            next_cursor = str(page[-1]["vmid"]) if len(remaining) > limit else None
+
+            configs: Dict[Any, Dict[str, Any]] = {}
+            if include_config:
+                configs, _ = self._fan_out({
+                    guest["vmid"]: self._guest_api(guest["node"], guest["vmid"]).config.get
+                    for guest in page
+                })
+
+            selected = fields or DEFAULT_GUEST_FIELDS
+            result = []
+            for guest in page:
+                vmid = guest["vmid"]
+                entry = {
+                    "vmid": vmid,
+                    "name": guest.get("name", f"{label}-{vmid}"),
+                    "status": guest.get("status", "unknown"),
+                    "node": guest["node"],
+                    "cpus": guest.get("maxcpu", "N/A"),
+                    "memory": {
+                        "used": guest.get("mem", 0),
+                        "total": guest.get("maxmem", 0)
+                    },
+                    "cpu_usage": guest.get("cpu", 0),
+                    "uptime": guest.get("uptime", 0),
+                    "disk": {
+                        "used": guest.get("disk", 0),
+                        "total": guest.get("maxdisk", 0)
+                    },
+                    "tags": self._split_tags(guest.get("tags")),
+                    "template": bool(guest.get("template", 0)),
+                }
+                # Keep resource view values if config couldn't be read
+                if vmid in configs:
+                    entry["cpus"] = configs[vmid].get("cores", entry["cpus"])
+                result.append({field: entry[field] for field in selected})
+
+            if (output_format or self.output_format) == "json":
+                return self._format_response(
+                    {self.resource_type: result, "total": len(matching),
+                     "next_cursor": next_cursor},
+                    self.resource_type, "json"
+                )
+
+            if fields:
+                from ..formatting import ProxmoxFormatters, ProxmoxComponents
+                rows = [[self._format_guest_field(ProxmoxFormatters, guest[field])
+                         for field in fields]
+                        for guest in result]
+                text = ProxmoxComponents.create_table(list(fields), rows, title=self.list_title)
+            else:
+                text = self._format_response(result, self.resource_type, "text")[0].text
+            if next_cursor or after is not None:
+                text += f"\n\nShowing {len(result)} of {len(matching)} matching {label}s"
+                if next_cursor:
+                    text += f", next page: cursor='{next_cursor}'"
+            return [Content(type="text", text=text)]
+        except Exception as e:
+            self._handle_error(f"get {label}s", e)
+
+    @staticmethod
+    def _format_guest_field(formatters: Any, value: Any) -> str:
+        """Render a projected guest field as a table cell."""
+        if isinstance(value, dict):
+            used, total = value["used"], value["total"]
+            return f"{formatters.format_bytes(used)} / {formatters.format_bytes(total)}"
+        if isinstance(value, list):
+            return ",".join(value)
+        if isinstance(value, float):
+            return f"{value * 100:.1f}%"
+        return str(value)
+
+    def _select_guests(self, ids: Optional[List[str]] = None, tag: Optional[str] = None,
+                       name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Resolve guest selectors against the cluster resource view.
+
+        Args:
+            ids: VM IDs, optionally prefixed with the node ('pve1:100' or 'pve1/100')
+            tag: Tag every selected guest must carry
+            name: Glob every selected guest name must match
+
+        Returns:
+            Resource dictionaries of the selected guests, sorted by VM ID
+
+        Raises:
+            ValueError: If an explicitly requested guest is not found
+        """
+        resources = self._get_guest_resources(live=True)
+        selected = resources
+        if ids:
+            by_id = {str(guest["vmid"]): guest for guest in resources}
+            selected, missing = [], []
+            for item in ids:
+                node, _, vmid = str(item).replace("/", ":").rpartition(":")
+                guest = by_id.get(vmid)
+                if guest is None or (node and guest["node"] != node):
+                    missing.append(str(item))
+                elif guest not in selected:
+                    selected.append(guest)
+            if missing:
+                raise ValueError(f"{self.guest_label}(s) not found: {', '.join(missing)}")
+        if tag:
+            selected = [guest for guest in selected if tag in self._split_tags(guest.get("tags"))]
+        if name:
+            selected = [guest for guest in selected if fnmatchcase(guest.get("name", ""), name)]
+        return sorted(selected, key=lambda guest: int(guest["vmid"]))
+
+    @staticmethod
+    def _split_tags(tags: Optional[str]) -> List[str]:
+        """Split a Proxmox tag string ('web;prod') into a list of tags."""
+        return [t for t in (tags or "").replace(",", ";").replace(" ", ";").split(";") if t]
+
+    def _bulk_power(self, action: str, ids: Optional[List[str]] = None, tag: Optional[str] = None,
+                    name: Optional[str] = None, max_concurrency: int = 10, wait: bool = False,
+                    timeout: float = 300) -> List[Content]:
+        """Run a power action on many guests at once.
+
+        Target guests are resolved from a single /cluster/resources snapshot,
+        which also tells which guests are already in the requested state, so
+        no per-guest status request is needed. Power requests are issued with
+        bounded parallelism. Started tasks are registered with the task
+        tracker; with wait enabled, they are awaited through its batched
+        per-node polling. A request that gets no response within the call
+        timeout is reported as 'unknown', since the host may still act on it.
+
+        Args:
+            action: One of power_actions
+            ids: VM IDs, optionally prefixed with the node (e.g., ['100', 'pve1:101'])
+            tag: Select all guests carrying this tag
+            name: Select all guests whose name matches this glob (e.g., 'web-*')
+            max_concurrency: Maximum number of concurrent API requests
+            wait: Wait for the power tasks to finish
+            timeout: Seconds to wait for tasks when wait is enabled
+
+        Returns:
+            List of Content objects containing a per-guest summary table with
+            successes, failures and durations
+
+        Raises:
+            ValueError: If the action is unknown, no selector is given or a guest is not found
+            RuntimeError: If the guest lookup fails
+        """
+        label = self.guest_label
+        if action not in self.power_actions:
+            raise ValueError(f"Invalid action '{action}', "
+                             f"expected one of: {', '.join(self.power_actions)}")
+        if not ids and not tag and not name:
+            raise ValueError(f"Specify {label}s by ID, tag or name for a bulk power operation")
+        try:
+            targets = self._select_guests(ids, tag, name)
+        except ValueError:
+            raise
+        except Exception as e:
+            self._handle_error(f"select {label}s to {action}", e)
+
+        noop_status, noop_reason = self.power_actions[action]
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        calls = {}
+        for guest in targets:
+            key = str(guest["vmid"])
+            if guest.get("status") == noop_status:
+                outcomes[key] = {"result": "skipped", "detail": noop_reason}
+            else:
+                calls[key] = getattr(self._guest_api(guest["node"], key).status, action).post
+
+        if calls and self.metrics is not None:
+            self.metrics.mark_stale()
+        started = time.monotonic()
+        upids, errors = self._fan_out(calls, max_workers=max_concurrency)
+        dispatched = time.monotonic() - started
+        for key, error in errors.items():
+            if isinstance(error, TimeoutError):
+                # The request may still reach the host; its outcome is unknown, not failed
+                outcomes[key] = {"result": "unknown", "duration": dispatched,
+                                 "detail": f"no response in time, "
+                                           f"the {action} may still be running"}
+            else:
+                outcomes[key] = {"result": "failed", "detail": str(error), "duration": dispatched}
+
+        tracked = {key: upid for key, upid in upids.items()
+                   if self._register_task(upid, f"{action} {label} {key}") is not None}
+
+        if wait and tracked:
+            states = self.tasks.wait(tracked.values(), timeout)
+            for key, upid in tracked.items():
+                state = states[str(upid)]
+                if state["endtime"] and state["starttime"]:
+                    duration = max(0, state["endtime"] - state["starttime"])
+                else:
+                    duration = time.monotonic() - started
+                if state["status"] != "stopped":
+                    outcomes[key] = {"result": "timeout", "detail": upid, "duration": duration}
+                elif state["exitstatus"] == "OK":
+                    outcomes[key] = {"result": "ok", "detail": upid, "duration": duration}
+                else:
+                    outcomes[key] = {"result": "failed", "detail": state["exitstatus"],
+                                     "duration": duration}
+
+        for key, upid in upids.items():
+            if key not in outcomes:
+                outcomes[key] = {"result": "started", "detail": upid, "duration": dispatched}
+
+        from ..formatting import ProxmoxComponents
+        rows = []
+        counts: Dict[str, int] = {}
+        for guest in targets:
+            outcome = outcomes[str(guest["vmid"])]
+            counts[outcome["result"]] = counts.get(outcome["result"], 0) + 1
+            duration = f"{outcome['duration']:.1f}s" if "duration" in outcome else "-"
+            rows.append([str(guest["vmid"]), guest.get("name", ""), guest["node"],
+                         outcome["result"].upper(), duration, outcome["detail"]])
+
+        table = ProxmoxComponents.create_table(
+            ["VMID", "Name", "Node", "Result", "Time", "Detail"], rows,
+            title=f"Bulk {action}: {len(targets)} {label}s"
+        )
+        summary = ", ".join(f"{count} {result}" for result, count in sorted(counts.items()))
+        summary = summary or f"no {label}s selected"
+        return [Content(type="text", text=f"{table}\nSummary: {summary}")]
@@ -0,0 +1,387 @@
+"""
+Metrics tools for Proxmox MCP.
+
+This module answers resource usage questions in a single call:
+- Recent trends ("CPU of pve1 over the last 15 minutes") from the
+  background metrics collector's ring buffers, without any API request
+- Historical statistics from Proxmox RRD data for many guests or nodes,
+  fetched concurrently and reduced to percentiles, maxima and top-N
+- Hotspot ranking of guests by current resource pressure
+"""
+import functools
+import heapq
+import time
+from fnmatch import fnmatchcase
+from typing import Any, Dict, List, Optional
+from mcp.types import TextContent as Content
+from .base import ProxmoxTool, run_in_thread
+from .guests import GuestTools
+from ..core.cache import bypass_cache
+from ..core.metrics import COUNTER_FIELDS, METRIC_FIELDS
+from ..core.rrd import CONSOLIDATIONS, RRD_METRICS, TIMEFRAMES, aggregate, extract
+
+# Guest resource types per get_rrd_stats scope
+RRD_SCOPES = {"vms": ("qemu",), "containers": ("lxc",), "guests": ("qemu", "lxc"), "nodes": ()}
+
+# Metrics get_top_guests can rank by
+TOP_METRICS = ("cpu", "mem", "diskread", "diskwrite", "netin", "netout")
+
+# Longest get_top_guests sampling interval, in seconds
+MAX_SAMPLE_INTERVAL = 60
+
+class MetricsTools(ProxmoxTool):
+    """Tools reporting metrics history.
+
+    Provides functionality for:
+    - Summarizing a node's or guest's recent CPU, memory, disk and
+      network usage over a time window
+    - Aggregating RRD history over many guests or nodes
+    - Ranking the guests putting the most pressure on a resource
+    """
+
+    async def get_metrics_trend(self, target: str, window: float = 15,
+                                metrics: Optional[List[str]] = None,
+                                output_format: Optional[str] = None) -> List[Content]:
+        """Summarize recent metrics of a node or guest.
+
+        Served entirely from memory; the answer covers the samples the
+        collector took during the window, so it is empty until the first
+        polls have run.
+
+        Args:
+            target: Node name, VM/container ID or resource ID (e.g. 'pve1', '100', 'lxc/200')
+            window: Window length in minutes
+            metrics: Metrics to summarize (default: all, see METRIC_FIELDS)
+            output_format: 'text' (formatted) or 'json' (compact); defaults to the configured format
+
+        Returns:
+            List of Content objects with last/min/avg/max per metric. Counters
+            (netin, netout, diskread, diskwrite) are reported as bytes per second.
+
+        Raises:
+            ValueError: If collection is disabled, the target is unknown or a metric is invalid
+        """
+        if self.metrics is None:
+            raise ValueError("Metrics collection is disabled, "
+                             "enable it in the 'metrics' config section")
+        key = self.metrics.resolve(target)
+        trend = self.metrics.trend(key, window * 60, metrics or METRIC_FIELDS)
+
+        if (output_format or self.output_format) == "json":
+            return self._format_response({"target": key, "window": window, "metrics": trend},
+                                         None, "json")
+
+        from ..formatting import ProxmoxComponents, ProxmoxFormatters
+
+        def render(field: str, value: float) -> str:
+            if field == "cpu":
+                return f"{value * 100:.1f}%"
+            if field in COUNTER_FIELDS:
+                return f"{ProxmoxFormatters.format_bytes(int(value))}/s"
+            return ProxmoxFormatters.format_bytes(int(value))
+
+        rows = [
+            [field, render(field, stats["last"]), render(field, stats["min"]),
+             render(field, stats["avg"]), render(field, stats["max"]), str(stats["samples"])]
+            for field, stats in trend.items()
+        ]
+        if not rows:
+            return [Content(type="text",
+                            text=f"No samples for {key} in the last {window:g} minutes")]
+        table = ProxmoxComponents.create_table(
+            ["Metric", "Last", "Min", "Avg", "Max", "Samples"], rows,
+            title=f"{key}: last {window:g} minutes"
+        )
+        return [Content(type="text", text=table)]
+
+    @run_in_thread
+    def get_rrd_stats(self, metric: str = "cpu", scope: str = "vms", timeframe: str = "hour",
+                      cf: str = "AVERAGE", node: Optional[str] = None, tag: Optional[str] = None,
+                      name: Optional[str] = None, ids: Optional[List[str]] = None,
+                      percentiles: Optional[List[float]] = None, sort_by: Optional[str] = None,
+                      top: int = 20, max_concurrency: int = 10,
+                      output_format: Optional[str] = None) -> List[Content]:
+        """Aggregate RRD history of one metric over many guests or nodes.
+
+        Selected resources are resolved from one /cluster/resources sweep
+        (or the metrics collector's snapshot), their rrddata series are
+        fetched concurrently, and all series are reduced at once (with
+        NumPy when installed). Only the top rows are returned.
+
+        Args:
+            metric: One of RRD_METRICS (e.g. 'cpu', 'netin', 'diskwrite', 'loadavg')
+            scope: 'vms', 'containers', 'guests' (both) or 'nodes'
+            timeframe: RRD timeframe: 'hour', 'day', 'week', 'month' or 'year'
+            cf: Consolidation function: 'AVERAGE' or 'MAX'
+            node: Only resources on this node
+            tag: Only guests carrying this tag
+            name: Only guests whose name matches this glob
+            ids: Only these VM/container IDs (or node names for scope 'nodes')
+            percentiles: Percentiles to compute (default: 50, 95)
+            sort_by: Column ranking the rows: 'avg', 'max' or 'p<N>' (default: highest percentile)
+            top: Number of rows returned
+            max_concurrency: Maximum concurrent rrddata requests
+            output_format: 'text' (formatted) or 'json' (compact); defaults to the configured format
+
+        Returns:
+            List of Content objects with one row per resource, ranked by sort_by
+
+        Raises:
+            ValueError: If an argument is invalid for the scope
+            RuntimeError: If the resource lookup fails
+        """
+        if scope not in RRD_SCOPES:
+            raise ValueError(f"Invalid scope '{scope}', expected one of: {', '.join(RRD_SCOPES)}")
+        if metric not in RRD_METRICS:
+            raise ValueError(f"Unknown metric '{metric}', "
+                             f"expected one of: {', '.join(RRD_METRICS)}")
+        field = RRD_METRICS[metric][1 if scope == "nodes" else 0]
+        if field is None:
+            raise ValueError(f"Metric '{metric}' is not available for {scope}")
+        if timeframe not in TIMEFRAMES:
+            raise ValueError(f"Invalid timeframe '{timeframe}', "
+                             f"expected one of: {', '.join(TIMEFRAMES)}")
+        if cf not in CONSOLIDATIONS:
+            raise ValueError(f"Invalid consolidation '{cf}', "
+                             f"expected one of: {', '.join(CONSOLIDATIONS)}")
+        percentiles = list(percentiles) if percentiles is not None else [50, 95]
+        if any(not 0 <= q <= 100 for q in percentiles):
+            raise ValueError("Percentiles must be between 0 and 100")
+        columns = ["avg"] + [f"p{q:g}" for q in percentiles] + ["max"]
+        sort_by = sort_by or (f"p{max(percentiles):g}" if percentiles else "max")
+        if sort_by not in columns:
+            raise ValueError(f"Invalid sort_by '{sort_by}', expected one of: {', '.join(columns)}")
+
+        try:
+            targets = self._select_targets(scope, node, tag, name, ids)
+        except Exception as e:
+            self._handle_error(f"select {scope} for RRD statistics", e)
+
+        params = {"timeframe": timeframe, "cf": cf}
+
+        def fetch(target: Dict[str, Any]) -> Any:
+            api = self.proxmox.nodes(target["node"])
+            if scope != "nodes":
+                api = getattr(api, target["type"])(target["vmid"])
+            return api.rrddata.get(**params)
+
+        responses, errors = self._fan_out(
+            {target["id"]: functools.partial(fetch, target) for target in targets},
+            max_workers=max_concurrency,
+        )
+        series = {key: extract(points, field) for key, points in responses.items()}
+        stats = aggregate(series, percentiles)
+        by_id = {target["id"]: target for target in targets}
+        ranked = sorted(stats.items(), key=lambda item: item[1][sort_by], reverse=True)[:top]
+
+        rows = [{
+            "id": key,
+            "name": by_id[key].get("name", by_id[key]["node"]),
+            "node": by_id[key]["node"],
+            **values
+        } for key, values in ranked]
+        summary = {"metric": metric, "scope": scope, "timeframe": timeframe, "cf": cf,
+                   "sort_by": sort_by, "total": len(targets), "failed": sorted(errors),
+                   "rows": rows}
+        if (output_format or self.output_format) == "json":
+            return self._format_response(summary, None, "json")
+
+        from ..formatting import ProxmoxComponents
+        table = ProxmoxComponents.create_table(
+            ["ID", "Name", "Node", "Samples"] + [column.upper() for column in columns],
+            [[row["id"], row["name"], row["node"], str(row["samples"])] +
+             [self._format_rrd_value(metric, row[column]) for column in columns] for row in rows],
+            title=f"{metric} ({timeframe}, {cf}): "
+                  f"top {len(rows)} of {len(targets)} {scope} by {sort_by}"
+        )
+        text = table
+        if errors:
+            text += f"\nFailed to fetch {len(errors)} series: {', '.join(sorted(map(str, errors)))}"
+        return [Content(type="text", text=text)]
+
+    def _select_targets(self, scope: str, node: Optional[str] = None, tag: Optional[str] = None,
+                        name: Optional[str] = None, ids: Optional[List[str]] = None,
+                        live: bool = False) -> List[Dict[str, Any]]:
+        """Resolve the resources of a scope with one cluster-wide request.
+
+        The metrics collector's fresh snapshot is used instead of a request
+        unless live is set. Each resource gets an 'id' of the form
+        'qemu/100' or 'node/pve1'.
+        """
+        metrics = None if live else self.metrics
+        if scope == "nodes":
+            resources = metrics.snapshot(("node",)) if metrics is not None else None
+            if resources is None:
+                resources = [dict(n, type="node") for n in self.proxmox.nodes.get()]
+            targets = [
+                dict(r, id=f"node/{r['node']}") for r in resources
+                if r.get("status", "online") == "online"
+                and (node is None or r["node"] == node)
+                and (not ids or r["node"] in ids)
+            ]
+            return sorted(targets, key=lambda r: r["node"])
+
+        types = RRD_SCOPES[scope]
+        resources = metrics.snapshot(types) if metrics is not None else None
+        if resources is None:
+            resources = [r for r in self.proxmox.cluster.resources.get(type="vm")
+                         if r.get("type", "qemu") in types]
+        wanted = {str(i) for i in ids or []}
+        targets = [
+            dict(r, id=f"{r.get('type', 'qemu')}/{r['vmid']}") for r in resources
+            if (node is None or r["node"] == node)
+            and (tag is None or tag in GuestTools._split_tags(r.get("tags")))
+            and (name is None or fnmatchcase(r.get("name", ""), name))
+            and (not wanted or str(r["vmid"]) in wanted)
+        ]
+        return sorted(targets, key=lambda r: int(r["vmid"]))
+
+    @run_in_thread
+    def get_top_guests(self, metric: str = "cpu", scope: str = "guests", node: Optional[str] = None,
+                       tag: Optional[str] = None, name: Optional[str] = None, top: int = 10,
+                       interval: Optional[float] = None, window: Optional[float] = None,
+                       output_format: Optional[str] = None) -> List[Content]:
+        """Rank guests by resource pressure and return only the top rows.
+
+        Scores every selected guest from the /cluster/resources view and
+        keeps the top entries with a heap (O(n log top)), so a cluster of
+        thousands of guests yields a table of a few lines.
+
+        - cpu: host cores in use (usage fraction times allocated cores)
+        - mem: percentage of allocated memory in use
+        - diskread, diskwrite, netin, netout: bytes per second
+
+        I/O metrics are cumulative counters in /cluster/resources. They are
+        turned into rates by sampling twice, interval seconds apart, or from
+        the metrics collector's history over the last window minutes.
+        Without either, guests are ranked by bytes transferred since they
+        started.
+
+        Args:
+            metric: One of TOP_METRICS
+            scope: 'vms', 'containers' or 'guests' (both)
+            node: Only guests on this node
+            tag: Only guests carrying this tag
+            name: Only guests whose name matches this glob
+            top: Number of guests returned
+            interval: Seconds between two live samples, up to MAX_SAMPLE_INTERVAL; I/O metrics
+                      only (mutually exclusive with window)
+            window: Minutes of collected history to average over
+
+        Returns:
+            List of Content objects with the ranked guests
+
+        Raises:
+            ValueError: If an argument is invalid, or window is used while metrics collection
+                        is disabled
+            RuntimeError: If the cluster-wide query fails
+        """
+        if metric not in TOP_METRICS:
+            raise ValueError(f"Unknown metric '{metric}', "
+                             f"expected one of: {', '.join(TOP_METRICS)}")
+        if scope not in RRD_SCOPES or scope == "nodes":
+            raise ValueError(f"Invalid scope '{scope}', expected one of: vms, containers, guests")
+        if interval is not None and window is not None:
+            raise ValueError("Use either interval or window, not both")
+        if top < 1:
+            raise ValueError("top must be at least 1")
+        if interval is not None and metric not in COUNTER_FIELDS:
+            raise ValueError(f"interval only applies to I/O metrics ({', '.join(COUNTER_FIELDS)}); "
+                             f"'{metric}' is ranked by its current value or, with window, "
+                             f"its average")
+        if interval is not None and not 0 < interval <= MAX_SAMPLE_INTERVAL:
+            raise ValueError(f"interval must be between 0 and {MAX_SAMPLE_INTERVAL} seconds")
+        if window is not None and window <= 0:
+            raise ValueError("window must be positive")
+        if window is not None and self.metrics is None:
+            raise ValueError("window requires metrics collection, "
+                             "enable it in the 'metrics' config section")
+
+        try:
+            if interval is not None:
+                with bypass_cache():
+                    sample = self._select_targets(scope, node, tag, name, live=True)
+                    first = {g["id"]: g for g in sample}
+                    started = time.monotonic()
+                    time.sleep(interval)
+                    guests = self._select_targets(scope, node, tag, name, live=True)
+                    elapsed = time.monotonic() - started
+            else:
+                guests = self._select_targets(scope, node, tag, name)
+        except Exception as e:
+            self._handle_error(f"get {scope} for ranking", e)
+
+        def score(guest: Dict[str, Any]) -> Optional[float]:
+            value: float
+            if window is not None and self.metrics is not None:
+                try:
+                    stats = self.metrics.trend(guest["id"], window * 60, (metric,))
+                except ValueError:
+                    return None
+                if metric not in stats:
+                    return None
+                value = stats[metric]["avg"]
+            elif interval is not None:
+                before = first.get(guest["id"], {}).get(metric)
+                after = guest.get(metric)
+                if before is None or after is None or after < before:
+                    return None
+                return float(after - before) / elapsed
+            else:
+                value = guest.get(metric, 0)
+            if metric == "cpu":
+                return value * float(guest.get("maxcpu", 1))
+            if metric == "mem":
+                return value / guest["maxmem"] * 100 if guest.get("maxmem") else None
+            return value
+
+        scored = [(value, guest) for guest in guests
+                  for value in (score(guest),) if value is not None]
+        ranked = heapq.nlargest(top, scored, key=lambda item: item[0])
+
+        if window is not None:
+            basis = f"average over {window:g} min"
+        elif interval is not None:
+            basis = f"rate over {elapsed:.1f}s"
+        elif metric in COUNTER_FIELDS:
+            basis = "total since start"
+        else:
+            basis = "current"
+        rows = [{"id": guest["id"], "name": guest.get("name", ""), "node": guest["node"],
+                 "status": guest.get("status", "unknown"), "value": value}
+                for value, guest in ranked]
+        if (output_format or self.output_format) == "json":
+            return self._format_response(
+                {"metric": metric, "basis": basis, "total": len(scored), "rows": rows}, None, "json"
+            )
+
+        from ..formatting import ProxmoxComponents, ProxmoxFormatters
+
+        def render(value: float) -> str:
+            if metric == "cpu":
+                return f"{value:.2f} cores"
+            if metric == "mem":
+                return f"{value:.1f}%"
+            if basis == "total since start":
+                return ProxmoxFormatters.format_bytes(int(value))
+            return f"{ProxmoxFormatters.format_bytes(int(value))}/s"
+
+        table = ProxmoxComponents.create_table(
+            ["ID", "Name", "Node", "Status", metric.upper()],
+            [[row["id"], row["name"], row["node"], row["status"].upper(), render(row["value"])]
+             for row in rows],
+            title=f"Top {len(rows)} of {len(scored)} {scope} by {metric} ({basis})"
+        )
+        return [Content(type="text", text=table)]
+
+    @staticmethod
+    def _format_rrd_value(metric: str, value: float) -> str:
+        """Render an aggregated RRD value in the metric's unit."""
+        from ..formatting import ProxmoxFormatters
+        if metric in ("cpu", "iowait"):
+            return f"{value * 100:.1f}%"
+        if metric == "loadavg":
+            return f"{value:.2f}"
+        if metric == "mem":
+            return ProxmoxFormatters.format_bytes(int(value))
+        return f"{ProxmoxFormatters.format_bytes(int(value))}/s"
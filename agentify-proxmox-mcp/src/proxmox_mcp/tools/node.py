@@ -5,17 +5,37 @@ This module provides tools for managing and monitoring Proxmox nodes:
 - Listing all nodes in the cluster with their status
 - Getting detailed node information including:
   * CPU usage and configuration
-  * Memory utilization
+  * Load average
+  * Memory, swap and root filesystem utilization
+  * KSM sharing
   * Uptime statistics
   * Health status
+- Comparing the headroom of all nodes in one table
 
 The tools handle both basic and detailed node information retrieval,
 with fallback mechanisms for partial data availability.
 """
-from typing import List
+from typing import Any, Dict, List, Optional
 from mcp.types import TextContent as Content
-from .base import ProxmoxTool
-from .definitions import GET_NODES_DESC, GET_NODE_STATUS_DESC
+from .base import ProxmoxTool, run_in_thread
+
+def _cores(node: Dict[str, Any]) -> float:
+    """Get a node summary's core count, 0 if unknown."""
+    return float(node["maxcpu"]) if isinstance(node["maxcpu"], (int, float)) else 0.0
+
+def _free(resource: Dict[str, Any]) -> float:
+    """Get the unused part of a {"used", "total"} pair."""
+    return float(resource.get("total", 0) - resource.get("used", 0))
+
+# compare_nodes ranking keys, ascending = most headroom first
+NODE_SORT_KEYS = {
+    "node": lambda n: n["node"],
+    "cpu": lambda n: -_cores(n) * (1 - n["cpu"]),
+    "load": lambda n: (n["loadavg"][0] / _cores(n) if n.get("loadavg") and _cores(n)
+                       else float("inf")),
+    "mem": lambda n: -_free(n["memory"]),
+    "disk": lambda n: -_free(n.get("disk", {})),
+}
 
 class NodeTools(ProxmoxTool):
     """Tools for managing Proxmox nodes.
@@ -23,6 +43,7 @@ class NodeTools(ProxmoxTool):
     Provides functionality for:
     - Retrieving cluster-wide node information
     - Getting detailed status for specific nodes
+    - Comparing resource headroom across nodes
     - Monitoring node health and resources
     - Handling node-specific API operations
     
@@ -30,17 +51,27 @@ class NodeTools(ProxmoxTool):
     node information might be temporarily unavailable.
     """
 
-    def get_nodes(self) -> List[Content]:
+    @run_in_thread
+    def get_nodes(self, output_format: Optional[str] = None) -> List[Content]:
         """List all nodes in the Proxmox cluster with detailed status.
 
         Retrieves comprehensive information for each node including:
         - Basic status (online/offline)
         - Uptime statistics
-        - CPU configuration and count
+        - CPU configuration, count and usage
+        - Load average
         - Memory usage and capacity
-        
-        Implements a fallback mechanism that returns basic information
-        if detailed status retrieval fails for any node.
+        - Root filesystem usage
+
+        Node status is collected with one concurrent sweep (see
+        _sweep_nodes). Implements a fallback mechanism that returns the
+        cluster listing's figures if detailed status retrieval fails or
+        times out for any node. While the metrics collector holds a fresh
+        snapshot, nodes are listed from it instead of /nodes; their status
+        still comes from the sweep.
+
+        Args:
+            output_format: 'text' (formatted) or 'json' (compact); defaults to the configured format
 
         Returns:
             List of Content objects containing formatted node information:
@@ -49,52 +80,168 @@ class NodeTools(ProxmoxTool):
                 "status": "online/offline",
                 "uptime": seconds,
                 "maxcpu": cpu_count,
-                "memory": {
-                    "used": bytes,
-                    "total": bytes
-                }
+                "cpu": usage_fraction,
+                "loadavg": [1min, 5min, 15min],
+                "memory": {"used": bytes, "total": bytes},
+                "swap": {"used": bytes, "total": bytes},
+                "disk": {"used": bytes, "total": bytes},
+                "ksm_shared": bytes
             }
 
         Raises:
             RuntimeError: If the cluster-wide node query fails
         """
+        # The collector's latest /cluster/resources sweep replaces the /nodes request
+        snapshot = self.metrics.snapshot(("node",)) if self.metrics is not None else None
         try:
-            result = self.proxmox.nodes.get()
-            nodes = []
-            
-            # Get detailed info for each node
-            for node in result:
-                node_name = node["node"]
-                try:
-                    # Get detailed status for each node
-                    status = self.proxmox.nodes(node_name).status.get()
-                    nodes.append({
-                        "node": node_name,
-                        "status": node["status"],
-                        "uptime": status.get("uptime", 0),
-                        "maxcpu": status.get("cpuinfo", {}).get("cpus", "N/A"),
-                        "memory": {
-                            "used": status.get("memory", {}).get("used", 0),
-                            "total": status.get("memory", {}).get("total", 0)
-                        }
-                    })
-                except Exception:
-                    # Fallback to basic info if detailed status fails
-                    nodes.append({
-                        "node": node_name,
-                        "status": node["status"],
-                        "uptime": 0,
-                        "maxcpu": "N/A",
-                        "memory": {
-                            "used": node.get("maxmem", 0) - node.get("mem", 0),
-                            "total": node.get("maxmem", 0)
-                        }
-                    })
-            return self._format_response(nodes, "nodes")
+            nodes = self._sweep_nodes(snapshot)
         except Exception as e:
             self._handle_error("get nodes", e)
+        return self._format_response(nodes, "nodes", output_format)
+
+    @run_in_thread
+    def compare_nodes(self, sort_by: str = "node",
+                      output_format: Optional[str] = None) -> List[Content]:
+        """Compare CPU, load, memory, swap and disk headroom of all nodes.
+
+        Uses the same single status sweep as get_nodes, so the comparison
+        costs one concurrent round of requests (or none, while the
+        responses are cached). Offline nodes are listed last.
+
+        Args:
+            sort_by: Column ranking the nodes, most headroom first:
+                     'node' (by name), 'cpu' (free cores), 'load' (1-minute load per core),
+                     'mem' (free memory) or 'disk' (free root filesystem)
+            output_format: 'text' (formatted) or 'json' (compact); defaults to the configured format
+
+        Returns:
+            List of Content objects with one table row (or JSON object) per node
+
+        Raises:
+            ValueError: If sort_by is unknown
+            RuntimeError: If the cluster-wide node query fails
+        """
+        if sort_by not in NODE_SORT_KEYS:
+            raise ValueError(f"Invalid sort_by '{sort_by}', "
+                             f"expected one of: {', '.join(NODE_SORT_KEYS)}")
+        try:
+            nodes = self._sweep_nodes()
+        except Exception as e:
+            self._handle_error("compare nodes", e)
+
+        online = [n for n in nodes if n["status"] == "online"]
+        offline = [n for n in nodes if n["status"] != "online"]
+        if sort_by != "node":
+            online.sort(key=NODE_SORT_KEYS[sort_by])
+        nodes = online + offline
+        if (output_format or self.output_format) == "json":
+            return self._format_response(nodes, None, "json")
+
+        from ..formatting import ProxmoxComponents, ProxmoxFormatters
+
+        def usage(resource: Dict[str, Any]) -> str:
+            if not resource.get("total"):
+                return "-"
+            return f"{resource['used'] / resource['total'] * 100:.0f}%"
+
+        def free(resource: Dict[str, Any]) -> str:
+            if not resource.get("total"):
+                return "-"
+            return ProxmoxFormatters.format_bytes(resource["total"] - resource["used"])
+
+        rows = []
+        for node in nodes:
+            if node["status"] != "online":
+                rows.append([node["node"], node["status"].upper()] + ["-"] * 8)
+                continue
+            cores = _cores(node)
+            load = node.get("loadavg")
+            rows.append([
+                node["node"],
+                node["status"].upper(),
+                f"{node['cpu'] * 100:.0f}% of {cores}" if cores else f"{node['cpu'] * 100:.0f}%",
+                f"{cores * (1 - node['cpu']):.1f}" if cores else "-",
+                "/".join(f"{value:.2f}" for value in load) if load else "-",
+                f"{usage(node['memory'])} ({free(node['memory'])} free)",
+                usage(node.get("swap", {})),
+                f"{usage(node.get('disk', {}))} ({free(node.get('disk', {}))} free)",
+                (ProxmoxFormatters.format_bytes(node["ksm_shared"])
+                 if node.get("ksm_shared") else "-"),
+                ProxmoxFormatters.format_uptime(node["uptime"]),
+            ])
+        table = ProxmoxComponents.create_table(
+            ["Node", "Status", "CPU", "Free Cores", "Load 1/5/15", "Memory", "Swap", "Root FS",
+             "KSM", "Uptime"],
+            rows,
+            title=f"Node comparison ({len(online)} of {len(nodes)} online, by {sort_by})"
+        )
+        return [Content(type="text", text=table)]
+
+    def _sweep_nodes(self, listing: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """Collect the summarized status of every node in one concurrent sweep.
+
+        Lists the nodes once (unless a listing is given), then requests
+        /nodes/{node}/status of all online nodes in parallel. The full
+        payloads pass through the response cache, so get_nodes,
+        compare_nodes and get_node_status share them for their TTL. Nodes
+        whose status request fails or times out are summarized from the
+        listing instead.
+
+        Args:
+            listing: Node entries to use instead of listing /nodes
+
+        Returns:
+            Node summaries (see _summarize_node), sorted by name
+        """
+        if listing is None:
+            listing = self.proxmox.nodes.get()
+        listing = sorted(listing, key=lambda n: n["node"])
+        statuses, _ = self._fan_out({
+            node["node"]: self.proxmox.nodes(node["node"]).status.get
+            for node in listing if node.get("status") == "online"
+        })
+        return [self._summarize_node(node, statuses.get(node["node"])) for node in listing]
+
+    @staticmethod
+    def _summarize_node(node: Dict[str, Any],
+                        status: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Reduce a node's listing entry and status payload to comparable figures.
+
+        Args:
+            node: Entry from /nodes or /cluster/resources (cpu, maxcpu, mem, maxmem, disk, maxdisk)
+            status: /nodes/{node}/status payload, if it was retrieved
+
+        Returns:
+            Summary with usage as {"used", "total"} pairs in bytes and cpu as a fraction
+        """
+        if status is None:
+            return {
+                "node": node["node"],
+                "status": node.get("status", "unknown"),
+                "uptime": node.get("uptime", 0),
+                "maxcpu": node.get("maxcpu", "N/A"),
+                "cpu": node.get("cpu", 0),
+                "memory": {"used": node.get("mem", 0), "total": node.get("maxmem", 0)},
+                "disk": {"used": node.get("disk", 0), "total": node.get("maxdisk", 0)},
+            }
+        memory = status.get("memory", {})
+        swap = status.get("swap", {})
+        rootfs = status.get("rootfs", {})
+        return {
+            "node": node["node"],
+            "status": node.get("status", "unknown"),
+            "uptime": status.get("uptime", 0),
+            "maxcpu": status.get("cpuinfo", {}).get("cpus", node.get("maxcpu", "N/A")),
+            "cpu": status.get("cpu", node.get("cpu", 0)),
+            "loadavg": [float(value) for value in status.get("loadavg", [])],
+            "memory": {"used": memory.get("used", 0), "total": memory.get("total", 0)},
+            "swap": {"used": swap.get("used", 0), "total": swap.get("total", 0)},
+            "disk": {"used": rootfs.get("used", 0), "total": rootfs.get("total", 0)},
+            "ksm_shared": status.get("ksm", {}).get("shared", 0),
+        }
 
-    def get_node_status(self, node: str) -> List[Content]:
+    @run_in_thread
+    def get_node_status(self, node: str, output_format: Optional[str] = None) -> List[Content]:
         """Get detailed status information for a specific node.
 
         Retrieves comprehensive status information including:
@@ -107,6 +254,7 @@ class NodeTools(ProxmoxTool):
 
         Args:
             node: Name/ID of node to query (e.g., 'pve1', 'proxmox-node2')
+            output_format: 'text' (formatted) or 'json' (compact); defaults to the configured format
 
         Returns:
             List of Content objects containing detailed node status:
@@ -130,6 +278,6 @@ class NodeTools(ProxmoxTool):
         """
         try:
             result = self.proxmox.nodes(node).status.get()
-            return self._format_response((node, result), "node_status")
+            return self._format_response((node, result), "node_status", output_format)
         except Exception as e:
             self._handle_error(f"get status for node {node}", e)
@@ -2,20 +2,31 @@
 Storage-related tools for Proxmox MCP.
 
 This module provides tools for managing and monitoring Proxmox storage:
-- Listing all storage pools across the cluster
+- Listing all storage pools across the cluster, with shared pools
+  reported once and local pools once per node
 - Retrieving detailed storage information including:
   * Storage type and content types
   * Usage statistics and capacity
   * Availability status
   * Node assignments
 
+Storage is collected from the cluster-wide resource view, so listing
+every pool on every node costs one API call instead of one per pool.
+ISO images, container templates and backups are searched through a
+TTL-bound index of all pools' content (see core.content).
+
 The tools implement fallback mechanisms for scenarios where
 detailed storage information might be temporarily unavailable.
 """
-from typing import List
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from mcp.types import TextContent as Content
-from .base import ProxmoxTool
-from .definitions import GET_STORAGE_DESC
+from .base import ProxmoxTool, run_in_thread
+from ..core.content import INDEXED_CONTENT, ContentIndex, search, volume_name
+
+if TYPE_CHECKING:
+    from proxmoxer import ProxmoxAPI
+
 
 class StorageTools(ProxmoxTool):
     """Tools for managing Proxmox storage.
@@ -26,24 +37,46 @@ class StorageTools(ProxmoxTool):
     - Tracking storage utilization and capacity
     - Managing storage content types
     
+    - Searching ISO images, templates and backups through the content index
+    
     Implements fallback mechanisms for scenarios where detailed
     storage information might be temporarily unavailable.
     """
 
-    def get_storage(self) -> List[Content]:
+    def __init__(self, proxmox_api: "ProxmoxAPI", content_index: Optional[ContentIndex] = None):
+        """Initialize storage tools.
+
+        Args:
+            proxmox_api: Initialized ProxmoxAPI instance
+            content_index: Content index shared with other tools (default: a private one)
+        """
+        super().__init__(proxmox_api)
+        self.content_index = content_index or ContentIndex()
+
+    @run_in_thread
+    def get_storage(self, output_format: Optional[str] = None) -> List[Content]:
         """List storage pools across the cluster with detailed status.
 
         Retrieves comprehensive information for each storage pool including:
         - Basic identification (name, type)
         - Content types supported (VM disks, backups, ISO images, etc.)
         - Availability status (online/offline)
+        - The nodes it is available on, and whether it is shared
         - Usage statistics:
           * Used space
           * Total capacity
           * Available space
-        
-        Implements a fallback mechanism that returns basic information
-        if detailed status retrieval fails for any storage pool.
+
+        Pools are collected from a single /cluster/resources?type=storage
+        request (or the metrics collector's fresh snapshot, without any
+        request), which reports every pool once per node. Shared pools are
+        merged into one entry listing all their nodes; local pools get one
+        entry per node. Per-node status is requested, concurrently, only for
+        entries the resource view reports without usage figures; if that
+        fails or times out, the entry is returned with zero usage.
+
+        Args:
+            output_format: 'text' (formatted) or 'json' (compact); defaults to the configured format
 
         Returns:
             List of Content objects containing formatted storage information:
@@ -52,6 +85,8 @@ class StorageTools(ProxmoxTool):
                 "type": "storage-type",
                 "content": ["content-types"],
                 "status": "online/offline",
+                "shared": true/false,
+                "nodes": ["node-name", ...],
                 "used": bytes,
                 "total": bytes,
                 "available": bytes
@@ -61,34 +96,203 @@ class StorageTools(ProxmoxTool):
             RuntimeError: If the cluster-wide storage query fails
         """
         try:
-            result = self.proxmox.storage.get()
-            storage = []
-            
-            for store in result:
-                # Get detailed storage info including usage
-                try:
-                    status = self.proxmox.nodes(store.get("node", "localhost")).storage(store["storage"]).status.get()
-                    storage.append({
-                        "storage": store["storage"],
-                        "type": store["type"],
-                        "content": store.get("content", []),
-                        "status": "online" if store.get("enabled", True) else "offline",
-                        "used": status.get("used", 0),
-                        "total": status.get("total", 0),
-                        "available": status.get("avail", 0)
-                    })
-                except Exception:
-                    # If detailed status fails, add basic info
-                    storage.append({
-                        "storage": store["storage"],
-                        "type": store["type"],
-                        "content": store.get("content", []),
-                        "status": "online" if store.get("enabled", True) else "offline",
-                        "used": 0,
-                        "total": 0,
-                        "available": 0
-                    })
-                    
-            return self._format_response(storage, "storage")
+            resources = self._storage_resources()
+
+            # Usage of entries the resource view couldn't report, for all of them concurrently
+            missing = [r for r in resources
+                       if "maxdisk" not in r and r.get("status") == "available"]
+            statuses, _ = self._fan_out({
+                (r["node"], r["storage"]):
+                    self.proxmox.nodes(r["node"]).storage(r["storage"]).status.get
+                for r in missing
+            })
         except Exception as e:
             self._handle_error("get storage", e)
+
+        pools: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+        for resource in resources:
+            shared = bool(resource.get("shared"))
+            key = (resource["storage"], None if shared else resource["node"])
+            status = statuses.get((resource["node"], resource["storage"]))
+            if status is not None:
+                used, total = status.get("used", 0), status.get("total", 0)
+            else:
+                used, total = resource.get("disk", 0), resource.get("maxdisk", 0)
+            online = resource.get("status") == "available"
+
+            pool = pools.get(key)
+            if pool is None:
+                pools[key] = {
+                    "storage": resource["storage"],
+                    "type": resource.get("plugintype", "unknown"),
+                    "content": [c for c in resource.get("content", "").split(",") if c],
+                    "status": "online" if online else "offline",
+                    "shared": shared,
+                    "nodes": [resource["node"]],
+                    "used": used,
+                    "total": total,
+                    "available": total - used
+                }
+                continue
+
+            # Another node's view of a shared pool: same capacity, reported once
+            pool["nodes"].append(resource["node"])
+            if online:
+                pool["status"] = "online"
+            if total > pool["total"]:
+                pool.update(used=used, total=total, available=total - used)
+
+        return self._format_response(list(pools.values()), "storage", output_format)
+
+    @run_in_thread
+    def find_storage_content(self, content: Optional[str] = None, name: Optional[str] = None,
+                             vmid: Optional[int] = None, storage: Optional[str] = None,
+                             node: Optional[str] = None, min_size_mb: Optional[float] = None,
+                             max_size_mb: Optional[float] = None,
+                             newer_than_days: Optional[float] = None,
+                             older_than_days: Optional[float] = None, sort_by: str = "ctime",
+                             limit: int = 50, refresh: bool = False,
+                             output_format: Optional[str] = None) -> List[Content]:
+        """Search ISO images, container templates and backups across all storage.
+
+        Lookups are answered from the content index. When it is older than
+        its TTL (or refresh is set), every pool holding indexed content is
+        listed concurrently, shared pools only once, and the index is
+        rebuilt. Finding the latest backup of a guest across all storage is
+        then a memory lookup: content='backup', vmid=123, limit=1.
+
+        Args:
+            content: Only 'iso', 'vztmpl' or 'backup' volumes
+            name: Only volumes whose file name matches this glob (case-insensitive, e.g. '*ubuntu*')
+            vmid: Only backups of this guest
+            storage: Only volumes on this storage
+            node: Only volumes reachable from this node
+            min_size_mb: Smallest size in MB
+            max_size_mb: Largest size in MB
+            newer_than_days: Only volumes created within this many days
+            older_than_days: Only volumes created more than this many days ago
+            sort_by: 'ctime' (newest first), 'size' (largest first) or 'name'
+            limit: Maximum number of volumes returned
+            refresh: Rebuild the index even if it is fresh
+            output_format: 'text' (formatted) or 'json' (compact); defaults to the configured format
+
+        Returns:
+            List of Content objects with the matching volumes. JSON output
+            wraps them as {"volumes": [...], "total": matching,
+            "indexed_at": epoch, "failed": [unlisted pools]}.
+
+        Raises:
+            ValueError: If content or sort_by is invalid
+            RuntimeError: If the storage lookup fails
+        """
+        if content is not None and content not in INDEXED_CONTENT:
+            raise ValueError(f"Invalid content '{content}', "
+                             f"expected one of: {', '.join(INDEXED_CONTENT)}")
+        now = time.time()
+        mb = 1024 * 1024
+
+        volumes = None if refresh else self.content_index.volumes()
+        if volumes is None:
+            try:
+                volumes = self._index_content()
+            except Exception as e:
+                self._handle_error("index storage content", e)
+
+        matches = search(
+            volumes, content=content, name=name, vmid=vmid, storage=storage, node=node,
+            min_size=int(min_size_mb * mb) if min_size_mb is not None else None,
+            max_size=int(max_size_mb * mb) if max_size_mb is not None else None,
+            since=now - newer_than_days * 86400 if newer_than_days is not None else None,
+            until=now - older_than_days * 86400 if older_than_days is not None else None,
+            sort_by=sort_by,
+        )
+        page = matches[:limit]
+        failed = self.content_index.failed
+        if (output_format or self.output_format) == "json":
+            return self._format_response({"volumes": page, "total": len(matches),
+                                          "indexed_at": self.content_index.built_at,
+                                          "failed": failed},
+                                         None, "json")
+
+        from ..formatting import ProxmoxComponents, ProxmoxFormatters
+        table = ProxmoxComponents.create_table(
+            ["Volume", "Type", "Size", "Created", "Nodes"],
+            [[
+                volume["volid"],
+                volume["content"],
+                ProxmoxFormatters.format_bytes(volume["size"]),
+                (time.strftime("%Y-%m-%d %H:%M", time.localtime(volume["ctime"]))
+                 if volume["ctime"] else "-"),
+                ", ".join(volume["nodes"]),
+            ] for volume in page],
+            title=f"Storage content: {len(page)} of {len(matches)} matching volumes"
+        )
+        age = now - (self.content_index.built_at or now)
+        text = f"{table}\nIndexed {age:.0f}s ago, pass refresh=true to re-scan."
+        if failed:
+            text += f"\nCould not list: {', '.join(failed)}"
+        return [Content(type="text", text=text)]
+
+    def _storage_resources(self) -> List[Dict[str, Any]]:
+        """Get the cluster-wide storage resource view, one entry per pool and node.
+
+        Uses the metrics collector's fresh snapshot when available,
+        otherwise one /cluster/resources?type=storage request.
+        """
+        resources = self.metrics.snapshot(("storage",)) if self.metrics is not None else None
+        if resources is None:
+            resources = self.proxmox.cluster.resources.get(type="storage")
+        return sorted((r for r in resources if r.get("type", "storage") == "storage"),
+                      key=lambda r: (r["storage"], r["node"]))
+
+    def _index_content(self) -> List[Dict[str, Any]]:
+        """Crawl all content-bearing pools and rebuild the content index.
+
+        Pools are taken from the storage resource view. A shared pool is
+        listed through one of its available nodes, a local pool through
+        each node that has it. All listings run concurrently.
+
+        Returns:
+            The new catalog
+        """
+        pools: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+        for resource in self._storage_resources():
+            kinds = set(resource.get("content", "").split(","))
+            if resource.get("status") != "available" or not kinds.intersection(INDEXED_CONTENT):
+                continue
+            shared = bool(resource.get("shared"))
+            key = (resource["storage"], None if shared else resource["node"])
+            if key in pools:
+                pools[key]["nodes"].append(resource["node"])
+            else:
+                pools[key] = {"storage": resource["storage"], "node": resource["node"],
+                              "shared": shared, "nodes": [resource["node"]]}
+
+        listings, errors = self._fan_out({
+            key: self.proxmox.nodes(pool["node"]).storage(pool["storage"]).content.get
+            for key, pool in pools.items()
+        })
+
+        volumes = []
+        for key, items in listings.items():
+            pool = pools[key]
+            for item in items:
+                if item.get("content") not in INDEXED_CONTENT:
+                    continue
+                vmid = item.get("vmid")
+                volumes.append({
+                    "volid": item["volid"],
+                    "name": volume_name(item["volid"]),
+                    "content": item["content"],
+                    "format": item.get("format"),
+                    "size": item.get("size", 0),
+                    "ctime": item.get("ctime", 0),
+                    "vmid": int(vmid) if vmid is not None else None,
+                    "notes": item.get("notes"),
+                    "storage": pool["storage"],
+                    "shared": pool["shared"],
+                    "nodes": pool["nodes"],
+                })
+        failed = [f"{pools[key]['node']}/{pools[key]['storage']}" for key in errors]
+        self.content_index.replace(volumes, failed)
+        return volumes
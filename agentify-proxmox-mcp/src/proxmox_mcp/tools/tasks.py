@@ -0,0 +1,109 @@
+"""
+Task-related tools for Proxmox MCP.
+
+This module provides tools for following asynchronous Proxmox tasks:
+- Waiting for tasks started by VM creation, deletion and power operations
+- Listing tracked tasks with their current status
+
+Both tools go through the shared TaskTracker, which polls running tasks
+with one request per node no matter how many tasks are being awaited.
+"""
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from mcp.types import TextContent as Content
+from .base import ProxmoxTool, run_in_thread
+from ..core.tasks import TaskTracker
+
+if TYPE_CHECKING:
+    from proxmoxer import ProxmoxAPI
+
+
+class TaskTools(ProxmoxTool):
+    """Tools for following Proxmox tasks.
+
+    Provides functionality for:
+    - Awaiting completion of one or more tasks
+    - Listing tasks started through this server
+
+    Task state comes from the tracker shared with the VM tools, so
+    concurrent waiters share the same batched polling.
+    """
+
+    def __init__(self, proxmox_api: "ProxmoxAPI", task_tracker: Optional[TaskTracker] = None):
+        """Initialize task tools.
+
+        Args:
+            proxmox_api: Initialized ProxmoxAPI instance
+            task_tracker: Shared task tracker; a private one is created if omitted
+        """
+        super().__init__(proxmox_api)
+        self.tasks = task_tracker or TaskTracker(proxmox_api)
+
+    @run_in_thread
+    def wait_task(self, upids: List[str], timeout: float = 300) -> List[Content]:
+        """Wait for tasks to finish.
+
+        Args:
+            upids: Task IDs returned by mutating tools
+            timeout: Seconds to wait before returning
+
+        Returns:
+            List of Content objects containing a per-task status table and
+            a summary line
+
+        Raises:
+            ValueError: If no task ID is given or a task ID is invalid
+            RuntimeError: If waiting fails
+        """
+        if not upids:
+            raise ValueError("Specify at least one task ID to wait for")
+        try:
+            states = self.tasks.wait(upids, timeout)
+        except ValueError:
+            raise
+        except Exception as e:
+            self._handle_error("wait for tasks", e)
+
+        tasks = list(states.values())
+        finished = sum(1 for task in tasks if task["status"] == "stopped")
+        ok = sum(1 for task in tasks if task["exitstatus"] == "OK")
+        summary = f"Summary: {finished}/{len(tasks)} tasks finished, {ok} OK"
+        return [Content(type="text", text=f"{self._format_tasks(tasks, 'Tasks')}\n{summary}")]
+
+    @run_in_thread
+    def list_tasks(self, running_only: bool = False) -> List[Content]:
+        """List tasks started through this server.
+
+        Running tasks are refreshed before listing.
+
+        Args:
+            running_only: Only include tasks that haven't finished
+
+        Returns:
+            List of Content objects containing a task table, newest first
+
+        Raises:
+            RuntimeError: If refreshing task status fails
+        """
+        try:
+            tasks = self.tasks.list_tasks(running_only)
+        except Exception as e:
+            self._handle_error("list tasks", e)
+
+        if not tasks:
+            return [Content(type="text", text="No tracked tasks")]
+        text = self._format_tasks(tasks, f"Tracked tasks: {len(tasks)}")
+        return [Content(type="text", text=text)]
+
+    @staticmethod
+    def _format_tasks(tasks: List[Dict[str, Any]], title: str) -> str:
+        """Format task states as a table."""
+        from ..formatting import ProxmoxComponents
+        rows = []
+        for task in tasks:
+            end = task["endtime"] or time.time()
+            status = task["exitstatus"] if task["status"] == "stopped" else task["status"]
+            rows.append([task["description"], task["node"], status,
+                         f"{max(0, end - task['starttime']):.0f}s", task["upid"]])
+        return ProxmoxComponents.create_table(["Task", "Node", "Status", "Time", "UPID"], rows,
+                                              title=title)
@@ -2,26 +2,55 @@
 VM-related tools for Proxmox MCP.
 
 This module provides tools for managing and interacting with Proxmox VMs:
-- Listing all VMs across the cluster with their status
+- Listing all VMs across the cluster with their status, with filtering,
+  field projection and cursor pagination
 - Retrieving detailed VM information including:
   * Resource allocation (CPU, memory)
   * Runtime status
   * Node placement
 - Executing commands within VMs via QEMU guest agent
+- Running one command across many VMs concurrently
+- Streaming output of long-running commands
 - Handling VM console operations
 - VM power management (start, stop, shutdown, reset)
-- VM creation with customizable specifications
+- Bulk power operations with optional wait-for-completion
+- Registering started tasks with the shared task tracker
+- VM creation with customizable specifications and capacity-aware
+  node/storage placement
+- Batch provisioning (create or clone) with per-node concurrency limits
 
 The tools implement fallback mechanisms for scenarios where
 detailed VM information might be temporarily unavailable.
 """
-from typing import List, Optional
+import asyncio
+import threading
+import time
+from functools import cached_property, partial
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from mcp.types import TextContent as Content
-from .base import ProxmoxTool
-from .definitions import GET_VMS_DESC, EXECUTE_VM_COMMAND_DESC
-from .console.manager import VMConsoleManager
+from .base import run_in_thread
+from .guests import GuestTools
+from ..core.placement import candidates, commit
+from .definitions import (
+    GET_VMS_DESC, EXECUTE_VM_COMMAND_DESC, DEFAULT_GUEST_PAGE_SIZE, MAX_BATCH_SIZE, VM_LIMITS
+)
 
-class VMTools(ProxmoxTool):
+if TYPE_CHECKING:
+    from .console.manager import VMConsoleManager
+
+# Power actions supported by bulk_power, mapped to the VM status that makes them a no-op
+VM_POWER_ACTIONS = {
+    "start": ("running", "already running"),
+    "stop": ("stopped", "already stopped"),
+    "shutdown": ("stopped", "already stopped"),
+    "reset": ("stopped", "stopped, start it first"),
+}
+
+# Keys of a create_vms_batch spec
+BATCH_SPEC_KEYS = ("name", "cpus", "memory", "disk_size", "node", "storage", "ostype", "template",
+                   "vmid")
+
+class VMTools(GuestTools):
     """Tools for managing Proxmox VMs.
     
     Provides functionality for:
@@ -31,23 +60,32 @@ class VMTools(ProxmoxTool):
     - Managing VM console operations
     - VM power management (start, stop, shutdown, reset)
     - VM creation with customizable specifications
+    - Batch VM provisioning
     
     Implements fallback mechanisms for scenarios where detailed
     VM information might be temporarily unavailable. Integrates
     with QEMU guest agent for VM command execution.
     """
 
-    def __init__(self, proxmox_api):
-        """Initialize VM tools.
+    guest_type = "qemu"
+    guest_label = "VM"
+    resource_type = "vms"
+    power_actions = VM_POWER_ACTIONS
 
-        Args:
-            proxmox_api: Initialized ProxmoxAPI instance
-        """
-        super().__init__(proxmox_api)
-        self.console_manager = VMConsoleManager(proxmox_api)
+    @cached_property
+    def console_manager(self) -> "VMConsoleManager":
+        """Guest agent command runner, created on first command execution."""
+        from .console.manager import VMConsoleManager
+        return VMConsoleManager(self.proxmox)
 
-    def get_vms(self) -> List[Content]:
-        """List all virtual machines across the cluster with detailed status.
+    @run_in_thread
+    def get_vms(self, include_config: bool = False, output_format: Optional[str] = None,
+                node: Optional[str] = None, status: Optional[str] = None,
+                name: Optional[str] = None, tag: Optional[str] = None,
+                vmid_min: Optional[int] = None, vmid_max: Optional[int] = None,
+                fields: Optional[List[str]] = None, limit: int = DEFAULT_GUEST_PAGE_SIZE,
+                cursor: Optional[str] = None) -> List[Content]:
+        """List virtual machines across the cluster with detailed status.
 
         Retrieves comprehensive information for each VM including:
         - Basic identification (ID, name)
@@ -56,9 +94,32 @@ class VMTools(ProxmoxTool):
           * CPU cores
           * Memory allocation and usage
         - Node placement
-        
-        Implements a fallback mechanism that returns basic information
-        if detailed configuration retrieval fails for any VM.
+
+        All guests are collected with a single /cluster/resources sweep
+        instead of walking every node. Filters are applied to that sweep,
+        and only one page of matching VMs (ordered by VM ID) is formatted,
+        so responses stay bounded on large clusters. The returned cursor
+        continues after the last VM of the page.
+
+        Per-VM configuration is only fetched when include_config is set,
+        and only for VMs on the current page, for fields the resource view
+        lacks (core count as configured rather than total vCPUs). Those
+        fetches run concurrently; if one fails or times out, the VM keeps
+        the values from the resource view.
+
+        Args:
+            include_config: Also fetch each VM's config for configured cores
+            output_format: 'text' (formatted) or 'json' (compact); defaults to the configured format
+            node: Only VMs on this node
+            status: Only VMs in this state (e.g. 'running', 'stopped')
+            name: Only VMs whose name matches this glob (e.g. 'web-*')
+            tag: Only VMs carrying this tag
+            vmid_min: Lowest VM ID to include
+            vmid_max: Highest VM ID to include
+            fields: Fields to return (default: vmid, name, status, node, cpus, memory);
+                    see GUEST_FIELDS for all available fields
+            limit: Maximum number of VMs per page
+            cursor: Cursor returned by the previous page
 
         Returns:
             List of Content objects containing formatted VM information:
@@ -73,159 +134,72 @@ class VMTools(ProxmoxTool):
                     "total": bytes
                 }
             }
+            JSON output wraps the page as {"vms": [...], "total": matching,
+            "next_cursor": cursor or null}.
 
         Raises:
+            ValueError: If a field, the cursor or the limit is invalid
             RuntimeError: If the cluster-wide VM query fails
         """
-        try:
-            result = []
-            for node in self.proxmox.nodes.get():
-                node_name = node["node"]
-                vms = self.proxmox.nodes(node_name).qemu.get()
-                for vm in vms:
-                    vmid = vm["vmid"]
-                    # Get VM config for CPU cores
-                    try:
-                        config = self.proxmox.nodes(node_name).qemu(vmid).config.get()
-                        result.append({
-                            "vmid": vmid,
-                            "name": vm["name"],
-                            "status": vm["status"],
-                            "node": node_name,
-                            "cpus": config.get("cores", "N/A"),
-                            "memory": {
-                                "used": vm.get("mem", 0),
-                                "total": vm.get("maxmem", 0)
-                            }
-                        })
-                    except Exception:
-                        # Fallback if can't get config
-                        result.append({
-                            "vmid": vmid,
-                            "name": vm["name"],
-                            "status": vm["status"],
-                            "node": node_name,
-                            "cpus": "N/A",
-                            "memory": {
-                                "used": vm.get("mem", 0),
-                                "total": vm.get("maxmem", 0)
-                            }
-                        })
-            return self._format_response(result, "vms")
-        except Exception as e:
-            self._handle_error("get VMs", e)
+        return self._list_guests(include_config, output_format, node, status, name, tag,
+                                 vmid_min, vmid_max, fields, limit, cursor)
 
-    def create_vm(self, node: str, vmid: str, name: str, cpus: int, memory: int, 
+    @run_in_thread
+    def create_vm(self, node: Optional[str], vmid: Optional[str], name: str, cpus: int, memory: int,
                   disk_size: int, storage: Optional[str] = None, ostype: Optional[str] = None) -> List[Content]:
         """Create a new virtual machine with specified configuration.
+
+        When node or storage is omitted, the VM is placed on the best
+        (node, storage) pair by memory, CPU and disk headroom (see
+        core.placement). Candidates are scored from one /cluster/resources
+        snapshot (the metrics collector's, or the cached API response), so
+        placement costs no per-node requests.
+
+        When vmid is omitted, the next free ID is allocated cluster-wide.
+        A given vmid is checked against the whole cluster. Either way the ID
+        stays reserved in this process, so concurrent creates never collide.
         
         Args:
-            node: Host node name (e.g., 'pve')
-            vmid: New VM ID number (e.g., '200')
+            node: Host node name (e.g., 'pve'). If None, will auto-place
+            vmid: New VM ID number (e.g., '200'). If None, the next free ID is used
             name: VM name (e.g., 'my-new-vm')
             cpus: Number of CPU cores (e.g., 1, 2, 4)
             memory: Memory size in MB (e.g., 2048 for 2GB)
             disk_size: Disk size in GB (e.g., 10, 20, 50)
-            storage: Storage name (e.g., 'local-lvm', 'vm-storage'). If None, will auto-detect
+            storage: Storage name (e.g., 'local-lvm', 'vm-storage'). If None, will auto-place
             ostype: OS type (e.g., 'l26' for Linux, 'win10' for Windows). Default: 'l26'
             
         Returns:
             List of Content objects containing creation result
             
         Raises:
-            ValueError: If VM ID already exists or invalid parameters
+            ValueError: If the VM ID is taken, no node or storage can host the VM, or invalid
+                        parameters
             RuntimeError: If VM creation fails
         """
         try:
-            # Check if VM ID already exists
-            try:
-                existing_vm = self.proxmox.nodes(node).qemu(vmid).config.get()
-                raise ValueError(f"VM {vmid} already exists on node {node}")
-            except Exception as e:
-                if "does not exist" not in str(e).lower():
-                    raise e
-            
-            # Get storage information
-            storage_list = self.proxmox.nodes(node).storage.get()
-            storage_info = {}
-            for s in storage_list:
-                storage_info[s["storage"]] = s
-            
-            # Auto-detect storage if not specified
-            if storage is None:
-                # Prefer local-lvm for VM images first
-                for s in storage_list:
-                    if s["storage"] == "local-lvm" and "images" in s.get("content", ""):
-                        storage = s["storage"]
-                        break
-                if storage is None:
-                    # Then try vm-storage 
-                    for s in storage_list:
-                        if s["storage"] == "vm-storage" and "images" in s.get("content", ""):
-                            storage = s["storage"]
-                            break
-                if storage is None:
-                    # Fallback to any storage that supports images
-                    for s in storage_list:
-                        if "images" in s.get("content", ""):
-                            storage = s["storage"]
-                            break
-                    if storage is None:
-                        raise ValueError("No suitable storage found for VM images")
-            
-            # Validate storage exists and supports images
-            if storage not in storage_info:
-                raise ValueError(f"Storage '{storage}' not found on node {node}")
-            
-            if "images" not in storage_info[storage].get("content", ""):
-                raise ValueError(f"Storage '{storage}' does not support VM images")
-            
-            # Determine appropriate disk format based on storage type
-            storage_type = storage_info[storage]["type"]
-            
-            if storage_type in ["lvm", "lvmthin"]:
-                # LVM storages use raw format and no cloudinit
-                disk_format = "raw"
-                vm_config_storage = {
-                    "scsi0": f"{storage}:{disk_size},format={disk_format}",
-                }
-            elif storage_type in ["dir", "nfs", "cifs"]:
-                # File-based storages can use qcow2
-                disk_format = "qcow2"
-                vm_config_storage = {
-                    "scsi0": f"{storage}:{disk_size},format={disk_format}",
-                    "ide2": f"{storage}:cloudinit",
-                }
-            else:
-                # Default to raw for unknown storage types
-                disk_format = "raw"
-                vm_config_storage = {
-                    "scsi0": f"{storage}:{disk_size},format={disk_format}",
-                }
-            
-            # Set default OS type
-            if ostype is None:
-                ostype = "l26"  # Linux 2.6+ kernel
-            
-            # Prepare VM configuration
-            vm_config = {
-                "vmid": vmid,
-                "name": name,
-                "cores": cpus,
-                "memory": memory,
-                "ostype": ostype,
-                "scsihw": "virtio-scsi-pci",
-                "boot": "order=scsi0",
-                "agent": "1",  # Enable QEMU guest agent
-                "vga": "std",
-                "net0": "virtio,bridge=vmbr0",
-            }
-            
-            # Add storage configuration
-            vm_config.update(vm_config_storage)
+            placement = self._place(memory, disk_size, cpus, node, storage)
+            node, storage = placement["node"], placement["storage"]
+            storage_type = placement["storage_type"]
+
+            # Reserve the VM ID cluster-wide, so parallel creates can't take it too
+            vmid = str(self.vmids.reserve(vmid) if vmid is not None else self.vmids.allocate()[0])
+        except ValueError as e:
+            raise e
+        except Exception as e:
+            self._handle_error("place VM", e)
+
+        try:
+            vm_config, disk_format = self._vm_config(vmid, name, cpus, memory, disk_size, storage,
+                                                     storage_type, ostype)
             
             # Create the VM
-            task_result = self.proxmox.nodes(node).qemu.create(**vm_config)
+            try:
+                task_result = self.proxmox.nodes(node).qemu.create(**vm_config)
+            except Exception:
+                self.vmids.release(vmid)
+                raise
+            self._register_task(task_result, f"create VM {vmid}")
             
             cloudinit_note = ""
             if storage_type in ["lvm", "lvmthin"]:
@@ -241,14 +215,15 @@ class VMTools(ProxmoxTool):
   • Memory: {memory} MB ({memory/1024:.1f} GB)
   • Disk: {disk_size} GB ({storage}, {disk_format} format)
   • Storage Type: {storage_type}
-  • OS Type: {ostype}
+  • Placement: {placement["reason"]}
+  • OS Type: {vm_config["ostype"]}
   • Network: virtio (bridge=vmbr0)
   • QEMU Agent: Enabled{cloudinit_note}
 
 🔧 Task ID: {task_result}
 
 💡 Next steps:
-  1. Upload an ISO to install the operating system
+  1. Attach an installer ISO (find_storage_content with content='iso' lists the available ones)
   2. Start the VM using start_vm tool
   3. Access the console to complete OS installation"""
             
@@ -259,6 +234,334 @@ class VMTools(ProxmoxTool):
         except Exception as e:
             self._handle_error(f"create VM {vmid}", e)
 
+    @run_in_thread
+    def create_vms_batch(self, specs: Optional[List[Dict[str, Any]]] = None,
+                         count: Optional[int] = None, name_pattern: str = "vm-{n}",
+                         start_index: int = 1, cpus: int = 1, memory: int = 2048,
+                         disk_size: int = 10, node: Optional[str] = None,
+                         storage: Optional[str] = None, ostype: Optional[str] = None,
+                         template: Optional[int] = None, max_per_node: int = 2,
+                         wait: bool = True, timeout: float = 1800) -> List[Content]:
+        """Create or clone many VMs in one call.
+
+        VMs come from a list of specs, or from count and name_pattern.
+        Arguments given to the tool are defaults that each spec can
+        override. The whole batch is planned from one /cluster/resources
+        snapshot: VMs are placed one after another, each accounting for the
+        memory and disk of the ones before it, so the batch spreads across
+        nodes and storages. VM IDs are allocated in bulk. Creates (or clones
+        of a template) are then issued with at most max_per_node tasks in
+        flight per node: with wait, a node's next VM starts as soon as one of
+        its tasks finishes. All tasks are tracked and awaited through the
+        task tracker's batched polling.
+
+        Args:
+            specs: VM specs with keys name (required), cpus, memory, disk_size, node,
+                   storage, ostype, template and vmid
+            count: Number of VMs to create when no specs are given
+            name_pattern: Name of the n-th VM in count mode, with '{n}' replaced by its number
+                          (format specs allowed, e.g. 'lab-{n:02d}')
+            start_index: First number in count mode
+            cpus: Default number of CPU cores
+            memory: Default memory size in MB
+            disk_size: Default disk size in GB
+            node: Default host node (default: auto-placed)
+            storage: Default storage (default: auto-placed)
+            ostype: Default OS type (default: 'l26')
+            template: Default template VM ID to full-clone instead of creating empty VMs;
+                      clones keep the template's hardware and go to its node unless a node is given
+            max_per_node: Maximum concurrent create/clone tasks per node
+            wait: Wait for all tasks to finish
+            timeout: Seconds the whole batch may take when wait is enabled
+
+        Returns:
+            List of Content objects containing a per-VM summary table
+
+        Raises:
+            ValueError: If the specs are invalid, or a VM can't be placed or given its VM ID
+            RuntimeError: If the cluster lookup or VM ID allocation fails
+        """
+        specs = self._expand_batch_specs(specs, count, name_pattern, start_index, {
+            "cpus": cpus, "memory": memory, "disk_size": disk_size, "node": node,
+            "storage": storage, "ostype": ostype, "template": template,
+        })
+        if max_per_node < 1:
+            raise ValueError("max_per_node must be at least 1")
+
+        reserved: List[str] = []
+        try:
+            resources = self._placement_resources()
+            templates = {int(r["vmid"]): r for r in resources
+                         if r.get("type") == "qemu" and r.get("template")}
+
+            # Place every VM in the same snapshot, accounting for the ones placed before it
+            plans = []
+            for spec in specs:
+                plan = dict(spec)
+                if spec["template"] is not None:
+                    source_vm = templates.get(int(spec["template"]))
+                    if source_vm is None:
+                        raise ValueError(f"Template {spec['template']} not found")
+                    plan.update(source_node=source_vm["node"],
+                                node=spec["node"] or source_vm["node"],
+                                memory=source_vm.get("maxmem", 0) // 1024 ** 2,
+                                disk_size=source_vm.get("maxdisk", 0) // 1024 ** 3,
+                                cpus=source_vm.get("maxcpu", 1))
+                placement = self._place(plan["memory"], plan["disk_size"], plan["cpus"],
+                                        plan["node"], plan["storage"], resources)
+                commit(resources, placement, plan["memory"] * 1024 ** 2,
+                       plan["disk_size"] * 1024 ** 3)
+                plan.update(node=placement["node"], storage=placement["storage"],
+                            storage_type=placement["storage_type"])
+                plan.setdefault("source_node", plan["node"])
+                plans.append(plan)
+
+            # Reserve chosen IDs, then allocate the rest in one go
+            for plan in plans:
+                if plan["vmid"] is not None:
+                    plan["vmid"] = str(self.vmids.reserve(plan["vmid"]))
+                    reserved.append(plan["vmid"])
+            missing = [plan for plan in plans if plan["vmid"] is None]
+            if missing:
+                for plan, new_id in zip(missing, self.vmids.allocate(len(missing))):
+                    plan["vmid"] = str(new_id)
+                    reserved.append(plan["vmid"])
+        except Exception as e:
+            for vmid in reserved:
+                self.vmids.release(vmid)
+            if isinstance(e, ValueError):
+                raise
+            self._handle_error("plan VM batch", e)
+
+        # Limit tasks per node that runs them: clones run on the template's node
+        slots = {plan["source_node"]: threading.Semaphore(max_per_node) for plan in plans}
+        started = time.monotonic()
+        deadline = started + timeout
+
+        def provision(plan: Dict[str, Any]) -> Dict[str, Any]:
+            vmid = plan["vmid"]
+            with slots[plan["source_node"]]:
+                try:
+                    if plan["template"] is not None:
+                        source = self.proxmox.nodes(plan["source_node"]).qemu(plan["template"])
+                        upid = source.clone.post(newid=vmid, name=plan["name"], target=plan["node"],
+                                                 storage=plan["storage"], full=1)
+                        description = f"clone VM {plan['template']} to {vmid}"
+                    else:
+                        config, _ = self._vm_config(vmid, plan["name"], plan["cpus"],
+                                                    plan["memory"], plan["disk_size"],
+                                                    plan["storage"], plan["storage_type"],
+                                                    plan["ostype"])
+                        upid = self.proxmox.nodes(plan["node"]).qemu.create(**config)
+                        description = f"create VM {vmid}"
+                except Exception:
+                    self.vmids.release(vmid)
+                    raise
+                self._register_task(upid, description)
+                if not wait:
+                    return {"result": "started", "detail": upid,
+                            "duration": time.monotonic() - started}
+                state = self.tasks.wait([upid], max(0.0, deadline - time.monotonic()))[str(upid)]
+            duration = time.monotonic() - started
+            if state["status"] != "stopped":
+                return {"result": "timeout", "detail": upid, "duration": duration}
+            if state["exitstatus"] == "OK":
+                return {"result": "ok", "detail": upid, "duration": duration}
+            return {"result": "failed", "detail": state["exitstatus"], "duration": duration}
+
+        # Every VM gets a worker; the per-node slots bound what actually runs
+        outcomes, errors = self._fan_out(
+            {plan["vmid"]: partial(provision, plan) for plan in plans},
+            timeout=(timeout if wait else 0) + self.call_timeout * len(plans),
+            max_workers=len(plans),
+        )
+        for vmid, error in errors.items():
+            duration = time.monotonic() - started
+            if isinstance(error, TimeoutError):
+                # The create may still run on the host, so its ID stays reserved
+                outcomes[vmid] = {"result": "unknown", "duration": duration,
+                                  "detail": "no response in time, the create may still be running"}
+            else:
+                outcomes[vmid] = {"result": "failed", "detail": str(error), "duration": duration}
+
+        from ..formatting import ProxmoxComponents
+        rows = []
+        counts: Dict[str, int] = {}
+        for plan in plans:
+            outcome = outcomes[plan["vmid"]]
+            counts[outcome["result"]] = counts.get(outcome["result"], 0) + 1
+            source = f"clone of {plan['template']}" if plan["template"] is not None else \
+                f"{plan['cpus']} CPU, {plan['memory']} MB, {plan['disk_size']} GB"
+            rows.append([plan["vmid"], plan["name"], plan["node"], plan["storage"], source,
+                         outcome["result"].upper(), f"{outcome['duration']:.1f}s",
+                         str(outcome["detail"])])
+        table = ProxmoxComponents.create_table(
+            ["VMID", "Name", "Node", "Storage", "Source", "Result", "Time", "Detail"], rows,
+            title=f"Batch create: {len(plans)} VMs on "
+                  f"{len({plan['node'] for plan in plans})} node(s)"
+        )
+        summary = ", ".join(f"{count} {result}" for result, count in sorted(counts.items()))
+        return [Content(type="text", text=f"{table}\nSummary: {summary}")]
+
+    @staticmethod
+    def _expand_batch_specs(specs: Optional[List[Dict[str, Any]]], count: Optional[int],
+                            name_pattern: str, start_index: int,
+                            defaults: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Turn create_vms_batch arguments into complete, validated VM specs.
+
+        Raises:
+            ValueError: If neither or both of specs and count are given, or a spec is invalid
+        """
+        if (specs is None) == (count is None):
+            raise ValueError("Give either specs or count")
+        if count is not None:
+            if count < 1:
+                raise ValueError("count must be at least 1")
+            if count > 1 and "{n" not in name_pattern:
+                raise ValueError("name_pattern must contain '{n}' to give each VM its own name")
+            try:
+                specs = [{"name": name_pattern.format(n=n)}
+                         for n in range(start_index, start_index + count)]
+            except (KeyError, IndexError, ValueError) as e:
+                raise ValueError(f"Invalid name_pattern '{name_pattern}': "
+                                 f"only '{{n}}' can be filled in ({e!r})") from e
+        if not specs:
+            raise ValueError("specs must not be empty")
+        if len(specs) > MAX_BATCH_SIZE:
+            raise ValueError(f"A batch can create at most {MAX_BATCH_SIZE} VMs")
+
+        result = []
+        for index, spec in enumerate(specs):
+            if not isinstance(spec, dict):
+                raise ValueError(f"Spec {index}: expected an object, got {type(spec).__name__}")
+            unknown = set(spec) - set(BATCH_SPEC_KEYS)
+            if unknown:
+                raise ValueError(f"Spec {index}: unknown key(s) {', '.join(sorted(unknown))}; "
+                                 f"expected: {', '.join(BATCH_SPEC_KEYS)}")
+            if not spec.get("name"):
+                raise ValueError(f"Spec {index}: name is required")
+            full = dict(defaults, vmid=None, **spec)
+            full["name"] = str(full["name"])
+            for key, (low, high) in VM_LIMITS.items():
+                try:
+                    full[key] = int(full[key])
+                except (TypeError, ValueError):
+                    raise ValueError(f"Spec {index}: {key} must be a whole number, "
+                                     f"got {full[key]!r}") from None
+                if not low <= full[key] <= high:
+                    raise ValueError(f"Spec {index}: {key} must be between {low} and {high}, "
+                                     f"got {full[key]}")
+            if full["template"] is not None:
+                try:
+                    full["template"] = int(full["template"])
+                except (TypeError, ValueError):
+                    raise ValueError(
+                        f"Spec {index}: invalid template ID {full['template']!r}"
+                    ) from None
+            result.append(full)
+        names = [spec["name"] for spec in result]
+        if len(set(names)) != len(names):
+            raise ValueError("VM names in a batch must be unique")
+        return result
+
+    @staticmethod
+    def _vm_config(vmid: str, name: str, cpus: int, memory: int, disk_size: int, storage: str,
+                   storage_type: str, ostype: Optional[str] = None) -> Tuple[Dict[str, Any], str]:
+        """Build the qemu create parameters of a new VM.
+
+        Args:
+            vmid: New VM ID
+            name: VM name
+            cpus: Number of CPU cores
+            memory: Memory size in MB
+            disk_size: Disk size in GB
+            storage: Storage of the VM disk
+            storage_type: Storage plugin type, which decides the disk format
+            ostype: OS type (default: 'l26')
+
+        Returns:
+            Tuple of (create parameters, disk format)
+        """
+        # Determine appropriate disk format based on storage type
+        if storage_type in ["lvm", "lvmthin"]:
+            # LVM storages use raw format and no cloudinit
+            disk_format = "raw"
+            vm_config_storage = {
+                "scsi0": f"{storage}:{disk_size},format={disk_format}",
+            }
+        elif storage_type in ["dir", "nfs", "cifs"]:
+            # File-based storages can use qcow2
+            disk_format = "qcow2"
+            vm_config_storage = {
+                "scsi0": f"{storage}:{disk_size},format={disk_format}",
+                "ide2": f"{storage}:cloudinit",
+            }
+        else:
+            # Default to raw for unknown storage types
+            disk_format = "raw"
+            vm_config_storage = {
+                "scsi0": f"{storage}:{disk_size},format={disk_format}",
+            }
+
+        # Prepare VM configuration
+        vm_config = {
+            "vmid": vmid,
+            "name": name,
+            "cores": cpus,
+            "memory": memory,
+            "ostype": ostype or "l26",  # Linux 2.6+ kernel by default
+            "scsihw": "virtio-scsi-pci",
+            "boot": "order=scsi0",
+            "agent": "1",  # Enable QEMU guest agent
+            "vga": "std",
+            "net0": "virtio,bridge=vmbr0",
+        }
+
+        # Add storage configuration
+        vm_config.update(vm_config_storage)
+        return vm_config, disk_format
+
+    def _placement_resources(self) -> List[Dict[str, Any]]:
+        """Get a private copy of the cluster-wide resource view for placement."""
+        resources = self.metrics.snapshot() if self.metrics is not None else None
+        if resources is None:
+            resources = self.proxmox.cluster.resources.get()
+        return [dict(r) for r in resources]
+
+    def _place(self, memory: int, disk_size: int, cpus: int, node: Optional[str] = None,
+               storage: Optional[str] = None,
+               resources: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Choose the node and storage of a new VM.
+
+        Args:
+            memory: Memory size in MB
+            disk_size: Disk size in GB
+            cpus: Number of CPU cores
+            node: Required node, if the caller chose one
+            storage: Required storage, if the caller chose one
+            resources: Resource view to place in (default: a fresh one)
+
+        Returns:
+            Best placement candidate, with a 'reason' describing the choice
+
+        Raises:
+            ValueError: If no node and storage can host the VM
+        """
+        if resources is None:
+            resources = self._placement_resources()
+        ranked = candidates(resources, memory * 1024 ** 2, disk_size * 1024 ** 3, cpus, node,
+                            storage, check_memory=node is None, check_disk=storage is None)
+        best = ranked[0]
+        if node is not None and storage is not None:
+            reason = "as requested"
+        else:
+            reason = (f"auto, best of {len(ranked)} candidate(s) (score {best['score']:.2f}, "
+                      f"{best['free_memory'] / 1024 ** 3:.1f} GB memory free, "
+                      f"CPU {best['cpu'] * 100:.0f}% busy, "
+                      f"{best['free_disk'] / 1024 ** 3:.0f} GB disk free)")
+        return dict(best, reason=reason)
+
+    @run_in_thread
     def start_vm(self, node: str, vmid: str) -> List[Content]:
         """Start a virtual machine.
         
@@ -283,15 +586,17 @@ class VMTools(ProxmoxTool):
             else:
                 # Start the VM
                 task_result = self.proxmox.nodes(node).qemu(vmid).status.start.post()
+                self._register_task(task_result, f"start VM {vmid}")
                 result_text = f"🚀 VM {vmid} start initiated successfully\nTask ID: {task_result}"
                 
             return [Content(type="text", text=result_text)]
             
         except Exception as e:
             if "does not exist" in str(e).lower() or "not found" in str(e).lower():
-                raise ValueError(f"VM {vmid} not found on node {node}")
+                raise ValueError(f"VM {vmid} not found on node {node}") from e
             self._handle_error(f"start VM {vmid}", e)
 
+    @run_in_thread
     def stop_vm(self, node: str, vmid: str) -> List[Content]:
         """Stop a virtual machine (force stop).
         
@@ -316,15 +621,17 @@ class VMTools(ProxmoxTool):
             else:
                 # Stop the VM
                 task_result = self.proxmox.nodes(node).qemu(vmid).status.stop.post()
+                self._register_task(task_result, f"stop VM {vmid}")
                 result_text = f"🛑 VM {vmid} stop initiated successfully\nTask ID: {task_result}"
                 
             return [Content(type="text", text=result_text)]
             
         except Exception as e:
             if "does not exist" in str(e).lower() or "not found" in str(e).lower():
-                raise ValueError(f"VM {vmid} not found on node {node}")
+                raise ValueError(f"VM {vmid} not found on node {node}") from e
             self._handle_error(f"stop VM {vmid}", e)
 
+    @run_in_thread
     def shutdown_vm(self, node: str, vmid: str) -> List[Content]:
         """Shutdown a virtual machine gracefully.
         
@@ -349,15 +656,17 @@ class VMTools(ProxmoxTool):
             else:
                 # Shutdown the VM gracefully
                 task_result = self.proxmox.nodes(node).qemu(vmid).status.shutdown.post()
+                self._register_task(task_result, f"shutdown VM {vmid}")
                 result_text = f"💤 VM {vmid} graceful shutdown initiated\nTask ID: {task_result}"
                 
             return [Content(type="text", text=result_text)]
             
         except Exception as e:
             if "does not exist" in str(e).lower() or "not found" in str(e).lower():
-                raise ValueError(f"VM {vmid} not found on node {node}")
+                raise ValueError(f"VM {vmid} not found on node {node}") from e
             self._handle_error(f"shutdown VM {vmid}", e)
 
+    @run_in_thread
     def reset_vm(self, node: str, vmid: str) -> List[Content]:
         """Reset (restart) a virtual machine.
         
@@ -382,16 +691,50 @@ class VMTools(ProxmoxTool):
             else:
                 # Reset the VM
                 task_result = self.proxmox.nodes(node).qemu(vmid).status.reset.post()
+                self._register_task(task_result, f"reset VM {vmid}")
                 result_text = f"🔄 VM {vmid} reset initiated successfully\nTask ID: {task_result}"
                 
             return [Content(type="text", text=result_text)]
             
         except Exception as e:
             if "does not exist" in str(e).lower() or "not found" in str(e).lower():
-                raise ValueError(f"VM {vmid} not found on node {node}")
+                raise ValueError(f"VM {vmid} not found on node {node}") from e
             self._handle_error(f"reset VM {vmid}", e)
 
-    async def execute_command(self, node: str, vmid: str, command: str) -> List[Content]:
+    @run_in_thread
+    def bulk_power(self, action: str, vms: Optional[List[str]] = None, tag: Optional[str] = None,
+                   name: Optional[str] = None, max_concurrency: int = 10, wait: bool = False,
+                   timeout: float = 300) -> List[Content]:
+        """Run a power action on many VMs at once.
+
+        Target VMs are resolved from a single /cluster/resources snapshot,
+        which also tells which VMs are already in the requested state, so
+        no per-VM status request is needed. Power requests are issued with
+        bounded parallelism. Started tasks are registered with the task
+        tracker; with wait enabled, they are awaited through its batched
+        per-node polling.
+
+        Args:
+            action: One of 'start', 'stop', 'shutdown', 'reset'
+            vms: VM IDs, optionally prefixed with the node (e.g., ['100', 'pve1:101'])
+            tag: Select all VMs carrying this tag
+            name: Select all VMs whose name matches this glob (e.g., 'web-*')
+            max_concurrency: Maximum number of concurrent API requests
+            wait: Wait for the power tasks to finish
+            timeout: Seconds to wait for tasks when wait is enabled
+
+        Returns:
+            List of Content objects containing a per-VM summary table with
+            successes, failures and durations
+
+        Raises:
+            ValueError: If the action is unknown, no selector is given or a VM is not found
+            RuntimeError: If the VM lookup fails
+        """
+        return self._bulk_power(action, vms, tag, name, max_concurrency, wait, timeout)
+
+    async def execute_command(self, node: str, vmid: str, command: str,
+                              timeout: Optional[float] = None) -> List[Content]:
         """Execute a command in a VM via QEMU guest agent.
 
         Uses the QEMU guest agent to execute commands within a running VM.
@@ -404,13 +747,16 @@ class VMTools(ProxmoxTool):
             node: Host node name (e.g., 'pve1', 'proxmox-node2')
             vmid: VM ID number (e.g., '100', '101')
             command: Shell command to run (e.g., 'uname -a', 'systemctl status nginx')
+            timeout: Seconds to wait for the command to exit (default: 30)
 
         Returns:
             List of Content objects containing formatted command output:
             {
                 "success": true/false,
                 "output": "command output",
-                "error": "error message if any"
+                "error": "error message if any",
+                "exit_code": command exit code,
+                "elapsed": seconds
             }
 
         Raises:
@@ -418,19 +764,147 @@ class VMTools(ProxmoxTool):
             RuntimeError: If command execution fails due to permissions or other issues
         """
         try:
-            result = await self.console_manager.execute_command(node, vmid, command)
+            result = await self.console_manager.execute_command(node, vmid, command, timeout)
             # Use the command output formatter from ProxmoxFormatters
             from ..formatting import ProxmoxFormatters
             formatted = ProxmoxFormatters.format_command_output(
                 success=result["success"],
                 command=command,
                 output=result["output"],
-                error=result.get("error")
+                error=result.get("error"),
+                exit_code=result.get("exit_code"),
+                elapsed=result.get("elapsed"),
+                exited=result.get("exited", True)
+            )
+            return [Content(type="text", text=formatted)]
+        except Exception as e:
+            self._handle_error(f"execute command on VM {vmid}", e)
+
+    async def execute_command_stream(self, node: str, vmid: str, command: str,
+                                     on_output: Optional[
+                                         Callable[[str, str], Awaitable[None]]
+                                     ] = None,
+                                     timeout: Optional[float] = 600,
+                                     max_bytes: Optional[int] = 65536) -> List[Content]:
+        """Execute a long-running command in a VM, streaming its output.
+
+        Like execute_command, but every new piece of stdout/stderr is passed
+        to on_output as soon as it is reported, e.g. to forward it as MCP
+        progress notifications. Only the last max_bytes of each stream are
+        kept for the final formatted result. The stock guest agent reports
+        output only at exit (see VMConsoleManager.stream_command).
+
+        Args:
+            node: Host node name (e.g., 'pve1', 'proxmox-node2')
+            vmid: VM ID number (e.g., '100', '101')
+            command: Shell command to run (e.g., 'apt-get upgrade -y')
+            on_output: Coroutine called with (stream, chunk), stream being 'out' or 'err'
+            timeout: Seconds to wait for the command to exit (default: 600)
+            max_bytes: Maximum bytes of each stream kept for the result (default: 64 KiB)
+
+        Returns:
+            List of Content objects containing formatted command output
+
+        Raises:
+            ValueError: If VM is not found, not running, or guest agent is not available
+            RuntimeError: If command execution fails due to permissions or other issues
+        """
+        try:
+            result: Optional[Dict[str, Any]] = None
+            events = self.console_manager.stream_command(node, vmid, command, timeout, max_bytes)
+            async for event in events:
+                if event["type"] == "output":
+                    if on_output is not None:
+                        await on_output(event["stream"], event["data"])
+                else:
+                    result = event
+            if result is None:
+                raise RuntimeError("Command stream ended without a result")
+
+            from ..formatting import ProxmoxFormatters
+            formatted = ProxmoxFormatters.format_command_output(
+                success=result["success"],
+                command=command,
+                output=result["output"],
+                error=result.get("error"),
+                exit_code=result.get("exit_code"),
+                elapsed=result.get("elapsed"),
+                exited=result.get("exited", True),
+                truncated=result.get("truncated", False)
             )
             return [Content(type="text", text=formatted)]
         except Exception as e:
             self._handle_error(f"execute command on VM {vmid}", e)
 
+    async def execute_command_batch(self, command: str, vms: Optional[List[str]] = None,
+                                    tag: Optional[str] = None, name: Optional[str] = None,
+                                    max_concurrency: int = 10,
+                                    timeout: Optional[float] = None) -> List[Content]:
+        """Execute the same command in many VMs via QEMU guest agent.
+
+        Target VMs are picked by explicit IDs and/or a tag or name selector,
+        resolved against a single /cluster/resources snapshot. Commands are
+        dispatched concurrently and all PIDs are polled in one multiplexed
+        loop. VMs that aren't running are reported without contacting them.
+
+        Args:
+            command: Shell command to run in every VM (e.g., 'uptime')
+            vms: VM IDs, optionally prefixed with the node (e.g., ['100', 'pve1:101'])
+            tag: Select all VMs carrying this tag
+            name: Select all VMs whose name matches this glob (e.g., 'web-*')
+            max_concurrency: Maximum number of concurrent API requests
+            timeout: Seconds to wait for commands to finish (default: 30)
+
+        Returns:
+            List of Content objects containing a per-VM result table
+
+        Raises:
+            ValueError: If no selector is given, or a requested VM is not found
+            RuntimeError: If the VM lookup fails
+        """
+        if not vms and not tag and not name:
+            raise ValueError("Specify VMs by ID, tag or name to run a batch command")
+        try:
+            targets = await asyncio.to_thread(self._select_guests, vms, tag, name)
+        except ValueError:
+            raise
+        except Exception as e:
+            self._handle_error("select VMs for batch command", e)
+
+        running = [(vm["node"], str(vm["vmid"])) for vm in targets if vm.get("status") == "running"]
+        results = await self.console_manager.execute_command_batch(
+            running, command, max_concurrency=max_concurrency, timeout=timeout, verify=False
+        )
+
+        from ..formatting import ProxmoxComponents
+        rows = []
+        succeeded = 0
+        for vm in targets:
+            result = results.get((vm["node"], str(vm["vmid"])))
+            if result is None:
+                exit_code, elapsed, text = "-", "-", f"VM is {vm.get('status', 'unknown')}"
+            elif not result["success"]:
+                exit_code, elapsed, text = "-", "-", f"Error: {result['error']}"
+            else:
+                exit_code = result["exit_code"] if result["exited"] else "running"
+                elapsed = f"{result['elapsed']:.2f}s"
+                text = result["output"].strip() or result["error"].strip()
+                if result["exited"] and result["exit_code"] == 0:
+                    succeeded += 1
+            first_line = text.splitlines()[0] if text else ""
+            if len(first_line) > 60:
+                first_line = first_line[:57] + "..."
+            rows.append([str(vm["vmid"]), vm.get("name", ""), vm["node"], str(exit_code), elapsed,
+                         first_line])
+
+        table = ProxmoxComponents.create_table(
+            ["VMID", "Name", "Node", "Exit", "Time", "Output"], rows,
+            title=f"Batch Command: {command}"
+        )
+        summary = f"{succeeded}/{len(targets)} VMs exited with code 0"
+        return [Content(type="text", text=f"{table}\n{summary}")]
+
+    @run_in_thread
     def delete_vm(self, node: str, vmid: str, force: bool = False) -> List[Content]:
         """Delete/remove a virtual machine completely.
         
@@ -461,7 +935,7 @@ class VMTools(ProxmoxTool):
                 vm_name = vm_status.get("name", f"VM-{vmid}")
             except Exception as e:
                 if "does not exist" in str(e).lower() or "not found" in str(e).lower():
-                    raise ValueError(f"VM {vmid} not found on node {node}")
+                    raise ValueError(f"VM {vmid} not found on node {node}") from e
                 raise e
             
             # Check if VM is running
@@ -478,6 +952,7 @@ class VMTools(ProxmoxTool):
             
             # Delete the VM
             task_result = self.proxmox.nodes(node).qemu(vmid).delete()
+            self._register_task(task_result, f"delete VM {vmid}")
             
             result_text += f"""🗑️ VM {vmid} ({vm_name}) deletion initiated successfully!
 
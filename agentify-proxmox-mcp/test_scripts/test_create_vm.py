@@ -2,6 +2,7 @@
 """
 Test VM creation functionality
 """
+import asyncio
 import os
 import sys
 
@@ -47,14 +48,14 @@ def test_create_vm():
             print(f"✅ VM ID {vmid} is available")
         
         # Create VM
-        result = vm_tools.create_vm(
+        result = asyncio.run(vm_tools.create_vm(
             node="pve",
             vmid=vmid,
             name="test-vm-demo",
             cpus=1,
             memory=2048,  # 2GB in MB
             disk_size=10  # 10GB
-        )
+        ))
         
         for content in result:
             print(content.text)
@@ -84,7 +85,7 @@ def test_list_vms():
         print("\n🔍 List all VMs to confirm creation results:")
         print("=" * 40)
         
-        result = vm_tools.get_vms()
+        result = asyncio.run(vm_tools.get_vms())
         for content in result:
             # Only show newly created VM information
             lines = content.text.split('\n')
@@ -2,6 +2,7 @@
 """
 Test VM startup functionality
 """
+import asyncio
 import os
 import sys
 
@@ -26,7 +27,7 @@ def test_start_vm_101():
         print("=" * 50)
         
         # Start VM 101
-        result = vm_tools.start_vm(node="pve", vmid="101")
+        result = asyncio.run(vm_tools.start_vm(node="pve", vmid="101"))
         
         for content in result:
             print(content.text)
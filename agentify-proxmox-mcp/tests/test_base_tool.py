@@ -0,0 +1,75 @@
+"""
+Tests for the shared ProxmoxTool helpers.
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import Mock
+
+from proxmox_mcp.tools.base import ProxmoxTool
+from proxmox_mcp.tools.node import NodeTools
+
+@pytest.fixture
+def tool():
+    """Fixture to create a ProxmoxTool with a mock API."""
+    return ProxmoxTool(Mock())
+
+def test_fan_out_runs_concurrently(tool):
+    """Test requests overlap instead of running back to back."""
+    calls = {i: (lambda i=i: time.sleep(0.2) or i) for i in range(4)}
+
+    start = time.monotonic()
+    results, errors = tool._fan_out(calls)
+    elapsed = time.monotonic() - start
+
+    assert results == {0: 0, 1: 1, 2: 2, 3: 3}
+    assert errors == {}
+    assert elapsed < 0.6
+
+def test_fan_out_captures_failures(tool):
+    """Test a failing request doesn't affect the others."""
+    def fail():
+        raise Exception("node offline")
+
+    results, errors = tool._fan_out({"a": lambda: 1, "b": fail})
+
+    assert results == {"a": 1}
+    assert str(errors["b"]) == "node offline"
+
+def test_fan_out_timeout(tool):
+    """Test a slow request is reported as timed out."""
+    results, errors = tool._fan_out({"fast": lambda: 1, "slow": lambda: time.sleep(1)}, timeout=0.1)
+
+    assert results == {"fast": 1}
+    assert isinstance(errors["slow"], TimeoutError)
+
+@pytest.mark.asyncio
+async def test_get_nodes_falls_back_on_timeout():
+    """Test get_nodes returns basic info for a node whose status times out."""
+    proxmox = Mock()
+    proxmox.nodes.get.return_value = [
+        {"node": "node1", "status": "online", "maxmem": 100, "mem": 40}
+    ]
+    proxmox.nodes.return_value.status.get.side_effect = lambda: time.sleep(1)
+    tools = NodeTools(proxmox)
+    tools.call_timeout = 0.1
+
+    response = await tools.get_nodes()
+
+    assert "node1" in response[0].text
+    assert "CPU Cores: N/A" in response[0].text
+
+@pytest.mark.asyncio
+async def test_tool_methods_do_not_block_event_loop():
+    """Test concurrent tool calls overlap instead of running one after another."""
+    proxmox = Mock()
+    proxmox.nodes.return_value.status.get.side_effect = (
+        lambda: time.sleep(0.2) or {"status": "online"}
+    )
+    tools = NodeTools(proxmox)
+
+    start = time.monotonic()
+    await asyncio.gather(*(tools.get_node_status(f"node{i}") for i in range(4)))
+
+    assert time.monotonic() - start < 0.6
@@ -0,0 +1,122 @@
+"""
+Tests for the API response cache.
+"""
+
+import time
+import pytest
+from unittest.mock import Mock
+
+from proxmox_mcp.core.cache import CachedProxmoxAPI, ResponseCache, bypass_cache
+
+@pytest.fixture
+def cache():
+    """Fixture to create a response cache with a few TTLs."""
+    return ResponseCache({
+        "/nodes": 60,
+        "/nodes/*/status": 60,
+        "/cluster/resources": 60,
+        "/storage": 0.05,
+    }, max_entries=3)
+
+@pytest.fixture
+def mock_proxmox():
+    """Fixture to create a mock ProxmoxAPI instance."""
+    mock = Mock()
+    mock.nodes.get.return_value = [{"node": "node1"}]
+    mock.nodes.return_value.status.get.return_value = {"uptime": 1}
+    mock.cluster.resources.get.return_value = [{"vmid": 100}]
+    return mock
+
+@pytest.fixture
+def api(mock_proxmox, cache):
+    """Fixture to create a caching API wrapper."""
+    return CachedProxmoxAPI(mock_proxmox, cache)
+
+def test_ttl_patterns(cache):
+    """Test '*' matches exactly one path segment."""
+    assert cache.ttl_for("/nodes/pve1/status") == 60
+    assert cache.ttl_for("/nodes/pve1/qemu/100/status") == 0
+    assert cache.ttl_for("/version") == 0
+
+def test_repeat_reads_hit_cache(api, mock_proxmox):
+    """Test repeated GETs reach the API only once."""
+    assert api.nodes.get() == [{"node": "node1"}]
+    assert api.nodes.get() == [{"node": "node1"}]
+
+    mock_proxmox.nodes.get.assert_called_once()
+
+def test_params_are_part_of_key(api, mock_proxmox):
+    """Test different query parameters are cached separately."""
+    api.cluster.resources.get(type="vm")
+    api.cluster.resources.get(type="vm")
+    api.cluster.resources.get(type="storage")
+
+    assert mock_proxmox.cluster.resources.get.call_count == 2
+
+def test_bypass_reads_fresh_and_refreshes(api, mock_proxmox):
+    """Test bypassed reads reach the API and update the cached value."""
+    api.cluster.resources.get()
+    mock_proxmox.cluster.resources.get.return_value = [{"vmid": 101}]
+
+    with bypass_cache():
+        assert api.cluster.resources.get() == [{"vmid": 101}]
+    assert api.cluster.resources.get() == [{"vmid": 101}]
+
+    assert mock_proxmox.cluster.resources.get.call_count == 2
+
+def test_uncached_paths_pass_through(api, mock_proxmox):
+    """Test paths without a TTL always reach the API."""
+    api.nodes("node1").qemu(100).status.current.get()
+    api.nodes("node1").qemu(100).status.current.get()
+
+    assert mock_proxmox.nodes.return_value.qemu.return_value.status.current.get.call_count == 2
+    mock_proxmox.nodes.assert_called_with("node1")
+    mock_proxmox.nodes.return_value.qemu.assert_called_with(100)
+
+def test_entries_expire(api, mock_proxmox):
+    """Test entries are refetched once their TTL passes."""
+    api.storage.get()
+    time.sleep(0.1)
+    api.storage.get()
+
+    assert mock_proxmox.storage.get.call_count == 2
+
+def test_lru_bound(cache):
+    """Test the least recently used entry is evicted when full."""
+    for i in range(3):
+        cache.set(("/nodes", str(i)), i, 60)
+    cache.get(("/nodes", "0"))
+    cache.set(("/nodes", "3"), 3, 60)
+
+    assert cache.get(("/nodes", "0")) == (True, 0)
+    assert cache.get(("/nodes", "1")) == (False, None)
+
+def test_cached_values_are_copies(api):
+    """Test callers can't modify cached responses."""
+    api.nodes.get()[0]["node"] = "changed"
+
+    assert api.nodes.get() == [{"node": "node1"}]
+
+def test_mutation_invalidates_node(api, mock_proxmox):
+    """Test a write under a node drops that node's entries and cluster views."""
+    api.nodes.get()
+    api.nodes("node1").status.get()
+    api.cluster.resources.get(type="vm")
+
+    api.nodes("node1").qemu(100).status.start.post()
+
+    api.nodes.get()
+    api.nodes("node1").status.get()
+    api.cluster.resources.get(type="vm")
+    assert mock_proxmox.nodes.get.call_count == 2
+    assert mock_proxmox.nodes.return_value.status.get.call_count == 2
+    assert mock_proxmox.cluster.resources.get.call_count == 2
+
+def test_guest_agent_calls_do_not_invalidate(api, mock_proxmox):
+    """Test guest agent commands leave the cache intact."""
+    api.nodes.get()
+
+    api.nodes("node1").qemu(100).agent("exec").post(command="uptime")
+
+    api.nodes.get()
+    mock_proxmox.nodes.get.assert_called_once()
@@ -0,0 +1,54 @@
+"""
+Tests for the storage content index.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from proxmox_mcp.core.content import ContentIndex, search, volume_name
+
+def volume(volid, content="backup", size=100, ctime=1000, vmid=None, nodes=("pve1",)):
+    """Create an index entry."""
+    return {"volid": volid, "name": volume_name(volid), "content": content, "size": size,
+            "ctime": ctime, "vmid": vmid, "storage": volid.split(":")[0], "nodes": list(nodes)}
+
+VOLUMES = [
+    volume("local:iso/Ubuntu-22.04.iso", content="iso", size=2000, ctime=500),
+    volume("nfs:backup/vzdump-qemu-123-2024_01_01.vma.zst", vmid=123, ctime=1000,
+           nodes=("pve1", "pve2")),
+    volume("nfs:backup/vzdump-qemu-123-2024_02_01.vma.zst", vmid=123, ctime=2000,
+           nodes=("pve1", "pve2")),
+    volume("local:backup/vzdump-lxc-200-2024_02_01.tar.zst", vmid=200, ctime=1500),
+]
+
+def test_volume_name():
+    """Test file names are taken from volume IDs."""
+    assert volume_name("local:iso/debian.iso") == "debian.iso"
+    assert volume_name("ceph:vm-100-disk-0") == "vm-100-disk-0"
+
+def test_search_latest_backup():
+    """Test the newest backup of a guest comes first."""
+    matches = search(VOLUMES, content="backup", vmid=123)
+
+    assert [v["ctime"] for v in matches] == [2000, 1000]
+
+def test_search_filters():
+    """Test name, size, date and location filters."""
+    assert [v["content"] for v in search(VOLUMES, name="*ubuntu*")] == ["iso"]
+    assert len(search(VOLUMES, min_size=1000)) == 1
+    assert len(search(VOLUMES, since=1000, until=2000)) == 2
+    assert len(search(VOLUMES, node="pve2")) == 2
+    assert search(VOLUMES, sort_by="name")[0]["name"] == "Ubuntu-22.04.iso"
+    with pytest.raises(ValueError, match="sort_by"):
+        search(VOLUMES, sort_by="owner")
+
+def test_index_ttl():
+    """Test the catalog is served until its TTL expires."""
+    index = ContentIndex(ttl=60)
+    assert index.volumes() is None
+
+    index.replace(VOLUMES, ["pve2/local"])
+    assert index.volumes() == VOLUMES
+    assert index.failed == ["pve2/local"]
+    with patch("proxmox_mcp.core.content.time.monotonic", return_value=index._built_monotonic + 61):
+        assert index.volumes() is None
@@ -0,0 +1,98 @@
+"""
+Tests for multi-endpoint failover.
+"""
+
+import time
+import pytest
+from unittest.mock import Mock
+from requests.exceptions import ConnectionError, ReadTimeout
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from proxmox_mcp.core.endpoints import Endpoint, EndpointPool, FailoverProxmoxAPI
+
+def refused():
+    """Create the error raised when a connection can't be established."""
+    reason = NewConnectionError(None, "Connection refused")
+    return ConnectionError(MaxRetryError(None, "/api2/json", reason))
+
+@pytest.fixture
+def endpoints():
+    """Fixture to create three endpoints answering with their own name."""
+    result = []
+    for name in ("pve1", "pve2", "pve3"):
+        api = Mock()
+        api.nodes.get.return_value = name
+        api.nodes.return_value.qemu.return_value.status.start.post.return_value = name
+        result.append(Endpoint(name, api))
+    return result
+
+@pytest.fixture
+def api(endpoints):
+    """Fixture to create a failover API over the endpoints."""
+    return FailoverProxmoxAPI(EndpointPool(endpoints, health_check_interval=60))
+
+def test_reads_rotate(api):
+    """Test reads are spread over all healthy endpoints."""
+    assert {api.nodes.get() for _ in range(3)} == {"pve1", "pve2", "pve3"}
+
+def test_writes_pinned_to_primary(api):
+    """Test writes go to the first healthy endpoint."""
+    assert {api.nodes("node1").qemu(100).status.start.post() for _ in range(3)} == {"pve1"}
+
+def test_read_fails_over(api, endpoints):
+    """Test a read is retried elsewhere and the failed endpoint taken out of rotation."""
+    endpoints[0].api.nodes.get.side_effect = ReadTimeout("timed out")
+
+    results = [api.nodes.get() for _ in range(4)]
+
+    assert "pve1" not in results
+    assert not endpoints[0].healthy
+    assert endpoints[0].api.nodes.get.call_count == 1
+
+def test_write_fails_over_when_not_sent(api, endpoints):
+    """Test a write moves on when the connection was refused."""
+    endpoints[0].api.nodes.return_value.qemu.return_value.status.start.post.side_effect = refused()
+
+    assert api.nodes("node1").qemu(100).status.start.post() == "pve2"
+
+def test_write_not_repeated_after_send(api, endpoints):
+    """Test a write that may have reached the server isn't sent again."""
+    start = endpoints[0].api.nodes.return_value.qemu.return_value.status.start
+    start.post.side_effect = ReadTimeout("timed out")
+
+    with pytest.raises(ReadTimeout):
+        api.nodes("node1").qemu(100).status.start.post()
+    endpoints[1].api.nodes.return_value.qemu.return_value.status.start.post.assert_not_called()
+
+def test_api_errors_are_not_failovers(api, endpoints):
+    """Test errors answered by the API are raised without failing over."""
+    error = Exception("403 Forbidden")
+    error.status_code = 403
+    endpoints[0].api.nodes.return_value.qemu.return_value.status.start.post.side_effect = error
+
+    with pytest.raises(Exception, match="Forbidden"):
+        api.nodes("node1").qemu(100).status.start.post()
+    assert endpoints[0].healthy
+
+def test_all_down_raises(api, endpoints):
+    """Test the last error is raised when no endpoint answers."""
+    for endpoint in endpoints:
+        endpoint.api.nodes.get.side_effect = refused()
+
+    with pytest.raises(ConnectionError):
+        api.nodes.get()
+
+def test_health_check_restores_endpoint(endpoints):
+    """Test a failed endpoint rejoins the pool after passing a health check."""
+    pool = EndpointPool(endpoints, health_check_interval=0)
+    endpoints[0].api.version.get.side_effect = refused()
+    assert not pool.check(endpoints[0])
+
+    endpoints[0].api.version.get.side_effect = None
+    FailoverProxmoxAPI(pool).nodes.get()
+    for _ in range(50):
+        if endpoints[0].healthy:
+            break
+        time.sleep(0.01)
+
+    assert endpoints[0].healthy
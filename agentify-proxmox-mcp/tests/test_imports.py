@@ -0,0 +1,59 @@
+"""
+Import-time regression checks for server startup.
+"""
+
+import os
+import subprocess
+import sys
+import pytest
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# Modules that must only load when a tool is first invoked
+DEFERRED_MODULES = [
+    "proxmoxer",
+    "requests",
+    "urllib3",
+    "proxmox_mcp.formatting",
+    "proxmox_mcp.tools.base",
+    "proxmox_mcp.tools.vm",
+    "proxmox_mcp.tools.container",
+    "proxmox_mcp.tools.console",
+]
+
+# Budget for the package's own modules, excluding third-party imports (mcp, pydantic)
+OWN_IMPORT_BUDGET_MS = 100
+
+@pytest.fixture(scope="module")
+def import_times():
+    """Fixture to import the server in a fresh interpreter with -X importtime.
+
+    Returns:
+        Mapping of module name to self import time in microseconds
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([SRC, os.environ.get("PYTHONPATH", "")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import proxmox_mcp.server"],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = int(self_us)
+    return times
+
+@pytest.mark.parametrize("module", DEFERRED_MODULES)
+def test_heavy_modules_deferred(import_times, module):
+    """Test importing the server doesn't load modules only tools need."""
+    assert "proxmox_mcp.server" in import_times
+    loaded = [name for name in import_times if name == module or name.startswith(module + ".")]
+    assert not loaded, f"{module} is imported at startup"
+
+def test_own_import_budget(import_times):
+    """Test the package's own modules stay within the startup import budget."""
+    own_ms = sum(us for name, us in import_times.items() if name.startswith("proxmox_mcp")) / 1000
+
+    assert own_ms < OWN_IMPORT_BUDGET_MS
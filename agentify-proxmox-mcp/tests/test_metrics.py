@@ -0,0 +1,103 @@
+"""
+Tests for background metrics collection.
+"""
+
+import math
+import pytest
+from unittest.mock import Mock, patch
+
+from proxmox_mcp.core.metrics import MetricsCollector, RingBuffer
+
+def resources(cpu=0.5, netin=1000, vms=(100,)):
+    """Create a /cluster/resources response with one node and some VMs."""
+    result = [{"id": "node/pve1", "type": "node", "node": "pve1", "status": "online",
+               "cpu": cpu, "maxcpu": 8, "mem": 4096, "maxmem": 8192, "uptime": 100}]
+    for vmid in vms:
+        result.append({"id": f"qemu/{vmid}", "type": "qemu", "vmid": vmid, "node": "pve1",
+                       "status": "running", "cpu": cpu, "mem": 1024, "maxmem": 2048,
+                       "netin": netin})
+    result.append({"id": "storage/pve1/local", "type": "storage", "storage": "local"})
+    return result
+
+@pytest.fixture
+def collector():
+    """Fixture to create a collector over a mocked API, without starting it."""
+    return MetricsCollector(Mock(), interval=10, retention=30)
+
+def test_ring_buffer_wraps():
+    """Test the buffer keeps the newest samples in order once full."""
+    buffer = RingBuffer(3, fields=("cpu",))
+    for i in range(5):
+        buffer.append(float(i), {"cpu": i / 10})
+
+    assert len(buffer) == 3
+    assert buffer.window("cpu") == [(2.0, 0.2), (3.0, 0.3), (4.0, 0.4)]
+    assert buffer.window("cpu", seconds=1.5, now=4.0) == [(3.0, 0.3), (4.0, 0.4)]
+
+def test_ring_buffer_missing_values():
+    """Test missing metrics are stored as NaN and skipped in windows."""
+    buffer = RingBuffer(2, fields=("cpu", "netin"))
+    buffer.append(1.0, {"cpu": 0.1})
+
+    assert math.isnan(buffer.values["netin"][0])
+    assert buffer.window("netin") == []
+
+def test_poll_records_nodes_and_guests(collector):
+    """Test one poll creates a series per node and guest, skipping storage."""
+    collector.proxmox.cluster.resources.get.return_value = resources(vms=(100, 101))
+
+    collector.poll()
+
+    assert sorted(collector.series) == ["node/pve1", "qemu/100", "qemu/101"]
+    assert collector.capacity == 3
+
+def test_poll_drops_vanished_series(collector):
+    """Test series of deleted guests are dropped."""
+    collector.proxmox.cluster.resources.get.return_value = resources(vms=(100, 101))
+    collector.poll()
+    collector.proxmox.cluster.resources.get.return_value = resources(vms=(100,))
+    collector.poll()
+
+    assert "qemu/101" not in collector.series
+
+def test_snapshot_freshness(collector):
+    """Test the snapshot is served while fresh and dropped when stale."""
+    assert collector.snapshot() is None
+    collector.proxmox.cluster.resources.get.return_value = resources()
+    collector.poll()
+
+    assert [r["id"] for r in collector.snapshot(("qemu",))] == ["qemu/100"]
+    collector.mark_stale()
+    assert collector.snapshot() is None
+
+    collector.poll()
+    expired = collector._snapshot_time + 21
+    with patch("proxmox_mcp.core.metrics.time.monotonic", return_value=expired):
+        assert collector.snapshot() is None
+
+def test_trend_gauges_and_counter_rates(collector):
+    """Test gauges are summarized as-is and counters as per-second rates."""
+    with patch("proxmox_mcp.core.metrics.time.time") as clock:
+        for i, (cpu, netin) in enumerate([(0.2, 0), (0.4, 10000), (0.6, 30000)]):
+            clock.return_value = 1000.0 + i * 10
+            collector.proxmox.cluster.resources.get.return_value = resources(cpu=cpu, netin=netin)
+            collector.poll()
+
+        trend = collector.trend("qemu/100", 60, ("cpu", "netin"))
+
+    assert trend["cpu"]["samples"] == 3
+    assert trend["cpu"]["max"] == 0.6
+    assert trend["cpu"]["avg"] == pytest.approx(0.4)
+    assert trend["netin"] == {
+        "samples": 2, "last": 2000.0, "min": 1000.0, "avg": 1500.0, "max": 2000.0
+    }
+
+def test_resolve_targets(collector):
+    """Test node names and bare VM IDs resolve to series keys."""
+    collector.proxmox.cluster.resources.get.return_value = resources()
+    collector.poll()
+
+    assert collector.resolve("pve1") == "node/pve1"
+    assert collector.resolve("100") == "qemu/100"
+    with pytest.raises(ValueError, match="No metrics"):
+        collector.resolve("999")
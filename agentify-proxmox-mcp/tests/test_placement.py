@@ -0,0 +1,68 @@
+"""
+Tests for capacity-aware VM placement.
+"""
+
+import pytest
+
+from proxmox_mcp.core.placement import candidates, commit
+
+GB = 1024 ** 3
+
+def resources():
+    """Create a /cluster/resources response with two nodes and their storage."""
+    return [
+        {"type": "node", "node": "pve1", "status": "online", "cpu": 0.8, "maxcpu": 8,
+         "mem": 28 * GB, "maxmem": 32 * GB},
+        {"type": "node", "node": "pve2", "status": "online", "cpu": 0.1, "maxcpu": 16,
+         "mem": 8 * GB, "maxmem": 64 * GB},
+        {"type": "node", "node": "pve3", "status": "offline"},
+        {"type": "storage", "storage": "local-lvm", "node": "pve1", "status": "available",
+         "plugintype": "lvmthin", "content": "images,rootdir", "disk": 100 * GB,
+         "maxdisk": 500 * GB},
+        {"type": "storage", "storage": "local-lvm", "node": "pve2", "status": "available",
+         "plugintype": "lvmthin", "content": "images,rootdir", "disk": 480 * GB,
+         "maxdisk": 500 * GB},
+        {"type": "storage", "storage": "local", "node": "pve2", "status": "available",
+         "plugintype": "dir", "content": "iso,backup", "disk": 0, "maxdisk": 100 * GB},
+        {"type": "storage", "storage": "ceph", "node": "pve2", "status": "available",
+         "plugintype": "rbd", "content": "images", "shared": 1, "disk": 1000 * GB,
+         "maxdisk": 4000 * GB},
+        {"type": "qemu", "vmid": 100, "node": "pve1", "status": "running"},
+    ]
+
+def test_best_candidate_has_most_headroom():
+    """Test the idle node with room on shared storage wins, non-image pools are skipped."""
+    ranked = candidates(resources(), memory=4 * GB, disk=32 * GB, cpus=2)
+
+    assert [(c["node"], c["storage"]) for c in ranked] == [("pve2", "ceph"), ("pve1", "local-lvm")]
+    assert ranked[0]["storage_type"] == "rbd"
+    assert ranked[0]["free_memory"] == 56 * GB
+
+def test_capacity_limits():
+    """Test nodes without memory or cores and full storages are excluded."""
+    assert {c["node"] for c in candidates(resources(), memory=8 * GB, disk=10 * GB)} == {"pve2"}
+    with pytest.raises(ValueError, match="No online node has 32 core"):
+        candidates(resources(), memory=GB, disk=GB, cpus=32)
+    with pytest.raises(ValueError, match="5000 GB free"):
+        candidates(resources(), memory=GB, disk=5000 * GB)
+
+def test_explicit_choices():
+    """Test a chosen node and storage are validated, with memory overcommit allowed."""
+    ranked = candidates(resources(), memory=8 * GB, disk=10 * GB, node="pve1", storage="local-lvm",
+                        check_memory=False)
+
+    assert [(c["node"], c["storage"]) for c in ranked] == [("pve1", "local-lvm")]
+    with pytest.raises(ValueError, match="pve3' is not online"):
+        candidates(resources(), memory=GB, disk=GB, node="pve3")
+    with pytest.raises(ValueError, match="Storage 'local' not found or can't hold VM images"):
+        candidates(resources(), memory=GB, disk=GB, node="pve2", storage="local")
+
+def test_commit_spreads_batch():
+    """Test committed placements reduce the headroom seen by the next VM."""
+    snapshot = resources()
+    first = candidates(snapshot, memory=4 * GB, disk=32 * GB)[0]
+    commit(snapshot, first, 4 * GB, 32 * GB)
+
+    assert snapshot[1]["mem"] == 12 * GB
+    assert snapshot[6]["disk"] == 1032 * GB
+    assert snapshot[3]["disk"] == 100 * GB
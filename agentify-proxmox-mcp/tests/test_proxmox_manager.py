@@ -0,0 +1,70 @@
+"""
+Tests for the Proxmox API manager.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from proxmoxer import ProxmoxAPI
+
+from proxmox_mcp.config.models import AuthConfig, ProxmoxConfig
+from proxmox_mcp.core.proxmox import ProxmoxManager
+
+@pytest.fixture
+def proxmox_config():
+    """Fixture to create a connection configuration with tuned pooling."""
+    return ProxmoxConfig(host="test.proxmox.com", timeout=12, pool_maxsize=32, retries=2,
+                         retry_statuses=[503])
+
+@pytest.fixture
+def auth_config():
+    """Fixture to create an authentication configuration."""
+    return AuthConfig(user="test@pve", token_name="test_token", token_value="test_value")
+
+@pytest.fixture
+def manager(proxmox_config, auth_config):
+    """Fixture to create a manager without connecting."""
+    with patch("proxmoxer.ProxmoxAPI"):
+        return ProxmoxManager(proxmox_config, auth_config)
+
+def test_timeout_passed_to_api(manager):
+    """Test the configured request timeout reaches ProxmoxAPI."""
+    assert manager.config["timeout"] == 12
+
+def test_session_pool_and_retries(manager):
+    """Test the API session gets a pooled, retrying HTTPS adapter."""
+    api = ProxmoxAPI(**manager.config)
+
+    manager._configure_session(api)
+
+    adapter = api._store["session"].get_adapter("https://test.proxmox.com:8006/api2/json")
+    assert adapter._pool_maxsize == 32
+    assert adapter.max_retries.total == 2
+    assert adapter.max_retries.status_forcelist == [503]
+    assert adapter.max_retries.is_retry("GET", 503)
+    assert not adapter.max_retries.is_retry("POST", 503)
+
+def test_multiple_hosts_create_pool(auth_config):
+    """Test additional hosts are combined into a failover pool, tolerating one down at startup."""
+    config = ProxmoxConfig(host="pve1", hosts=["pve2:8007", "pve1", "pve3"])
+    with patch("proxmoxer.ProxmoxAPI") as api_class:
+        apis = {}
+
+        def connect(**kwargs):
+            api = apis[(kwargs["host"], kwargs["port"])] = Mock()
+            if kwargs["host"] == "pve3":
+                api.version.get.side_effect = Exception("unreachable")
+            return api
+
+        api_class.side_effect = connect
+        manager = ProxmoxManager(config, auth_config)
+
+    assert list(apis) == [("pve1", 8006), ("pve2", 8007), ("pve3", 8006)]
+    assert [endpoint.healthy for endpoint in manager.pool.endpoints] == [True, True, False]
+
+def test_multiple_hosts_all_down(auth_config):
+    """Test startup fails only when no endpoint answers."""
+    config = ProxmoxConfig(host="pve1", hosts=["pve2"])
+    with patch("proxmoxer.ProxmoxAPI") as api_class:
+        api_class.return_value.version.get.side_effect = Exception("unreachable")
+        with pytest.raises(RuntimeError, match="no endpoint reachable"):
+            ProxmoxManager(config, auth_config)
@@ -0,0 +1,39 @@
+"""
+Tests for RRD series aggregation.
+"""
+
+import pytest
+
+from proxmox_mcp.core.rrd import aggregate, extract
+
+def test_extract_skips_gaps():
+    """Test time slots without data are skipped."""
+    points = [{"time": 1, "cpu": 0.5}, {"time": 2}, {"time": 3, "cpu": None}, {"time": 4, "cpu": 1}]
+
+    assert extract(points, "cpu") == [0.5, 1.0]
+
+def test_aggregate_python():
+    """Test the pure-Python path computes count, mean, max and interpolated percentiles."""
+    stats = aggregate({"a": [1, 2, 3, 4, 5], "b": [10], "empty": []}, percentiles=(50, 90),
+                      use_numpy=False)
+
+    assert stats["a"] == {"samples": 5, "avg": 3.0, "max": 5, "p50": 3, "p90": pytest.approx(4.6)}
+    assert stats["b"]["p90"] == 10
+    assert "empty" not in stats
+
+def test_aggregate_invalid_percentile():
+    """Test percentiles outside 0-100 are rejected."""
+    with pytest.raises(ValueError, match="between 0 and 100"):
+        aggregate({"a": [1]}, percentiles=(120,))
+
+def test_aggregate_numpy_matches_python():
+    """Test the vectorized path matches the pure-Python one on ragged series."""
+    pytest.importorskip("numpy")
+    series = {"a": [0.1, 0.7, 0.3, 0.9], "b": [5.0, 1.0], "c": [2.0]}
+
+    vectorized = aggregate(series, percentiles=(50, 95, 99), use_numpy=True)
+    python = aggregate(series, percentiles=(50, 95, 99), use_numpy=False)
+
+    assert vectorized.keys() == python.keys()
+    for key in python:
+        assert vectorized[key] == pytest.approx(python[key])
@@ -3,6 +3,7 @@ Tests for the Proxmox MCP server.
 """
 
 import os
+import time
 import json
 import pytest
 from unittest.mock import Mock, patch
@@ -10,7 +11,9 @@ from unittest.mock import Mock, patch
 from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.exceptions import ToolError
 from proxmox_mcp.server import ProxmoxMCPServer
-from proxmox_mcp.config.models import Config, ProxmoxConfig, AuthConfig, LoggingConfig
+from proxmox_mcp.config.models import (
+    Config, ProxmoxConfig, AuthConfig, LoggingConfig, MetricsConfig,
+)
 
 @pytest.fixture
 def mock_config():
@@ -48,7 +51,7 @@ def mock_env_vars():
 @pytest.fixture
 def mock_proxmox():
     """Fixture to mock ProxmoxAPI."""
-    with patch("proxmox_mcp.core.proxmox.ProxmoxAPI") as mock:
+    with patch("proxmoxer.ProxmoxAPI") as mock:
         # Create a mock instance
         mock_instance = Mock()
         mock.return_value = mock_instance
@@ -71,6 +74,30 @@ def mock_proxmox():
             {"vmid": "101", "name": "vm2", "status": "stopped"}
         ]
         
+        # Mock cluster-wide resource view (VMs and containers)
+        mock_instance.cluster.resources.get.return_value = [
+            {"type": "qemu", "vmid": 100, "name": "vm1", "status": "running", "node": "node1",
+             "maxcpu": 2, "mem": 1073741824, "maxmem": 2147483648, "tags": "web;prod"},
+            {"type": "qemu", "vmid": 101, "name": "vm2", "status": "stopped", "node": "node2",
+             "maxcpu": 4, "mem": 0, "maxmem": 4294967296},
+            {"type": "lxc", "vmid": 200, "name": "container1", "status": "running", "node": "node1",
+             "maxcpu": 1, "mem": 0, "maxmem": 536870912},
+            {"type": "lxc", "vmid": 201, "name": "container2", "status": "stopped", "node": "node2",
+             "maxcpu": 2, "mem": 0, "maxmem": 1073741824, "tags": "lab"},
+            {"type": "storage", "storage": "local", "node": "node1", "plugintype": "dir",
+             "shared": 0, "status": "available", "content": "iso,backup",
+             "disk": 1000000000, "maxdisk": 10000000000},
+            {"type": "storage", "storage": "local", "node": "node2", "plugintype": "dir",
+             "shared": 0, "status": "available", "content": "iso,backup",
+             "disk": 2000000000, "maxdisk": 10000000000},
+            {"type": "storage", "storage": "ceph", "node": "node1", "plugintype": "rbd",
+             "shared": 1, "status": "available", "content": "images",
+             "disk": 5000000000, "maxdisk": 50000000000},
+            {"type": "storage", "storage": "ceph", "node": "node2", "plugintype": "rbd",
+             "shared": 1, "status": "available", "content": "images",
+             "disk": 5000000000, "maxdisk": 50000000000}
+        ]
+
         # Mock containers
         mock_instance.nodes.return_value.lxc.get.return_value = [
             {"vmid": "200", "name": "container1", "status": "running"},
@@ -117,7 +144,14 @@ def mock_proxmox():
 def server(mock_config, mock_proxmox):
     """Fixture to create a ProxmoxMCPServer instance."""
     with patch("proxmox_mcp.server.load_config", return_value=mock_config):
-    return ProxmoxMCPServer()
+        return ProxmoxMCPServer()
+
+@pytest.fixture
+def metrics_server(mock_config, mock_proxmox):
+    """Fixture to create a ProxmoxMCPServer instance with metrics collection enabled."""
+    mock_config.metrics = MetricsConfig(enabled=True)
+    with patch("proxmox_mcp.server.load_config", return_value=mock_config):
+        return ProxmoxMCPServer()
 
 def test_server_initialization(server, mock_proxmox):
     """Test server initialization with environment variables."""
@@ -127,7 +161,65 @@ def test_server_initialization(server, mock_proxmox):
     assert server.config.auth.token_value == "test_value"
     assert server.config.logging.level == "DEBUG"
 
+    # Connecting is deferred until the API is first used
+    mock_proxmox.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_connects_once_on_first_use(server, mock_proxmox):
+    """Test the first tool call connects and later calls reuse the connection."""
+    await server.mcp.call_tool("get_nodes", {})
+    await server.mcp.call_tool("get_cluster_status", {})
+
+    mock_proxmox.assert_called_once()
+    assert server.proxmox_manager.connected
+
+def test_background_connect(server, mock_proxmox):
+    """Test the server can connect ahead of the first tool call."""
+    server._connect_in_background().join(timeout=5)
+
     mock_proxmox.assert_called_once()
+    assert server.proxmox_manager.connect_time is not None
+    assert "connect" in [name for name, _ in server.profiler.phases]
+
+def test_background_connect_failure_is_retried(server, mock_proxmox):
+    """Test a failed background connection is retried on first use."""
+    mock_proxmox.return_value.version.get.side_effect = [
+        Exception("connection refused"), {"version": "8.1"}
+    ]
+
+    server._connect_in_background().join(timeout=5)
+    assert not server.proxmox_manager.connected
+
+    server.proxmox.nodes.get()
+    assert server.proxmox_manager.connected
+
+def test_startup_profile(mock_config, mock_proxmox, capsys):
+    """Test the startup profile reports each phase on stderr."""
+    with patch("proxmox_mcp.server.load_config", return_value=mock_config):
+        server = ProxmoxMCPServer(profile_startup=True, import_time=0.25)
+
+    err = capsys.readouterr().err
+    for phase in ("import", "config", "logging", "tools", "register", "total"):
+        assert phase in err
+    # Without network access, everything after the imports is near-instant
+    assert sum(seconds for name, seconds in server.profiler.phases if name != "import") < 0.5
+
+def test_call_timeout_covers_retries(server):
+    """Test fanned-out requests aren't abandoned while their retries still run."""
+    proxmox = server.config.proxmox
+    budget = proxmox.timeout * (proxmox.retries + 1)
+
+    assert server.node_tools.call_timeout >= budget
+    assert server.task_tracker.node_timeout >= budget
+
+def test_startup_profile_import_cpu_time(mock_config, mock_proxmox):
+    """Test import CPU time is reported apart from the wall-clock total."""
+    with patch("proxmox_mcp.server.load_config", return_value=mock_config):
+        server = ProxmoxMCPServer(profile_startup=False, import_cpu_time=5.0)
+
+    assert "import" not in [name for name, _ in server.profiler.phases]
+    assert server.profiler.total() < 5.0
+    assert "import (CPU time)" in server.profiler.report()
 
 @pytest.mark.asyncio
 async def test_list_tools(server):
@@ -140,6 +232,8 @@ async def test_list_tools(server):
     assert "get_vms" in tool_names
     assert "get_storage" in tool_names
     assert "execute_vm_command" in tool_names
+    assert "wait_task" in tool_names
+    assert "get_containers" in tool_names
 
 @pytest.mark.asyncio
 async def test_get_nodes(server, mock_proxmox):
@@ -152,6 +246,20 @@ async def test_get_nodes(server, mock_proxmox):
     assert "node2" in response[0].text
     assert "Proxmox Nodes" in response[0].text
 
+@pytest.mark.asyncio
+async def test_repeat_reads_are_cached(server, mock_proxmox):
+    """Test repeated read-only tool calls reuse cached API responses."""
+    await server.mcp.call_tool("get_vms", {})
+    await server.mcp.call_tool("get_vms", {})
+
+    mock_proxmox.return_value.cluster.resources.get.assert_called_once()
+
+    # A power operation invalidates the node/VM entries
+    await server.mcp.call_tool("stop_vm", {"node": "node1", "vmid": "100"})
+    await server.mcp.call_tool("get_vms", {})
+
+    assert mock_proxmox.return_value.cluster.resources.get.call_count == 2
+
 @pytest.mark.asyncio
 async def test_get_node_status_missing_parameter(server):
     """Test get_node_status tool with missing parameter."""
@@ -168,6 +276,41 @@ async def test_get_node_status(server, mock_proxmox):
     assert "node1" in response[0].text
     assert "RUNNING" in response[0].text
 
+@pytest.mark.asyncio
+async def test_compare_nodes(server, mock_proxmox):
+    """Test nodes are compared from one cached status sweep, ranked by headroom."""
+    api = mock_proxmox.return_value
+    statuses = {
+        "node1": {"uptime": 3600, "cpu": 0.5, "cpuinfo": {"cpus": 8},
+                  "loadavg": ["4.00", "3.50", "3.00"],
+                  "memory": {"used": 6 * 2**30, "total": 8 * 2**30},
+                  "swap": {"used": 0, "total": 2**30},
+                  "rootfs": {"used": 10 * 2**30, "total": 100 * 2**30}, "ksm": {"shared": 2**20}},
+        "node2": {"uptime": 7200, "cpu": 0.1, "cpuinfo": {"cpus": 16},
+                  "loadavg": ["1.00", "1.00", "1.00"],
+                  "memory": {"used": 4 * 2**30, "total": 64 * 2**30},
+                  "swap": {"used": 0, "total": 0},
+                  "rootfs": {"used": 90 * 2**30, "total": 100 * 2**30}, "ksm": {"shared": 0}},
+    }
+    nodes = {name: Mock(**{"status.get.return_value": status}) for name, status in statuses.items()}
+    api.nodes.side_effect = lambda name: nodes[name]
+
+    response = await server.mcp.call_tool("compare_nodes",
+                                          {"sort_by": "mem", "output_format": "json"})
+    text_response = await server.mcp.call_tool("compare_nodes", {"sort_by": "disk"})
+    listing = await server.mcp.call_tool("get_nodes", {"output_format": "json"})
+
+    ranked = json.loads(response[0].text)
+    assert [node["node"] for node in ranked] == ["node2", "node1"]
+    assert ranked[1]["loadavg"] == [4.0, 3.5, 3.0]
+    assert ranked[1]["disk"] == {"used": 10 * 2**30, "total": 100 * 2**30}
+    assert json.loads(listing[0].text) == sorted(ranked, key=lambda node: node["node"])
+    assert text_response[0].text.index("node1") < text_response[0].text.index("node2")
+    assert "50% of 8" in text_response[0].text
+    assert "4.00/3.50/3.00" in text_response[0].text
+    nodes["node1"].status.get.assert_called_once()
+    api.nodes.get.assert_called_once()
+
 @pytest.mark.asyncio
 async def test_get_vms(server, mock_proxmox):
     """Test get_vms tool."""
@@ -179,6 +322,27 @@ async def test_get_vms(server, mock_proxmox):
     assert "vm2" in response[0].text
     assert "Virtual Machines" in response[0].text
 
+@pytest.mark.asyncio
+async def test_get_vms_uses_cluster_resources(server, mock_proxmox):
+    """Test get_vms collects guests in one sweep without per-VM config calls."""
+    response = await server.mcp.call_tool("get_vms", {})
+
+    mock_proxmox.return_value.cluster.resources.get.assert_called_once_with(type="vm")
+    mock_proxmox.return_value.nodes.return_value.qemu.return_value.config.get.assert_not_called()
+    assert "container1" not in response[0].text
+
+@pytest.mark.asyncio
+async def test_get_vms_include_config(server, mock_proxmox):
+    """Test get_vms fetches per-VM config only when asked."""
+    mock_proxmox.return_value.nodes.return_value.qemu.return_value.config.get.return_value = {
+        "cores": 8
+    }
+
+    response = await server.mcp.call_tool("get_vms", {"include_config": True})
+
+    assert mock_proxmox.return_value.nodes.return_value.qemu.return_value.config.get.call_count == 2
+    assert "CPU Cores: 8" in response[0].text
+
 @pytest.mark.asyncio
 async def test_get_storage(server, mock_proxmox):
     """Test get_storage tool."""
@@ -190,6 +354,162 @@ async def test_get_storage(server, mock_proxmox):
     assert "ceph" in response[0].text
     assert "Storage Pools" in response[0].text
 
+@pytest.mark.asyncio
+async def test_get_storage_dedups_shared_pools(server, mock_proxmox):
+    """Test one resource query lists shared pools once and local pools per node."""
+    api = mock_proxmox.return_value
+    api.cluster.resources.get.return_value.append(
+        {"type": "storage", "storage": "nfs", "node": "node1", "plugintype": "nfs", "shared": 1,
+         "status": "available", "content": "backup"}
+    )
+    api.nodes.return_value.storage.return_value.status.get.return_value = {
+        "used": 3, "total": 10, "avail": 7
+    }
+
+    response = await server.mcp.call_tool("get_storage", {"output_format": "json"})
+
+    pools = {(pool["storage"], tuple(pool["nodes"])): pool for pool in json.loads(response[0].text)}
+    assert sorted(pools) == [
+        ("ceph", ("node1", "node2")), ("local", ("node1",)), ("local", ("node2",)),
+        ("nfs", ("node1",)),
+    ]
+    assert pools[("ceph", ("node1", "node2"))]["total"] == 50000000000
+    assert pools[("local", ("node2",))]["used"] == 2000000000
+    assert pools[("nfs", ("node1",))]["available"] == 7
+    api.cluster.resources.get.assert_called_once_with(type="storage")
+    api.storage.get.assert_not_called()
+    api.nodes.return_value.storage.assert_called_once_with("nfs")
+
+@pytest.mark.asyncio
+async def test_find_storage_content(server, mock_proxmox):
+    """Test content of all pools is indexed once, shared pools listed through one node."""
+    api = mock_proxmox.return_value
+    listings = {
+        ("node1", "local"): [{"volid": "local:iso/ubuntu-22.04.iso", "content": "iso",
+                              "size": 2**30, "ctime": 100}],
+        ("node2", "local"): [{"volid": "local:backup/vzdump-qemu-123-old.vma.zst",
+                              "content": "backup", "vmid": 123, "size": 10, "ctime": 200}],
+        ("node1", "nfs"): [{"volid": "nfs:backup/vzdump-qemu-123-new.vma.zst", "content": "backup",
+                            "vmid": "123", "size": 20, "ctime": 300},
+                           {"volid": "nfs:123/vm-123-disk-0.qcow2", "content": "images",
+                            "size": 30, "ctime": 400}],
+    }
+    api.cluster.resources.get.return_value += [
+        {"type": "storage", "storage": "nfs", "node": node, "plugintype": "nfs", "shared": 1,
+         "status": "available", "content": "backup,images", "disk": 0, "maxdisk": 100}
+        for node in ("node1", "node2")
+    ]
+    nodes = {node: Mock() for node in ("node1", "node2")}
+    for node, node_api in nodes.items():
+        node_api.storage.side_effect = lambda storage, node=node: Mock(
+            **{"content.get.return_value": listings[(node, storage)]}
+        )
+    api.nodes.side_effect = lambda node: nodes[node]
+
+    response = await server.mcp.call_tool(
+        "find_storage_content",
+        {"content": "backup", "vmid": 123, "limit": 1, "output_format": "json"},
+    )
+    isos = await server.mcp.call_tool("find_storage_content", {"name": "*UBUNTU*"})
+
+    latest = json.loads(response[0].text)
+    assert latest["total"] == 2
+    assert latest["volumes"][0]["volid"] == "nfs:backup/vzdump-qemu-123-new.vma.zst"
+    assert latest["volumes"][0]["nodes"] == ["node1", "node2"]
+    assert "local:iso/ubuntu-22.04.iso" in isos[0].text
+    assert "1 of 1 matching" in isos[0].text
+    assert [c.args for c in nodes["node2"].storage.call_args_list] == [("local",)]
+    assert nodes["node1"].storage.call_count == 2
+
+@pytest.mark.asyncio
+async def test_create_vm_auto_placement(server, mock_proxmox):
+    """Test create_vm places the VM from the resource snapshot without per-node lookups."""
+    api = mock_proxmox.return_value
+    api.cluster.resources.get.return_value += [
+        {"type": "node", "node": "node1", "status": "online", "cpu": 0.9, "maxcpu": 8,
+         "mem": 6 * 2**30, "maxmem": 8 * 2**30},
+        {"type": "node", "node": "node2", "status": "online", "cpu": 0.2, "maxcpu": 8,
+         "mem": 2 * 2**30, "maxmem": 32 * 2**30},
+    ]
+    api.cluster.nextid.get.return_value = "300"
+    api.nodes.return_value.qemu.create.return_value = (
+        "UPID:node2:0001:0002:0003:qmcreate:300:root@pam:"
+    )
+
+    response = await server.mcp.call_tool(
+        "create_vm", {"name": "lab-1", "cpus": 2, "memory": 4096, "disk_size": 10}
+    )
+
+    api.nodes.assert_any_call("node2")
+    config = api.nodes.return_value.qemu.create.call_args.kwargs
+    assert config["scsi0"] == "ceph:10,format=raw"
+    assert config["vmid"] == "300"
+    assert server.vmids.reserved == [300]
+    assert "Node: node2" in response[0].text
+    assert "Placement: auto, best of 1 candidate(s)" in response[0].text
+    api.nodes.return_value.storage.get.assert_not_called()
+
+    with pytest.raises(ToolError, match="already being used"):
+        await server.mcp.call_tool(
+            "create_vm",
+            {"vmid": "300", "name": "lab-2", "cpus": 1, "memory": 1024, "disk_size": 10},
+        )
+    with pytest.raises(ToolError, match="Storage 'local' not found"):
+        await server.mcp.call_tool(
+            "create_vm",
+            {"vmid": "301", "name": "lab-2", "cpus": 1, "memory": 1024, "disk_size": 10,
+             "node": "node1", "storage": "local"},
+        )
+
+@pytest.mark.asyncio
+async def test_create_vms_batch(server, mock_proxmox):
+    """Test create_vms_batch spreads VMs over nodes, allocates IDs in bulk and waits for tasks."""
+    api = mock_proxmox.return_value
+    api.cluster.resources.get.return_value += [
+        {"type": "node", "node": "node1", "status": "online", "cpu": 0.1, "maxcpu": 8,
+         "mem": 0, "maxmem": 16 * 2**30},
+        {"type": "node", "node": "node2", "status": "online", "cpu": 0.1, "maxcpu": 8,
+         "mem": 0, "maxmem": 16 * 2**30},
+    ]
+    api.cluster.nextid.get.return_value = "300"
+    api.nodes.return_value.qemu.create.side_effect = [
+        f"UPID:node1:0001:0002:0003:qmcreate:{vmid}:root@pam:" for vmid in range(300, 303)
+    ] + [Exception("storage offline")]
+    api.nodes.return_value.tasks.return_value.status.get.return_value = {
+        "status": "stopped", "exitstatus": "OK"
+    }
+
+    response = await server.mcp.call_tool(
+        "create_vms_batch", {"count": 4, "name_pattern": "lab-{n:02d}", "memory": 4096}
+    )
+
+    configs = [call.kwargs for call in api.nodes.return_value.qemu.create.call_args_list]
+    assert sorted(config["name"] for config in configs) == ["lab-01", "lab-02", "lab-03", "lab-04"]
+    assert sorted(config["vmid"] for config in configs) == ["300", "301", "302", "303"]
+    assert "Batch create: 4 VMs on 2 node(s)" in response[0].text
+    assert "Summary: 1 failed, 3 ok" in response[0].text
+    assert "storage offline" in response[0].text
+    assert len(server.vmids.reserved) == 3
+    api.nodes.return_value.storage.get.assert_not_called()
+
+    with pytest.raises(ToolError, match="unknown key"):
+        await server.mcp.call_tool("create_vms_batch", {"specs": [{"name": "a", "disk": 10}]})
+    with pytest.raises(ToolError, match="either specs or count"):
+        await server.mcp.call_tool("create_vms_batch", {})
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("arguments, error", [
+    ({"specs": [{"name": "a", "memory": 10**9}]}, "memory must be between 512 and 131072"),
+    ({"specs": [{"name": "a", "disk_size": 1}]}, "disk_size must be between 5 and 1000"),
+    ({"specs": [{"name": "a", "cpus": "many"}]}, "cpus must be a whole number"),
+    ({"count": 2, "name_pattern": "vm-{n}-{x}"}, "Invalid name_pattern"),
+])
+async def test_create_vms_batch_validates_specs(server, mock_proxmox, arguments, error):
+    """Test batch specs get the same limits as create_vm, and bad input is a clear error."""
+    with pytest.raises(ToolError, match=error):
+        await server.mcp.call_tool("create_vms_batch", arguments)
+    mock_proxmox.return_value.nodes.return_value.qemu.create.assert_not_called()
+
 @pytest.mark.asyncio
 async def test_get_cluster_status(server, mock_proxmox):
     """Test get_cluster_status tool."""
@@ -214,6 +534,20 @@ async def test_execute_vm_command_success(server, mock_proxmox):
     assert "command output" in response[0].text
     assert "ls -l" in response[0].text
 
+@pytest.mark.asyncio
+async def test_execute_vm_command_stream(server, mock_proxmox):
+    """Test streaming VM command execution returns the final result."""
+    response = await server.mcp.call_tool("execute_vm_command_stream", {
+        "node": "node1",
+        "vmid": "100",
+        "command": "apt-get upgrade -y"
+    })
+
+    assert len(response) == 1
+    assert "SUCCESS" in response[0].text
+    assert "command output" in response[0].text
+    assert "Exit Code: 0" in response[0].text
+
 @pytest.mark.asyncio
 async def test_execute_vm_command_missing_parameters(server):
     """Test VM command execution with missing parameters."""
@@ -257,3 +591,381 @@ async def test_execute_vm_command_with_error(server, mock_proxmox):
     assert "SUCCESS" in response[0].text  # API call succeeded
     assert "command not found" in response[0].text
     assert "invalid-command" in response[0].text
+
+@pytest.mark.asyncio
+async def test_execute_vm_command_batch(server, mock_proxmox):
+    """Test batch command execution over a name selector."""
+    response = await server.mcp.call_tool("execute_vm_command_batch", {
+        "command": "uptime",
+        "name": "vm*"
+    })
+
+    assert len(response) == 1
+    assert "Batch Command: uptime" in response[0].text
+    assert "command output" in response[0].text
+    assert "VM is stopped" in response[0].text
+    assert "1/2 VMs exited with code 0" in response[0].text
+
+@pytest.mark.asyncio
+async def test_execute_vm_command_batch_by_tag(server, mock_proxmox):
+    """Test batch command execution selects VMs by tag."""
+    response = await server.mcp.call_tool("execute_vm_command_batch", {
+        "command": "uptime",
+        "tag": "web"
+    })
+
+    assert "vm1" in response[0].text
+    assert "vm2" not in response[0].text
+
+@pytest.mark.asyncio
+async def test_execute_vm_command_batch_requires_selector(server):
+    """Test batch command execution rejects calls without a selector."""
+    with pytest.raises(ToolError, match="Specify VMs"):
+        await server.mcp.call_tool("execute_vm_command_batch", {"command": "uptime"})
+
+@pytest.mark.asyncio
+async def test_bulk_vm_power_wait(server, mock_proxmox):
+    """Test bulk power action skips no-op VMs and waits for tasks."""
+    vm_api = mock_proxmox.return_value.nodes.return_value.qemu.return_value
+    vm_api.status.stop.post.return_value = "UPID:node1:0001:0002:0003:qmstop:100:root@pam:"
+    mock_proxmox.return_value.nodes.return_value.tasks.return_value.status.get.return_value = {
+        "status": "stopped",
+        "exitstatus": "OK"
+    }
+
+    response = await server.mcp.call_tool(
+        "bulk_vm_power", {"action": "stop", "name": "vm*", "wait": True}
+    )
+
+    vm_api.status.stop.post.assert_called_once()
+    assert "Bulk stop: 2 VMs" in response[0].text
+    assert "already stopped" in response[0].text
+    assert "Summary: 1 ok, 1 skipped" in response[0].text
+
+@pytest.mark.asyncio
+async def test_bulk_vm_power_reports_failures(server, mock_proxmox):
+    """Test bulk power action captures per-VM failures."""
+    vm_api = mock_proxmox.return_value.nodes.return_value.qemu.return_value
+    vm_api.status.start.post.side_effect = Exception("storage offline")
+
+    response = await server.mcp.call_tool(
+        "bulk_vm_power", {"action": "start", "vms": ["100", "101"]}
+    )
+
+    assert "storage offline" in response[0].text
+    assert "Summary: 1 failed, 1 skipped" in response[0].text
+
+@pytest.mark.asyncio
+async def test_bulk_vm_power_slow_request_is_unknown(server, mock_proxmox):
+    """Test a power request without a timely response isn't reported as failed."""
+    vm_api = mock_proxmox.return_value.nodes.return_value.qemu.return_value
+    vm_api.status.start.post.side_effect = lambda: time.sleep(0.3)
+    server.vm_tools.call_timeout = 0.05
+
+    response = await server.mcp.call_tool("bulk_vm_power", {"action": "start", "vms": ["101"]})
+
+    assert "may still be running" in response[0].text
+    assert "Summary: 1 unknown" in response[0].text
+
+@pytest.mark.asyncio
+async def test_get_containers(server, mock_proxmox):
+    """Test get_containers lists LXC guests from the cluster resource view only."""
+    response = await server.mcp.call_tool("get_containers", {})
+
+    mock_proxmox.return_value.cluster.resources.get.assert_called_once_with(type="vm")
+    mock_proxmox.return_value.nodes.return_value.lxc.get.assert_not_called()
+    assert "Containers" in response[0].text
+    assert "container1" in response[0].text
+    assert "container2" in response[0].text
+    assert "vm1" not in response[0].text
+
+@pytest.mark.asyncio
+async def test_get_containers_filters_and_pages(server, mock_proxmox):
+    """Test get_containers supports the same filters and pagination as get_vms."""
+    response = await server.mcp.call_tool("get_containers", {"tag": "lab", "output_format": "json"})
+    assert [c["vmid"] for c in json.loads(response[0].text)["containers"]] == [201]
+
+    lxc_api = mock_proxmox.return_value.nodes.return_value.lxc.return_value
+    lxc_api.config.get.return_value = {"cores": 3}
+    response = await server.mcp.call_tool(
+        "get_containers", {"limit": 1, "include_config": True, "output_format": "json"}
+    )
+    page = json.loads(response[0].text)
+    assert page["containers"][0]["cpus"] == 3
+    assert page["next_cursor"] == "200"
+    assert lxc_api.config.get.call_count == 1
+
+@pytest.mark.asyncio
+async def test_get_container_status(server, mock_proxmox):
+    """Test get_container_status reports a single container."""
+    lxc_api = mock_proxmox.return_value.nodes.return_value.lxc.return_value
+    lxc_api.status.current.get.return_value = {
+        "vmid": 200, "name": "container1", "status": "running", "uptime": 3600, "cpu": 0.05,
+        "cpus": 1, "mem": 268435456, "maxmem": 536870912, "disk": 0, "maxdisk": 8589934592
+    }
+
+    response = await server.mcp.call_tool("get_container_status", {"node": "node1", "vmid": "200"})
+
+    mock_proxmox.return_value.nodes.return_value.lxc.assert_called_with("200")
+    assert "container1 (ID: 200)" in response[0].text
+    assert "Node: node1" in response[0].text
+    assert "256.00 MB / 512.00 MB (50.0%)" in response[0].text
+
+@pytest.mark.asyncio
+async def test_container_power(server, mock_proxmox):
+    """Test container power actions go to the LXC API and skip no-op containers."""
+    lxc_api = mock_proxmox.return_value.nodes.return_value.lxc.return_value
+    lxc_api.status.start.post.return_value = "UPID:node2:0001:0002:0003:vzstart:201:root@pam:"
+
+    response = await server.mcp.call_tool(
+        "container_power", {"action": "start", "name": "container*"}
+    )
+
+    lxc_api.status.start.post.assert_called_once()
+    qemu_api = mock_proxmox.return_value.nodes.return_value.qemu.return_value
+    qemu_api.status.start.post.assert_not_called()
+    assert "Bulk start: 2 containers" in response[0].text
+    assert "Summary: 1 skipped, 1 started" in response[0].text
+
+@pytest.mark.asyncio
+async def test_listings_use_metrics_snapshot(metrics_server, mock_proxmox):
+    """Test VM and node listings answer from a fresh metrics snapshot without listing requests."""
+    mock_proxmox.return_value.cluster.resources.get.return_value.append(
+        {"id": "node/node1", "type": "node", "node": "node1", "status": "online",
+         "maxcpu": 16, "mem": 1073741824, "maxmem": 4294967296, "uptime": 60}
+    )
+    metrics_server.metrics.poll()
+    api = mock_proxmox.return_value
+    api.reset_mock()
+
+    vms = await metrics_server.mcp.call_tool("get_vms", {"output_format": "json"})
+    nodes = await metrics_server.mcp.call_tool("get_nodes", {"output_format": "json"})
+
+    assert [vm["vmid"] for vm in json.loads(vms[0].text)["vms"]] == [100, 101]
+    assert json.loads(nodes[0].text)[0]["maxcpu"] == 16
+    # Node status detail still comes from the status sweep
+    assert json.loads(nodes[0].text)[0]["uptime"] == 123456
+    api.cluster.resources.get.assert_not_called()
+    api.nodes.get.assert_not_called()
+
+    api.nodes.return_value.qemu.return_value.status.stop.post.return_value = (
+        "UPID:node1:0001:0002:0003:qmstop:100:root@pam:"
+    )
+    await metrics_server.mcp.call_tool("stop_vm", {"node": "node1", "vmid": "100"})
+    await metrics_server.mcp.call_tool("get_vms", {})
+    api.cluster.resources.get.assert_called_once_with(type="vm")
+
+@pytest.mark.asyncio
+async def test_get_metrics_trend(metrics_server, mock_proxmox):
+    """Test trends are answered from the collected samples."""
+    metrics_server.metrics.poll()
+    mock_proxmox.return_value.cluster.resources.get.reset_mock()
+
+    response = await metrics_server.mcp.call_tool(
+        "get_metrics_trend", {"target": "100", "metrics": ["cpu", "mem"]}
+    )
+    json_response = await metrics_server.mcp.call_tool(
+        "get_metrics_trend", {"target": "100", "metrics": ["mem"], "output_format": "json"}
+    )
+
+    assert "qemu/100: last 15 minutes" in response[0].text
+    assert "1.00 GB" in response[0].text
+    assert json.loads(json_response[0].text)["metrics"]["mem"]["max"] == 1073741824
+    mock_proxmox.return_value.cluster.resources.get.assert_not_called()
+    with pytest.raises(ToolError, match="No metrics"):
+        await metrics_server.mcp.call_tool("get_metrics_trend", {"target": "999"})
+
+@pytest.mark.asyncio
+async def test_get_rrd_stats(server, mock_proxmox):
+    """Test RRD series of all VMs are fetched concurrently, aggregated and ranked."""
+    series = {
+        100: [{"time": t, "cpu": c} for t, c in enumerate([0.1, 0.2, 0.3])],
+        101: [{"time": t, "cpu": c} for t, c in enumerate([0.5, 0.9, None])],
+    }
+    vms = {vmid: Mock(**{"rrddata.get.return_value": points}) for vmid, points in series.items()}
+    mock_proxmox.return_value.nodes.return_value.qemu.side_effect = lambda vmid: vms[vmid]
+
+    response = await server.mcp.call_tool(
+        "get_rrd_stats", {"metric": "cpu", "timeframe": "day", "output_format": "json"}
+    )
+    text_response = await server.mcp.call_tool("get_rrd_stats", {"metric": "cpu", "top": 1})
+
+    stats = json.loads(response[0].text)
+    assert [row["id"] for row in stats["rows"]] == ["qemu/101", "qemu/100"]
+    assert stats["rows"][0]["samples"] == 2
+    assert stats["rows"][0]["max"] == 0.9
+    assert stats["rows"][1]["p50"] == pytest.approx(0.2)
+    vms[100].rrddata.get.assert_any_call(timeframe="day", cf="AVERAGE")
+    assert "top 1 of 2 vms by p95" in text_response[0].text
+    assert "90.0%" in text_response[0].text
+    with pytest.raises(ToolError, match="not available"):
+        await server.mcp.call_tool("get_rrd_stats", {"metric": "loadavg"})
+
+@pytest.mark.asyncio
+async def test_get_top_guests(server, mock_proxmox):
+    """Test guests are ranked by memory pressure and by I/O rate over a live interval."""
+    api = mock_proxmox.return_value
+    response = await server.mcp.call_tool(
+        "get_top_guests", {"metric": "mem", "top": 1, "output_format": "json"}
+    )
+
+    top = json.loads(response[0].text)
+    assert top["total"] == 4
+    assert [(row["id"], row["value"]) for row in top["rows"]] == [("qemu/100", 50.0)]
+
+    def sweep(diskwrite):
+        return [dict(resource, diskwrite=diskwrite.get(resource.get("vmid"), 0))
+                for resource in api.cluster.resources.get.return_value]
+
+    api.cluster.resources.get.side_effect = [
+        sweep({100: 1000, 101: 0, 200: 5000, 201: 0}),
+        sweep({100: 3000, 101: 0, 200: 45000, 201: 0}),
+    ]
+    with patch("proxmox_mcp.tools.metrics.time") as clock:
+        clock.monotonic.side_effect = [10.0, 12.0]
+        text_response = await server.mcp.call_tool(
+            "get_top_guests", {"metric": "diskwrite", "interval": 2, "top": 2}
+        )
+
+    clock.sleep.assert_called_once_with(2)
+    assert "Top 2 of 4 guests by diskwrite (rate over 2.0s)" in text_response[0].text
+    lines = text_response[0].text.splitlines()
+    first_lxc = min(i for i, line in enumerate(lines) if "lxc/200" in line)
+    first_qemu = min(i for i, line in enumerate(lines) if "qemu/100" in line)
+    assert first_lxc < first_qemu
+    assert "19.53 KB/s" in text_response[0].text
+    with pytest.raises(ToolError, match="either interval or window"):
+        await server.mcp.call_tool("get_top_guests", {"interval": 1, "window": 5})
+    with pytest.raises(ToolError, match="only applies to I/O metrics"):
+        await server.mcp.call_tool("get_top_guests", {"metric": "cpu", "interval": 1})
+
+@pytest.mark.asyncio
+async def test_wait_task(server, mock_proxmox):
+    """Test waiting for a task started by a power tool."""
+    upid = "UPID:node1:0001:0002:65000000:qmstart:101:root@pam:"
+    vm_api = mock_proxmox.return_value.nodes.return_value.qemu.return_value
+    vm_api.status.current.get.return_value = {"status": "stopped"}
+    vm_api.status.start.post.return_value = upid
+    mock_proxmox.return_value.nodes.return_value.tasks.get.return_value = [
+        {"upid": upid, "status": "OK", "starttime": 0x65000000, "endtime": 0x65000003}
+    ]
+
+    await server.mcp.call_tool("start_vm", {"node": "node1", "vmid": "101"})
+    response = await server.mcp.call_tool("wait_task", {"upids": [upid]})
+
+    assert "start VM 101" in response[0].text
+    assert "3s" in response[0].text
+    assert "Summary: 1/1 tasks finished, 1 OK" in response[0].text
+
+@pytest.mark.asyncio
+async def test_wait_task_invalid_upid(server):
+    """Test wait_task rejects malformed task IDs."""
+    with pytest.raises(ToolError, match="Invalid task ID"):
+        await server.mcp.call_tool("wait_task", {"upids": ["bogus"]})
+
+@pytest.mark.asyncio
+async def test_list_tasks(server, mock_proxmox):
+    """Test tasks started through the server are listed."""
+    upid = "UPID:node1:0001:0002:65000000:qmdestroy:101:root@pam:"
+    vm_api = mock_proxmox.return_value.nodes.return_value.qemu.return_value
+    vm_api.status.current.get.return_value = {"status": "stopped", "name": "vm2"}
+    vm_api.delete.return_value = upid
+    mock_proxmox.return_value.nodes.return_value.tasks.get.return_value = [
+        {"upid": upid, "status": "running"}
+    ]
+
+    empty = await server.mcp.call_tool("list_tasks", {})
+    await server.mcp.call_tool("delete_vm", {"node": "node1", "vmid": "101"})
+    response = await server.mcp.call_tool("list_tasks", {"running_only": True})
+
+    assert "No tracked tasks" in empty[0].text
+    assert "delete VM 101" in response[0].text
+    assert "running" in response[0].text
+
+@pytest.mark.asyncio
+async def test_get_vms_json_output(server, mock_proxmox):
+    """Test get_vms returns compact JSON without rendering templates."""
+    text_response = await server.mcp.call_tool("get_vms", {})
+    response = await server.mcp.call_tool("get_vms", {"output_format": "json"})
+
+    vms = json.loads(response[0].text)["vms"]
+    assert [vm["vmid"] for vm in vms] == [100, 101]
+    assert vms[0]["memory"] == {"used": 1073741824, "total": 2147483648}
+    assert len(json.dumps(vms, separators=(",", ":"))) < len(text_response[0].text)
+
+@pytest.mark.asyncio
+async def test_get_vms_filters(server, mock_proxmox):
+    """Test get_vms filters the resource view by node, status, name, tag and VM ID."""
+    async def vmids(**arguments):
+        response = await server.mcp.call_tool("get_vms", {"output_format": "json", **arguments})
+        return [vm["vmid"] for vm in json.loads(response[0].text)["vms"]]
+
+    assert await vmids(node="node2") == [101]
+    assert await vmids(status="running") == [100]
+    assert await vmids(name="vm*") == [100, 101]
+    assert await vmids(name="*2") == [101]
+    assert await vmids(tag="prod") == [100]
+    assert await vmids(vmid_min=101, vmid_max=150) == [101]
+    assert await vmids(node="node1", status="stopped") == []
+
+@pytest.mark.asyncio
+async def test_get_vms_fields(server, mock_proxmox):
+    """Test get_vms returns only the requested fields."""
+    response = await server.mcp.call_tool(
+        "get_vms", {"fields": ["name", "tags"], "output_format": "json"}
+    )
+    text_response = await server.mcp.call_tool("get_vms", {"fields": ["name", "memory"]})
+
+    assert json.loads(response[0].text)["vms"][0] == {"name": "vm1", "tags": ["web", "prod"]}
+    assert "1.00 GB / 2.00 GB" in text_response[0].text
+    assert "node1" not in text_response[0].text
+    with pytest.raises(Exception, match="Unknown field"):
+        await server.mcp.call_tool("get_vms", {"fields": ["password"]})
+
+@pytest.mark.asyncio
+async def test_get_vms_pagination(server, mock_proxmox):
+    """Test get_vms pages through VMs with a cursor, fetching config only for the page."""
+    response = await server.mcp.call_tool(
+        "get_vms", {"limit": 1, "include_config": True, "output_format": "json"}
+    )
+    first = json.loads(response[0].text)
+    response = await server.mcp.call_tool(
+        "get_vms", {"limit": 1, "cursor": first["next_cursor"], "output_format": "json"}
+    )
+    second = json.loads(response[0].text)
+
+    assert [vm["vmid"] for vm in first["vms"]] == [100]
+    assert first["total"] == 2
+    assert [vm["vmid"] for vm in second["vms"]] == [101]
+    assert second["next_cursor"] is None
+    assert mock_proxmox.return_value.nodes.return_value.qemu.return_value.config.get.call_count == 1
+
+    text_response = await server.mcp.call_tool("get_vms", {"limit": 1})
+    assert "Showing 1 of 2 matching VMs" in text_response[0].text
+    assert "cursor='100'" in text_response[0].text
+    with pytest.raises(Exception, match="Invalid cursor"):
+        await server.mcp.call_tool("get_vms", {"cursor": "abc"})
+
+@pytest.mark.asyncio
+async def test_node_status_json_output(server, mock_proxmox):
+    """Test node status JSON carries the node name alongside its status."""
+    response = await server.mcp.call_tool(
+        "get_node_status", {"node": "node1", "output_format": "json"}
+    )
+
+    assert json.loads(response[0].text) == {"node": "node1", "status": "running", "uptime": 123456}
+
+@pytest.mark.asyncio
+async def test_configured_json_output(mock_config, mock_proxmox):
+    """Test the configured output format applies when a call doesn't choose one."""
+    mock_config.output.format = "json"
+    with patch("proxmox_mcp.server.load_config", return_value=mock_config):
+        server = ProxmoxMCPServer()
+
+    response = await server.mcp.call_tool("get_nodes", {})
+    text_response = await server.mcp.call_tool("get_nodes", {"output_format": "text"})
+
+    assert [node["node"] for node in json.loads(response[0].text)] == ["node1", "node2"]
+    assert "node1" in text_response[0].text
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(text_response[0].text)
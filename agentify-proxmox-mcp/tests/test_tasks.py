@@ -0,0 +1,163 @@
+"""
+Tests for the task tracker.
+"""
+
+import threading
+import pytest
+from unittest.mock import Mock
+
+from proxmox_mcp.core.tasks import TaskTracker, parse_upid
+
+UPID_A = "UPID:node1:00001:00002:65000000:qmstart:100:root@pam:"
+UPID_B = "UPID:node1:00003:00004:65000001:qmstop:101:root@pam:"
+UPID_C = "UPID:node2:00005:00006:65000002:qmcreate:200:root@pam:"
+
+@pytest.fixture
+def proxmox():
+    """Fixture to create a mock API whose task listings report all tasks finished."""
+    mock = Mock()
+    listings = {
+        "node1": [
+            {"upid": UPID_A, "status": "OK", "starttime": 0x65000000, "endtime": 0x65000005},
+            {"upid": UPID_B, "status": "command failed", "starttime": 0x65000001,
+             "endtime": 0x65000002},
+        ],
+        "node2": [{"upid": UPID_C, "status": "OK", "starttime": 0x65000002, "endtime": 0x65000009}],
+    }
+    mock.nodes.side_effect = lambda node: Mock(**{"tasks.get.return_value": listings[node]})
+    return mock
+
+@pytest.fixture
+def tracker(proxmox):
+    """Fixture to create a task tracker without poll throttling."""
+    tracker = TaskTracker(proxmox)
+    tracker.min_poll_interval = 0
+    return tracker
+
+def test_parse_upid():
+    """Test the node, type, target and start time are read from a UPID."""
+    task = parse_upid(UPID_A)
+
+    assert task["node"] == "node1"
+    assert task["type"] == "qmstart"
+    assert task["id"] == "100"
+    assert task["starttime"] == 0x65000000
+
+def test_parse_upid_invalid():
+    """Test malformed task IDs are rejected."""
+    with pytest.raises(ValueError, match="Invalid task ID"):
+        parse_upid("not-a-upid")
+
+def test_poll_batches_per_node(tracker, proxmox):
+    """Test one listing request per node refreshes all of its tasks."""
+    for upid in (UPID_A, UPID_B, UPID_C):
+        tracker.register(upid)
+
+    states = tracker.wait([UPID_A, UPID_B, UPID_C], timeout=1)
+
+    assert sorted(call.args[0] for call in proxmox.nodes.call_args_list) == ["node1", "node2"]
+    assert states[UPID_A]["exitstatus"] == "OK"
+    assert states[UPID_B]["exitstatus"] == "command failed"
+    assert states[UPID_C]["endtime"] == 0x65000009
+
+def test_missing_tasks_fall_back_to_status(proxmox):
+    """Test a task absent from the listing is looked up individually."""
+    node = Mock()
+    node.tasks.get.return_value = []
+    node.tasks.return_value.status.get.return_value = {"status": "stopped", "exitstatus": "OK"}
+    proxmox.nodes.side_effect = None
+    proxmox.nodes.return_value = node
+    tracker = TaskTracker(proxmox)
+
+    states = tracker.wait([UPID_A], timeout=1)
+
+    node.tasks.assert_called_once_with(UPID_A)
+    assert states[UPID_A]["status"] == "stopped"
+
+def test_wait_times_out(proxmox):
+    """Test tasks still running at the deadline are reported as running."""
+    proxmox.nodes.side_effect = None
+    proxmox.nodes.return_value.tasks.get.return_value = [{"upid": UPID_A, "status": "running"}]
+    tracker = TaskTracker(proxmox)
+
+    states = tracker.wait([UPID_A], timeout=0.1)
+
+    assert states[UPID_A]["status"] == "running"
+
+def test_concurrent_waiters_share_polls(proxmox):
+    """Test waiters arriving together reuse one poll instead of each polling."""
+    proxmox.nodes.side_effect = None
+    proxmox.nodes.return_value.tasks.get.return_value = [
+        {"upid": UPID_A, "status": "OK", "endtime": 1},
+        {"upid": UPID_B, "status": "OK", "endtime": 1},
+    ]
+    tracker = TaskTracker(proxmox)
+    tracker.min_poll_interval = 5
+    tracker.register(UPID_A)
+    tracker.register(UPID_B)
+
+    threads = [threading.Thread(target=tracker.wait, args=([upid], 1))
+               for upid in (UPID_A, UPID_B) * 4]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert proxmox.nodes.return_value.tasks.get.call_count == 1
+
+def test_history_is_bounded(proxmox):
+    """Test the oldest finished tasks are dropped beyond max_tasks."""
+    tracker = TaskTracker(proxmox, max_tasks=2)
+    tracker.register(UPID_A)
+    tracker._finish(UPID_A, "OK", 1)
+    tracker.register(UPID_B)
+    tracker.register(UPID_C)
+
+    assert tracker.get(UPID_A) is None
+    assert [task["upid"] for task in tracker.list_tasks(refresh=False)] == [UPID_C, UPID_B]
+
+def test_wait_beyond_max_tasks(proxmox):
+    """Test waiting on more tasks than max_tasks keeps all of them until the wait ends."""
+    upids = [f"UPID:node1:{i:05X}:00000:65000000:qmstart:{100 + i}:root@pam:" for i in range(8)]
+    proxmox.nodes.side_effect = None
+    proxmox.nodes.return_value.tasks.get.return_value = [
+        {"upid": upid, "status": "OK", "endtime": 0x65000001} for upid in upids
+    ]
+    tracker = TaskTracker(proxmox, max_tasks=5)
+
+    states = tracker.wait(upids, timeout=1)
+
+    assert all(states[upid]["exitstatus"] == "OK" for upid in upids)
+    assert len(tracker.list_tasks(refresh=False)) == 5
+
+def test_slow_node_does_not_block_others(proxmox):
+    """Test a node whose task listing hangs doesn't delay tasks on other nodes."""
+    release = threading.Event()
+
+    def nodes(node):
+        if node == "node2":
+            listing = Mock(side_effect=lambda **kwargs: release.wait(5) and [])
+            return Mock(**{"tasks.get": listing})
+        return Mock(**{"tasks.get.return_value": [{"upid": UPID_A, "status": "OK", "endtime": 1}]})
+
+    proxmox.nodes.side_effect = nodes
+    tracker = TaskTracker(proxmox)
+    tracker.node_timeout = 0.1
+    tracker.register(UPID_C)
+
+    try:
+        states = tracker.wait([UPID_A], timeout=2)
+    finally:
+        release.set()
+
+    assert states[UPID_A]["exitstatus"] == "OK"
+    assert tracker.get(UPID_C)["status"] == "running"
+
+def test_untracked_task_is_shown_as_unknown():
+    """Test a task no longer tracked is rendered as unknown, not running."""
+    from proxmox_mcp.tools.tasks import TaskTools
+
+    table = TaskTools._format_tasks([TaskTracker._unknown(UPID_A)], "Tasks")
+
+    assert "unknown" in table
+    assert "running" not in table
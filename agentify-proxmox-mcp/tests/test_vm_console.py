@@ -96,3 +96,88 @@ async def test_execute_command_with_error_output(vm_console, mock_proxmox):
     assert result["output"] == ""
     assert result["error"] == "command error"
     assert result["exit_code"] == 1
+
+@pytest.mark.asyncio
+async def test_execute_command_polls_until_exit(vm_console, mock_proxmox):
+    """Test status is polled until the command exits and output is accumulated."""
+    mock_proxmox.nodes.return_value.qemu.return_value.agent.return_value.get.side_effect = [
+        {"exited": 0},
+        {"exited": 0, "out-data": "partial "},
+        {"exited": 1, "exitcode": 3, "out-data": "done"}
+    ]
+
+    result = await vm_console.execute_command("node1", "100", "sleep 1")
+
+    assert result["exited"] is True
+    assert result["exit_code"] == 3
+    assert result["output"] == "partial done"
+    assert result["elapsed"] < 1
+
+@pytest.mark.asyncio
+async def test_execute_command_repetitive_output(vm_console, mock_proxmox):
+    """Test repeated output reported across polls is kept in full."""
+    mock_proxmox.nodes.return_value.qemu.return_value.agent.return_value.get.side_effect = [
+        {"exited": 0, "out-data": "ok\n"},
+        {"exited": 0, "out-data": "ok\nok\n"},
+        {"exited": 1, "exitcode": 0, "out-data": "ok\n"}
+    ]
+
+    result = await vm_console.execute_command("node1", "100", "yes ok | head -4")
+
+    assert result["output"] == "ok\nok\nok\nok\n"
+
+@pytest.mark.asyncio
+async def test_execute_command_deadline(vm_console, mock_proxmox):
+    """Test a command still running at the deadline returns a partial result."""
+    mock_proxmox.nodes.return_value.qemu.return_value.agent.return_value.get.return_value = {
+        "exited": 0
+    }
+
+    result = await vm_console.execute_command("node1", "100", "sleep 60", timeout=0.1)
+
+    assert result["exited"] is False
+    assert result["exit_code"] is None
+    assert result["elapsed"] < 1
+
+@pytest.mark.asyncio
+async def test_execute_command_batch(vm_console, mock_proxmox):
+    """Test a command runs on all targets with failures captured per VM."""
+    broken_vm = Mock()
+    broken_vm.agent.return_value.post.side_effect = Exception("QEMU guest agent is not running")
+    healthy_vm = mock_proxmox.nodes.return_value.qemu.return_value
+    mock_proxmox.nodes.return_value.qemu.side_effect = \
+        lambda vmid: broken_vm if vmid == "102" else healthy_vm
+
+    results = await vm_console.execute_command_batch(
+        [("node1", "100"), ("node2", "101"), ("node1", "102")], "uptime", verify=False
+    )
+
+    assert results[("node1", "100")]["output"] == "command output"
+    assert results[("node2", "101")]["exit_code"] == 0
+    assert results[("node1", "102")]["success"] is False
+    assert "guest agent" in results[("node1", "102")]["error"]
+    healthy_vm.status.current.get.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_stream_command_yields_incremental_output(vm_console, mock_proxmox):
+    """Test output is yielded as it arrives and the buffer is capped."""
+    mock_proxmox.nodes.return_value.qemu.return_value.agent.return_value.get.side_effect = [
+        {"exited": 0, "out-data": "line1\n"},
+        {"exited": 0, "out-data": "line2\n"},
+        {"exited": 0, "out-data": "line1\n"},
+        {"exited": 1, "exitcode": 0, "out-data": "line3\n", "err-data": "warn"}
+    ]
+
+    stream = vm_console.stream_command("node1", "100", "apt-get upgrade", max_bytes=8)
+    events = [e async for e in stream]
+
+    chunks = [(e["stream"], e["data"]) for e in events if e["type"] == "output"]
+    assert chunks == [
+        ("out", "line1\n"), ("out", "line2\n"), ("out", "line1\n"), ("out", "line3\n"),
+        ("err", "warn"),
+    ]
+    result = events[-1]
+    assert result["type"] == "result"
+    assert result["exit_code"] == 0
+    assert result["output"] == "1\nline3\n"
+    assert result["truncated"] is True
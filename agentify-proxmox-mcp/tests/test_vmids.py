@@ -0,0 +1,51 @@
+"""
+Tests for cluster-wide VM ID allocation.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from proxmox_mcp.core.vmids import VMIDAllocator
+
+@pytest.fixture
+def allocator():
+    """Fixture to create an allocator over a mocked API where 100-102 and 104 exist."""
+    api = Mock()
+    api.cluster.nextid.get.return_value = "103"
+    api.cluster.resources.get.return_value = [{"vmid": vmid} for vmid in (100, 101, 102, 104)]
+    return VMIDAllocator(api, reservation_ttl=60)
+
+def test_allocate_single(allocator):
+    """Test one ID costs one request and is reserved."""
+    assert allocator.allocate() == [103]
+    assert allocator.reserved == [103]
+    allocator.proxmox.cluster.resources.get.assert_not_called()
+
+def test_allocate_bulk_skips_used_and_reserved(allocator):
+    """Test bulk allocation skips existing guests and earlier reservations."""
+    first = allocator.allocate()
+    batch = allocator.allocate(3)
+
+    assert first == [103]
+    assert batch == [105, 106, 107]
+    allocator.proxmox.cluster.resources.get.assert_called_with(type="vm")
+
+def test_reserve_checks_cluster(allocator):
+    """Test a chosen ID is validated by the cluster and can't be reserved twice."""
+    assert allocator.reserve("200") == 200
+    with pytest.raises(ValueError, match="already being used"):
+        allocator.reserve(200)
+
+    allocator.proxmox.cluster.nextid.get.side_effect = Exception("VM 100 already exists")
+    with pytest.raises(ValueError, match="not available: VM 100 already exists"):
+        allocator.reserve(100)
+    allocator.proxmox.cluster.nextid.get.assert_called_with(vmid=100)
+
+def test_release_and_expiry(allocator):
+    """Test released and expired reservations can be allocated again."""
+    allocator.allocate()
+    allocator.release(103)
+    assert allocator.allocate() == [103]
+
+    with patch("proxmox_mcp.core.vmids.time.monotonic", return_value=10**9):
+        assert allocator.reserved == []